@@ -1,6 +1,9 @@
 from fastapi import APIRouter
-from backend.app.api.endpoints import recommender, tmdb
+from backend.app.api.endpoints import health, home, metrics, recommender, tmdb
 
 api_router = APIRouter()
 api_router.include_router(recommender.router, prefix="/recommender", tags=["recommender"])
 api_router.include_router(tmdb.router, prefix="/tmdb", tags=["TMDB"])
+api_router.include_router(home.router, tags=["home"])
+api_router.include_router(metrics.router, tags=["metrics"])
+api_router.include_router(health.router, tags=["health"])
@@ -0,0 +1,21 @@
+from fastapi import APIRouter, Response
+from backend.app.services.rails_service import rails_service
+from backend.app.services.recommender_service import recommender_service
+
+router = APIRouter()
+
+@router.get("/ready")
+def get_ready(response: Response):
+    """Warm/cold state of the startup warmup; 503 until the indexes and rails have been warmed"""
+    ready = recommender_service.warmed and rails_service.warmed
+    if not ready:
+        response.status_code = 503
+    return {
+        "ready": ready,
+        # Read without triggering the lazy load
+        "model_loaded": recommender_service.loaded and recommender_service.model is not None,
+        "model_error": recommender_service.load_error,
+        "indexes_warm": recommender_service.warmed,
+        "rails_warm": rails_service.warmed,
+        "rails": rails_service.status(),
+    }
@@ -0,0 +1,16 @@
+from fastapi import APIRouter, Header, Response
+from typing import Optional
+from backend.app.core.config import settings
+from backend.app.schemas.schemas import HomeResponse
+from backend.app.services.rails_service import rails_service
+
+router = APIRouter()
+
+@router.get("/home", response_model=HomeResponse)
+async def get_home(if_none_match: Optional[str] = Header(None)):
+    """Every homepage rail in one response; 304 when the client's ETag is current"""
+    body, etag = await rails_service.get_home()
+    headers = {"ETag": etag, "Cache-Control": f"public, max-age={settings.HOME_MAX_AGE}"}
+    if if_none_match and etag in [tag.strip() for tag in if_none_match.split(",")]:
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
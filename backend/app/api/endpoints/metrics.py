@@ -0,0 +1,15 @@
+from fastapi import APIRouter
+from backend.app.services.tmdb_service import tmdb_service
+from backend.app.services.recommender_service import recommender_service
+
+router = APIRouter()
+
+@router.get("/metrics")
+def get_metrics():
+    return {
+        "tmdb_cache": tmdb_service.cache.stats(),
+        "tmdb_single_flight": tmdb_service.flights.stats(),
+        "tmdb_upstream": tmdb_service.stats(),
+        "recommend_cache": recommender_service.results.stats(),
+        "recommend_single_flight": recommender_service.flights.stats(),
+    }
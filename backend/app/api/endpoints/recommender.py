@@ -1,26 +1,61 @@
-from fastapi import APIRouter
-from backend.app.schemas.schemas import RecommendationRequest, RecommendationResponse
+from fastapi import APIRouter, Query, Response
+from backend.app.schemas.schemas import (
+    BatchRecommendationRequest,
+    BatchRecommendationResponse,
+    RecommendationRequest,
+    RecommendationResponse,
+    SuggestionSchema,
+    TitleMatch,
+)
 from backend.app.services.recommender_service import recommender_service
 from typing import List
 
 router = APIRouter()
 
 @router.get("/movies", response_model=List[str])
-def get_movies():
-    return recommender_service.get_movie_titles()
+async def get_movies():
+    return await recommender_service.get_movie_titles()
+
+@router.get("/suggest", response_model=List[SuggestionSchema])
+def suggest(prefix: str = "", limit: int = Query(10, ge=1, le=50)):
+    return [
+        SuggestionSchema(title=s.title, id=s.id, media_type=s.media_type, kind=s.kind)
+        for s in recommender_service.suggest(prefix, limit)
+    ]
 
 @router.get("/search", response_model=List[str])
-def search_movies(q: str = ""):
-    return recommender_service.search_movies(q)
+def search_movies(response: Response, q: str = "", page: int = Query(1, ge=1), limit: int = Query(20, ge=1, le=100)):
+    titles, total = recommender_service.search_movies(q, page, limit)
+    response.headers["X-Total-Count"] = str(total)
+    return titles
+
+@router.get("/did-you-mean", response_model=List[TitleMatch])
+def did_you_mean(q: str, limit: int = Query(5, ge=1, le=50)):
+    return [TitleMatch(title=t, score=sc) for t, sc in recommender_service.did_you_mean(q, limit)]
 
 @router.post("/recommend", response_model=RecommendationResponse)
-def get_recommendations(request: RecommendationRequest):
-    recommendations, source_movie = recommender_service.recommend(
+async def get_recommendations(request: RecommendationRequest):
+    recommendations, source_movie = await recommender_service.recommend(
         request.movie_title, 
         request.movie_id, 
-        request.media_type
+        request.media_type,
+        request.k
     )
+    did_you_mean = []
+    if not recommendations:
+        did_you_mean = [TitleMatch(title=t, score=sc) for t, sc in recommender_service.did_you_mean(request.movie_title)]
     return RecommendationResponse(
         recommendations=recommendations, 
-        source_movie=source_movie
+        source_movie=source_movie,
+        did_you_mean=did_you_mean
+    )
+
+@router.post("/recommend/batch", response_model=BatchRecommendationResponse)
+def get_batch_recommendations(request: BatchRecommendationRequest):
+    results, blended = recommender_service.recommend_batch(
+        request.movie_titles,
+        request.movie_ids,
+        request.k,
+        request.blend
     )
+    return BatchRecommendationResponse(results=results, blended=blended)
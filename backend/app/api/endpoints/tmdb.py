@@ -1,26 +1,31 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Response
 from typing import List
 from backend.app.schemas.schemas import MovieSchema
-from backend.app.services.tmdb_service import tmdb_service
+from backend.app.services.rails_service import rails_service
 
 router = APIRouter()
 
+# The rails are precomputed JSON (see RailsService), sent as they are
+
+async def _rail(name: str) -> Response:
+    return Response(content=await rails_service.get(name), media_type="application/json")
+
 @router.get("/trending", response_model=List[MovieSchema])
-def get_trending():
-    return tmdb_service.get_trending()
+async def get_trending():
+    return await _rail("trending")
 
 @router.get("/now-playing", response_model=List[MovieSchema])
-def get_now_playing():
-    return tmdb_service.get_now_playing()
+async def get_now_playing():
+    return await _rail("now-playing")
 
 @router.get("/popular-tv", response_model=List[MovieSchema])
-def get_popular_tv():
-    return tmdb_service.get_popular_tv()
+async def get_popular_tv():
+    return await _rail("popular-tv")
 
 @router.get("/top-rated", response_model=List[MovieSchema])
-def get_top_rated():
-    return tmdb_service.get_top_rated()
+async def get_top_rated():
+    return await _rail("top-rated")
 
 @router.get("/upcoming", response_model=List[MovieSchema])
-def get_upcoming():
-    return tmdb_service.get_upcoming()
+async def get_upcoming():
+    return await _rail("upcoming")
@@ -10,11 +10,99 @@ class Settings:
     PROJECT_NAME: str = "Movie Recommender System"
     API_V1_STR: str = "/api/v1"
     API_KEY: str = os.getenv("API_KEY")
+
+    # TMDB client (point TMDB_BASE_URL at a local stub server for testing)
+    TMDB_BASE_URL: str = os.getenv("TMDB_BASE_URL", "https://api.themoviedb.org/3")
+    TMDB_TIMEOUT: float = float(os.getenv("TMDB_TIMEOUT", 5))
+    TMDB_MAX_CONNECTIONS: int = int(os.getenv("TMDB_MAX_CONNECTIONS", 32))
+    TMDB_MAX_CONCURRENCY: int = int(os.getenv("TMDB_MAX_CONCURRENCY", 16))
+
+    # TMDB resilience: a client-side rate limit (requests per second, 0 = off, with
+    # bursts of TMDB_RATE_BURST), retries with jittered exponential backoff on
+    # 429/5xx/network errors, and a circuit breaker that fails fast for
+    # TMDB_BREAKER_COOLDOWN seconds after TMDB_BREAKER_THRESHOLD failed calls in a row.
+    # TMDB allows about 50 requests/s per IP. A cold /recommend makes up to 3 + k
+    # calls (13 at k=10), so this sustains about 4 cold recommends/s per process;
+    # divide it by WORKERS when several processes share one IP. Within
+    # HYBRID_BUDGET_MS, calls that would wait past the budget for a token are skipped
+    TMDB_RATE_LIMIT: float = float(os.getenv("TMDB_RATE_LIMIT", 50))
+    TMDB_RATE_BURST: int = int(os.getenv("TMDB_RATE_BURST", 50))
+    TMDB_RETRIES: int = int(os.getenv("TMDB_RETRIES", 2))
+    TMDB_RETRY_BACKOFF: float = float(os.getenv("TMDB_RETRY_BACKOFF", 0.2))
+    TMDB_RETRY_MAX_BACKOFF: float = float(os.getenv("TMDB_RETRY_MAX_BACKOFF", 2))
+    TMDB_BREAKER_THRESHOLD: int = int(os.getenv("TMDB_BREAKER_THRESHOLD", 5))
+    TMDB_BREAKER_COOLDOWN: float = float(os.getenv("TMDB_BREAKER_COOLDOWN", 30))
+
+    # TMDB response cache: entries are fresh for their TTL (seconds), then served
+    # stale for up to TMDB_STALE_TTL more while a background refresh runs
+    TMDB_CACHE_SIZE: int = int(os.getenv("TMDB_CACHE_SIZE", 5000))
+    TMDB_STALE_TTL: float = float(os.getenv("TMDB_STALE_TTL", 24 * 3600))
+    TMDB_TTL_TRENDING: float = float(os.getenv("TMDB_TTL_TRENDING", 10 * 60))
+    TMDB_TTL_LISTS: float = float(os.getenv("TMDB_TTL_LISTS", 60 * 60))
+    TMDB_TTL_SEARCH: float = float(os.getenv("TMDB_TTL_SEARCH", 60 * 60))
+    TMDB_TTL_RECOMMENDATIONS: float = float(os.getenv("TMDB_TTL_RECOMMENDATIONS", 24 * 3600))
+    TMDB_TTL_DETAILS: float = float(os.getenv("TMDB_TTL_DETAILS", 7 * 24 * 3600))
+
+    # How often the typeahead index picks up the current TMDB rails (seconds)
+    SUGGEST_REFRESH_INTERVAL: float = float(os.getenv("SUGGEST_REFRESH_INTERVAL", 10 * 60))
+
+    # How often the homepage rails served by /tmdb/* are refetched in the background (seconds)
+    RAILS_REFRESH_INTERVAL: float = float(os.getenv("RAILS_REFRESH_INTERVAL", 10 * 60))
+    # Cache-Control max-age (seconds) of GET /home; clients revalidate with its ETag after that
+    HOME_MAX_AGE: int = int(os.getenv("HOME_MAX_AGE", 60))
     
+    # Serving (python -m backend.app.serve): worker processes, and the threads each
+    # one runs sync endpoints on (FastAPI's default is 40)
+    HOST: str = os.getenv("HOST", "0.0.0.0")
+    PORT: int = int(os.getenv("PORT", 8000))
+    WORKERS: int = int(os.getenv("WORKERS", os.cpu_count() or 1))
+    THREADPOOL_SIZE: int = int(os.getenv("THREADPOOL_SIZE", 40))
+    # Print import, model load, warmup and first-response times at startup
+    STARTUP_PROFILE: bool = os.getenv("STARTUP_PROFILE", "0") == "1"
+
     # Path to the model files
     BASE_DIR = ROOT_DIR
     MODEL_PATH = os.path.join(BASE_DIR, "backend", "model")
     MOVIES_PKL = os.path.join(MODEL_PATH, "movies.pkl")
     SIMILARITY_PKL = os.path.join(MODEL_PATH, "similarity.pkl")
 
+    # Memory-mapped model artifacts (built by backend/model/build_index.py)
+    ARTIFACTS_DIR = os.getenv("ARTIFACTS_DIR", os.path.join(MODEL_PATH, "artifacts"))
+    VERIFY_ARTIFACTS: bool = os.getenv("VERIFY_ARTIFACTS", "1") == "1"
+    NEIGHBORS_K: int = int(os.getenv("NEIGHBORS_K", 50))
+
+    # Neighbor backend: "exact" reads the precomputed top-K table, "ann" searches
+    # an IVF index over SVD embeddings of the tags (for very large catalogs) and
+    # reranks its best ANN_CANDIDATES by exact tag cosine. ANN_NPROBE buckets are
+    # scanned per query: 16 gives recall@10 >= 0.9 from ~100k titles up (about
+    # 0.8 on the 5k catalog, which needs 64); higher is slower and closer to exact
+    # (python -m benchmarks.ann_recall)
+    NEIGHBOR_BACKEND: str = os.getenv("NEIGHBOR_BACKEND", "exact")
+    ANN_DIM: int = int(os.getenv("ANN_DIM", 256))
+    ANN_NPROBE: int = int(os.getenv("ANN_NPROBE", 16))
+    ANN_CANDIDATES: int = int(os.getenv("ANN_CANDIDATES", 100))
+
+    # Hybrid /recommend ranking: local neighbors merged with TMDB's recommendations
+    # and similar lists, scored by these weights (see services/hybrid_ranker.py).
+    # TMDB lists that miss HYBRID_BUDGET_MS (milliseconds) are left out.
+    HYBRID_BUDGET_MS: float = float(os.getenv("HYBRID_BUDGET_MS", 300))
+    HYBRID_LOCAL_CANDIDATES: int = int(os.getenv("HYBRID_LOCAL_CANDIDATES", 30))
+    HYBRID_WEIGHT_CONTENT: float = float(os.getenv("HYBRID_WEIGHT_CONTENT", 1.0))
+    HYBRID_WEIGHT_TMDB: float = float(os.getenv("HYBRID_WEIGHT_TMDB", 0.6))
+    HYBRID_WEIGHT_RATING: float = float(os.getenv("HYBRID_WEIGHT_RATING", 0.3))
+    HYBRID_WEIGHT_VOTES: float = float(os.getenv("HYBRID_WEIGHT_VOTES", 0.2))
+    HYBRID_WEIGHT_RECENCY: float = float(os.getenv("HYBRID_WEIGHT_RECENCY", 0.1))
+    HYBRID_RECENCY_HALF_LIFE: float = float(os.getenv("HYBRID_RECENCY_HALF_LIFE", 10))
+
+    # Finished /recommend results, keyed by the resolved title and k. Results with
+    # TMDB parts that missed the budget are only kept RECOMMEND_CACHE_PARTIAL_TTL
+    # seconds
+    RECOMMEND_CACHE_SIZE: int = int(os.getenv("RECOMMEND_CACHE_SIZE", 2000))
+    RECOMMEND_CACHE_TTL: float = float(os.getenv("RECOMMEND_CACHE_TTL", 60 * 60))
+    RECOMMEND_CACHE_PARTIAL_TTL: float = float(os.getenv("RECOMMEND_CACHE_PARTIAL_TTL", 30))
+
+    # Persistent store of enriched details (fill it with backend/model/prefetch_metadata.py)
+    METADATA_DB = os.getenv("METADATA_DB", os.path.join(MODEL_PATH, "metadata.sqlite3"))
+    METADATA_REFRESH_AGE: float = float(os.getenv("METADATA_REFRESH_AGE", 30 * 24 * 3600))
+
 settings = Settings()
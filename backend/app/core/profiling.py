@@ -0,0 +1,10 @@
+import time
+from backend.app.core.config import settings
+
+# When the app started importing (backend.app.main imports this module first)
+STARTED = time.perf_counter()
+
+def startup_mark(event: str):
+    """With STARTUP_PROFILE=1, print how long after the start of the import an event happened"""
+    if settings.STARTUP_PROFILE:
+        print(f"[startup] {(time.perf_counter() - STARTED) * 1000:>8.1f} ms  {event}")
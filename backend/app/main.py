@@ -1,9 +1,36 @@
-from fastapi import FastAPI
+from backend.app.core.profiling import startup_mark
+import asyncio
+from contextlib import asynccontextmanager
+import anyio
+from fastapi import FastAPI, Request
 from backend.app.api.api import api_router
 from backend.app.core.config import settings
+from backend.app.services.tmdb_service import tmdb_service
+from backend.app.services.recommender_service import recommender_service
+from backend.app.services.rails_service import rails_service
 import uvicorn
 
-app = FastAPI(title=settings.PROJECT_NAME, openapi_url=f"{settings.API_V1_STR}/openapi.json")
+startup_mark("imported backend.app.main")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Threads for the sync endpoints of this worker
+    anyio.to_thread.current_default_thread_limiter().total_tokens = settings.THREADPOOL_SIZE
+    startup_mark("lifespan started")
+    # Warm the model indexes off the event loop, and keep the homepage rails and
+    # the typeahead index in step with TMDB (GET /ready reports when all are warm)
+    tasks = [
+        asyncio.create_task(asyncio.to_thread(recommender_service.warm)),
+        asyncio.create_task(rails_service.keep_fresh()),
+        asyncio.create_task(recommender_service.keep_suggestions_fresh()),
+    ]
+    yield
+    for task in tasks:
+        task.cancel()
+    # Release the pooled TMDB connections
+    await tmdb_service.close()
+
+app = FastAPI(title=settings.PROJECT_NAME, openapi_url=f"{settings.API_V1_STR}/openapi.json", lifespan=lifespan)
 
 @app.get("/")
 def read_root():
@@ -11,5 +38,17 @@ def read_root():
 
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
+if settings.STARTUP_PROFILE:
+    first_response = []
+
+    @app.middleware("http")
+    async def mark_first_response(request: Request, call_next):
+        response = await call_next(request)
+        if not first_response:
+            first_response.append(request.url.path)
+            startup_mark(f"first response ({request.method} {request.url.path})")
+        return response
+
 if __name__ == "__main__":
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # Single process; python -m backend.app.serve runs several workers
+    uvicorn.run(app, host=settings.HOST, port=settings.PORT)
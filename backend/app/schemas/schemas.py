@@ -1,10 +1,11 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, model_validator
 from typing import List, Optional
 
 class RecommendationRequest(BaseModel):
     movie_title: str
     movie_id: Optional[int] = None
     media_type: Optional[str] = "movie"
+    k: int = Field(10, ge=1, le=50, description="Number of recommendations to return")
 
 
 class MovieSchema(BaseModel):
@@ -26,10 +27,61 @@ class MovieSchema(BaseModel):
     media_type: Optional[str] = "movie"
     number_of_seasons: Optional[int] = None
     number_of_episodes: Optional[int] = None
+    score: Optional[float] = None
+
+class TitleMatch(BaseModel):
+    title: str
+    score: float
+
+class SuggestionSchema(BaseModel):
+    title: str
+    id: Optional[int] = None
+    media_type: Optional[str] = None
+    kind: str = "title"
 
 class RecommendationResponse(BaseModel):
     recommendations: List[MovieSchema]
     source_movie: Optional[MovieSchema] = None
+    did_you_mean: List[TitleMatch] = []
+
+MAX_BATCH_SEEDS = 100
+
+class BatchRecommendationRequest(BaseModel):
+    movie_titles: List[str] = []
+    movie_ids: List[int] = []
+    k: int = Field(10, ge=1, le=50, description="Number of recommendations per seed")
+    blend: bool = True
+
+    @model_validator(mode="after")
+    def check_seed_count(self):
+        if len(self.movie_titles) + len(self.movie_ids) > MAX_BATCH_SEEDS:
+            raise ValueError(f"at most {MAX_BATCH_SEEDS} seeds (movie_titles and movie_ids together) per batch")
+        return self
+
+class SeedRecommendations(BaseModel):
+    seed: str
+    source_movie: Optional[MovieSchema] = None
+    recommendations: List[MovieSchema] = []
+
+class BatchRecommendationResponse(BaseModel):
+    results: List[SeedRecommendations]
+    blended: List[MovieSchema] = []
 
 class MovieListResponse(BaseModel):
     results: List[MovieSchema]
+
+class RailItemSchema(BaseModel):
+    """What a homepage rail card needs of a title"""
+    id: int
+    title: str
+    poster: Optional[str] = None
+    media_type: Optional[str] = "movie"
+    rating: float = 0.0
+    release_date: Optional[str] = None
+
+class HomeResponse(BaseModel):
+    trending: List[RailItemSchema] = []
+    now_playing: List[RailItemSchema] = []
+    popular_tv: List[RailItemSchema] = []
+    top_rated: List[RailItemSchema] = []
+    upcoming: List[RailItemSchema] = []
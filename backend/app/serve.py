@@ -0,0 +1,107 @@
+"""Production server: several worker processes sharing one loaded model.
+
+With gunicorn installed (Linux/macOS), the master imports the app, loads
+the model and builds its indexes (importing alone loads nothing, see
+RecommenderService.load) and fetches the first rails before forking
+(``preload_app``). The workers then share those pages copy-on-write.
+``gc.freeze()`` keeps the garbage collector from writing to (and so
+copying) the preloaded objects.
+
+Without gunicorn (e.g. on Windows), uvicorn starts the workers and each
+one imports the app. The artifacts are memory-mapped, so the workers
+still share one page-cache copy of them; only the Python-side indexes
+are built per worker.
+
+Each worker runs the app's lifespan (warmup, rail refresh) on its own
+and runs sync endpoints on THREADPOOL_SIZE threads.
+
+Usage (from the project root):
+    python -m backend.app.serve
+    python -m backend.app.serve --workers 4 --port 8000
+    WORKERS=4 THREADPOOL_SIZE=64 python -m backend.app.serve
+"""
+import argparse
+import asyncio
+import gc
+
+import uvicorn
+
+from backend.app.core.config import settings
+
+APP = "backend.app.main:app"
+
+
+def run_gunicorn(host: str, port: int, workers: int):
+    from gunicorn.app.base import BaseApplication
+
+    from backend.app.main import app
+    from backend.app.services.rails_service import rails_service
+    from backend.app.services.recommender_service import recommender_service
+    from backend.app.services.tmdb_service import tmdb_service
+
+    # Preload: importing the app does not load the model, so load it and build the
+    # indexes here, once, before the fork. Workers inherit them and the first rails
+    recommender_service.warm()
+    if not recommender_service.loaded or recommender_service.model is None:
+        raise SystemExit(f"Model not loaded before forking the workers: {recommender_service.load_error}")
+
+    async def warm_rails():
+        try:
+            await rails_service.refresh()
+        finally:
+            # The client belongs to this loop; each worker opens its own
+            await tmdb_service.close()
+
+    asyncio.run(warm_rails())
+    gc.collect()
+    gc.freeze()
+
+    try:
+        import uvicorn_worker  # noqa: F401
+        worker_class = "uvicorn_worker.UvicornWorker"
+    except ImportError:
+        # Deprecated home of the same worker
+        worker_class = "uvicorn.workers.UvicornWorker"
+
+    class Server(BaseApplication):
+        def load_config(self):
+            self.cfg.set("bind", f"{host}:{port}")
+            self.cfg.set("workers", workers)
+            self.cfg.set("worker_class", worker_class)
+            self.cfg.set("preload_app", True)
+
+        def load(self):
+            return app
+
+    Server().run()
+
+
+def run_uvicorn(host: str, port: int, workers: int):
+    uvicorn.run(APP, host=host, port=port, workers=workers)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the API with several worker processes")
+    parser.add_argument("--host", default=settings.HOST)
+    parser.add_argument("--port", type=int, default=settings.PORT)
+    parser.add_argument("--workers", type=int, default=settings.WORKERS)
+    parser.add_argument("--server", choices=["auto", "gunicorn", "uvicorn"], default="auto",
+                        help="gunicorn preloads the model before forking; auto uses it when installed")
+    args = parser.parse_args()
+
+    server = args.server
+    if server == "auto":
+        try:
+            import gunicorn  # noqa: F401
+            server = "gunicorn"
+        except ImportError:
+            server = "uvicorn"
+    print(f"Serving {APP} on {args.host}:{args.port} with {args.workers} {server} workers")
+    if server == "gunicorn":
+        run_gunicorn(args.host, args.port, args.workers)
+    else:
+        run_uvicorn(args.host, args.port, args.workers)
+
+
+if __name__ == "__main__":
+    main()
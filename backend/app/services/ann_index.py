@@ -0,0 +1,169 @@
+
+import numpy as np
+from typing import Tuple
+from backend.app.services.neighbor_index import csr_gather, top_k
+
+def train_ivf(embeddings: np.ndarray, nlist: int, iterations: int = 10, sample: int = 100_000, seed: int = 0) -> np.ndarray:
+    """Spherical k-means centroids (nlist x dim) for an IVF index, trained on a sample"""
+    rng = np.random.default_rng(seed)
+    train = embeddings[rng.choice(len(embeddings), size=min(sample, len(embeddings)), replace=False)]
+    nlist = min(nlist, len(train))
+    centroids = train[rng.choice(len(train), size=nlist, replace=False)].copy()
+
+    for _ in range(iterations):
+        labels = assign_ivf(train, centroids)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, labels, train)
+        norms = np.linalg.norm(sums, axis=1, keepdims=True)
+        # Empty lists keep their old centroid
+        centroids = np.where(norms > 0, sums / np.maximum(norms, 1e-12), centroids)
+    return centroids.astype(np.float32)
+
+
+def assign_ivf(embeddings: np.ndarray, centroids: np.ndarray, block_size: int = 65536) -> np.ndarray:
+    """Closest centroid (by inner product) of every embedding"""
+    labels = np.empty(len(embeddings), dtype=np.int32)
+    for start in range(0, len(embeddings), block_size):
+        labels[start:start + block_size] = np.argmax(embeddings[start:start + block_size] @ centroids.T, axis=1)
+    return labels
+
+
+class IVFIndex:
+    """Inverted-file ANN index over L2-normalized item embeddings.
+
+    Items are bucketed by their closest k-means centroid. A query scores the
+    centroids, then only the items of the ``nprobe`` best buckets, so the
+    work per query is about nlist + nprobe * N / nlist dot products instead
+    of N. The embeddings are copied into bucket order once, so a probed
+    bucket is a contiguous slice rather than a gather. ``insert`` adds items
+    to their bucket without retraining.
+
+    SVD embeddings only approximate the tag cosine, so when ``tag_vectors``
+    is given the best ``candidates`` items are reranked by their exact
+    sparse cosine before the top k are returned.
+
+    Exposes the same ``neighbors``/``neighbors_batch`` interface as
+    NeighborIndex, so RecommenderService can use either.
+    """
+
+    def __init__(self, embeddings: np.ndarray, centroids: np.ndarray, assignments: np.ndarray, nprobe: int = 8,
+                 tag_vectors=None, candidates: int = 100):
+        self.centroids = np.asarray(centroids, dtype=np.float32)
+        self.nprobe = nprobe
+        self.tag_vectors = tag_vectors
+        self.candidates = candidates
+        assignments = np.asarray(assignments)
+        # CSR buckets: items of list l are items[offsets[l]:offsets[l + 1]]
+        self.items = np.argsort(assignments, kind="stable").astype(np.int32)
+        self.offsets = np.zeros(len(self.centroids) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(assignments, minlength=len(self.centroids)), out=self.offsets[1:])
+        self.bucketed = np.ascontiguousarray(np.asarray(embeddings, dtype=np.float32)[self.items])
+        # Slot of every position in the bucket-ordered copy
+        self.slots = np.empty(len(self.items), dtype=np.int32)
+        self.slots[self.items] = np.arange(len(self.items), dtype=np.int32)
+
+        # Inserted items: their vectors, and their bucket membership
+        self.added = np.empty((0, self.centroids.shape[1]), dtype=np.float32)
+        self.added_count = 0
+        self.added_lists = {}
+        self.added_tags = []
+
+    @classmethod
+    def from_artifacts(cls, artifacts, nprobe: int = 8, candidates: int = 100) -> "IVFIndex":
+        return cls(artifacts.embeddings, artifacts.ivf_centroids, artifacts.ivf_assignments, nprobe,
+                   artifacts.tag_vectors(), candidates)
+
+    def __len__(self):
+        return len(self.bucketed) + self.added_count
+
+    def vectors(self, positions: np.ndarray) -> np.ndarray:
+        positions = np.asarray(positions)
+        base = positions < len(self.bucketed)
+        if base.all():
+            return self.bucketed[self.slots[positions]]
+        out = np.empty((len(positions), self.centroids.shape[1]), dtype=np.float32)
+        out[base] = self.bucketed[self.slots[positions[base]]]
+        out[~base] = self.added[positions[~base] - len(self.bucketed)]
+        return out
+
+    def _tag_cosine(self, positions: np.ndarray, query_tags) -> np.ndarray:
+        """Exact tag cosine of each position with a 1-row CSR query, straight off the CSR arrays"""
+        dense_query = np.zeros(self.tag_vectors.shape[1], dtype=np.float32)
+        dense_query[query_tags.indices] = query_tags.data
+        scores = np.zeros(len(positions), dtype=np.float32)
+        base = positions < len(self.bucketed)
+
+        indptr, indices, data = self.tag_vectors.indptr, self.tag_vectors.indices, self.tag_vectors.data
+        starts, ends = indptr[positions[base]], indptr[positions[base] + 1]
+        lengths = ends - starts
+        if lengths.sum():
+            # Flat index of every stored entry of the selected rows, then a per-row sum
+            flat, row = csr_gather(starts, lengths)
+            scores[base] = np.bincount(row, weights=data[flat] * dense_query[indices[flat]], minlength=len(starts))
+        for n in np.flatnonzero(~base):
+            added = self.added_tags[positions[n] - len(self.bucketed)]
+            scores[n] = added.data @ dense_query[added.indices]
+        return scores
+
+    def tags(self, index: int):
+        """1-row CSR tag vector of a position"""
+        if index < len(self.bucketed):
+            return self.tag_vectors[[index]]
+        return self.added_tags[index - len(self.bucketed)]
+
+    def insert(self, embedding: np.ndarray, tag_vector=None) -> int:
+        """Add one L2-normalized embedding (and its 1-row tag vector when reranking); returns its position"""
+        if self.tag_vectors is not None:
+            if tag_vector is None:
+                raise ValueError("This index reranks by tag cosine; insert() needs the tag vector")
+            self.added_tags.append(tag_vector)
+        if self.added_count == len(self.added):
+            grown = np.empty((max(16, 2 * len(self.added)), self.centroids.shape[1]), dtype=np.float32)
+            grown[:self.added_count] = self.added[:self.added_count]
+            self.added = grown
+        self.added[self.added_count] = embedding
+        position = len(self.bucketed) + self.added_count
+        self.added_count += 1
+        bucket = int(np.argmax(self.centroids @ embedding))
+        self.added_lists.setdefault(bucket, []).append(position)
+        return position
+
+    def search(self, query: np.ndarray, k: int = 10, exclude: int = None, query_tags=None) -> Tuple[np.ndarray, np.ndarray]:
+        """Approximate top-k (positions, scores), best first.
+
+        Scored by embedding inner product, or by tag cosine when ``query_tags``
+        is given and the index holds tag vectors.
+        """
+        probes, _ = top_k(self.centroids @ query, self.nprobe)
+        candidates = [self.items[self.offsets[p]:self.offsets[p + 1]] for p in probes]
+        scores = [self.bucketed[self.offsets[p]:self.offsets[p + 1]] @ query for p in probes]
+        for p in probes:
+            if p in self.added_lists:
+                added = np.array(self.added_lists[p], dtype=np.int32)
+                candidates.append(added)
+                scores.append(self.added[added - len(self.bucketed)] @ query)
+        candidates, scores = np.concatenate(candidates), np.concatenate(scores)
+        if exclude is not None:
+            keep = candidates != exclude
+            candidates, scores = candidates[keep], scores[keep]
+
+        rerank = query_tags is not None and self.tag_vectors is not None
+        best, scores = top_k(scores, max(k, self.candidates) if rerank else k)
+        candidates = candidates[best]
+        if rerank:
+            best, scores = top_k(self._tag_cosine(candidates, query_tags), k)
+            candidates = candidates[best]
+        return candidates, scores
+
+    def neighbors(self, index: int, k: int = 10) -> Tuple[np.ndarray, np.ndarray]:
+        query_tags = self.tags(index) if self.tag_vectors is not None else None
+        return self.search(self.vectors([index])[0], k, exclude=index, query_tags=query_tags)
+
+    def neighbors_batch(self, indices: np.ndarray, k: int = 10) -> Tuple[np.ndarray, np.ndarray]:
+        """(len(indices), k) arrays; missing neighbors are -1 in the ids"""
+        ids = np.full((len(indices), k), -1, dtype=np.int64)
+        scores = np.zeros((len(indices), k), dtype=np.float32)
+        for row, index in enumerate(indices):
+            found, found_scores = self.neighbors(int(index), k)
+            ids[row, :len(found)], scores[row, :len(found)] = found, found_scores
+        return ids, scores
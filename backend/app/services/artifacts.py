@@ -0,0 +1,244 @@
+
+import hashlib
+import json
+import os
+import shutil
+import time
+import numpy as np
+from typing import Dict, Iterable, List
+from backend.app.core.config import settings
+
+# Bump whenever the file layout below changes; old artifacts are then rejected on load.
+FORMAT_VERSION = 2
+MANIFEST_FILE = "manifest.json"
+# Catalog rows are TMDB movies or TV series; media_types.npy holds the index into this
+MEDIA_TYPES = ("movie", "tv")
+# Optional dense-embedding files for the ANN neighbor backend (see build_index.build_ann)
+ANN_ARRAYS = ("embeddings", "svd_components", "ivf_centroids", "ivf_assignments")
+# Optional explanation features (see explain_index.ExplainIndex)
+EXPLAIN_KINDS = ("genres", "keywords", "director", "cast")
+
+
+class ArtifactError(Exception):
+    """Raised when model artifacts are missing, from another format version, or corrupt"""
+
+
+class StringColumn:
+    """Read-only column of strings stored as one UTF-8 blob plus an offsets array.
+
+    Both files are memory-mapped, so every worker process shares the same
+    page-cache copy and only the strings that are actually read get decoded.
+    """
+
+    def __init__(self, blob: np.ndarray, offsets: np.ndarray):
+        self.blob = blob
+        self.offsets = offsets
+
+    @classmethod
+    def open(cls, directory: str, name: str) -> "StringColumn":
+        blob_path = os.path.join(directory, f"{name}.bin")
+        if os.path.getsize(blob_path) == 0:
+            # np.memmap refuses empty files (e.g. a catalog of empty strings)
+            blob = np.zeros(0, dtype=np.uint8)
+        else:
+            blob = np.memmap(blob_path, dtype=np.uint8, mode='r')
+        offsets = np.load(os.path.join(directory, f"{name}.offsets.npy"), mmap_mode='r')
+        return cls(blob, offsets)
+
+    @staticmethod
+    def write(directory: str, name: str, values: Iterable[str]) -> List[str]:
+        """Write a column and return the file names it produced"""
+        encoded = [(v or "").encode("utf-8") for v in values]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(e) for e in encoded], out=offsets[1:])
+        with open(os.path.join(directory, f"{name}.bin"), "wb") as f:
+            f.write(b"".join(encoded))
+        np.save(os.path.join(directory, f"{name}.offsets.npy"), offsets)
+        return [f"{name}.bin", f"{name}.offsets.npy"]
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i: int) -> str:
+        start, end = self.offsets[i], self.offsets[i + 1]
+        return self.blob[start:end].tobytes().decode("utf-8")
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def tolist(self) -> List[str]:
+        return list(self)
+
+
+class ModelArtifacts:
+    """Memory-mapped catalog columns, tag vectors and neighbor table described by a manifest"""
+
+    def __init__(self, path: str, manifest: Dict):
+        self.path = path
+        self.manifest = manifest
+        self.movie_ids = np.load(os.path.join(path, "movie_ids.npy"), mmap_mode='r')
+        self.titles = StringColumn.open(path, "titles")
+        self.tags = StringColumn.open(path, "tags")
+        self.neighbor_ids = np.load(os.path.join(path, "neighbor_ids.npy"), mmap_mode='r')
+        self.neighbor_scores = np.load(os.path.join(path, "neighbor_scores.npy"), mmap_mode='r')
+        self.vocabulary = StringColumn.open(path, "vocabulary")
+        if "media_types.npy" in manifest["files"]:
+            self.media_types = np.load(os.path.join(path, "media_types.npy"), mmap_mode='r')
+        else:
+            # Built before TV series were indexed: every row is a movie
+            self.media_types = np.zeros(len(self.movie_ids), dtype=np.uint8)
+        for name in ANN_ARRAYS:
+            file_name = f"{name}.npy"
+            setattr(self, name, np.load(os.path.join(path, file_name), mmap_mode='r') if file_name in manifest["files"] else None)
+        # kind -> (names, indptr, ids), for the kinds that were built
+        self.explain = {}
+        for kind in EXPLAIN_KINDS:
+            if f"explain_{kind}.ids.npy" in manifest["files"]:
+                self.explain[kind] = (
+                    StringColumn.open(path, f"explain_{kind}"),
+                    np.load(os.path.join(path, f"explain_{kind}.indptr.npy"), mmap_mode='r'),
+                    np.load(os.path.join(path, f"explain_{kind}.ids.npy"), mmap_mode='r'),
+                )
+
+    @property
+    def has_ann(self) -> bool:
+        return self.embeddings is not None
+
+    def tag_vectors(self):
+        """L2-normalized bag-of-words tag vectors (CSR over the memory-mapped arrays)"""
+        from scipy.sparse import csr_matrix
+
+        data, indices, indptr = (np.load(os.path.join(self.path, f"tag_vectors.{part}.npy"), mmap_mode='r')
+                                 for part in ("data", "indices", "indptr"))
+        return csr_matrix((data, indices, indptr), shape=(len(self), len(self.vocabulary)))
+
+    def warm(self, chunk_size: int = 1 << 20) -> int:
+        """Read every artifact file once, so the memory maps are served from the page cache; returns bytes read"""
+        total = 0
+        for name in self.manifest["files"]:
+            with open(os.path.join(self.path, name), "rb") as f:
+                for chunk in iter(lambda: f.read(chunk_size), b""):
+                    total += len(chunk)
+        return total
+
+    @property
+    def version(self) -> str:
+        return self.manifest["version"]
+
+    def __len__(self):
+        return len(self.movie_ids)
+
+
+def _sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def save_artifacts(movie_ids, titles, tags, neighbor_ids, neighbor_scores, vocabulary, tag_vectors,
+                   ann: Dict[str, np.ndarray] = None, media_types=None, explain: Dict = None, path: str = None) -> Dict:
+    """Write a new artifact directory and swap it in place of the old one.
+
+    ``vocabulary`` and the CSR ``tag_vectors`` are kept so later incremental
+    builds can vectorize new movies into the same space. ``ann`` optionally
+    holds the ANN_ARRAYS for the approximate neighbor backend. ``media_types``
+    gives each row's MEDIA_TYPES name ("movie" when omitted); ids are only
+    unique per media type. ``explain`` maps EXPLAIN_KINDS to the
+    (names, indptr, ids) triples of explain_index.encode_features.
+
+    Files are written to a sibling temp directory first, so a running server
+    never sees a half-written set. Workers that already mapped the old files
+    keep reading them until they reload.
+    """
+    path = path or settings.ARTIFACTS_DIR
+    tmp_path = f"{path}.tmp-{os.getpid()}"
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    os.makedirs(tmp_path)
+
+    files = []
+    np.save(os.path.join(tmp_path, "movie_ids.npy"), np.asarray(movie_ids, dtype=np.int64))
+    files.append("movie_ids.npy")
+    codes = np.zeros(len(movie_ids), dtype=np.uint8)
+    if media_types is not None:
+        media_types = np.asarray(media_types)
+        unknown = set(np.unique(media_types)) - set(MEDIA_TYPES)
+        if unknown:
+            raise ValueError(f"Unknown media types {sorted(unknown)}")
+        for code, name in enumerate(MEDIA_TYPES):
+            codes[media_types == name] = code
+    np.save(os.path.join(tmp_path, "media_types.npy"), codes)
+    files.append("media_types.npy")
+    files += StringColumn.write(tmp_path, "titles", titles)
+    files += StringColumn.write(tmp_path, "tags", tags)
+    np.save(os.path.join(tmp_path, "neighbor_ids.npy"), np.asarray(neighbor_ids, dtype=np.int32))
+    np.save(os.path.join(tmp_path, "neighbor_scores.npy"), np.asarray(neighbor_scores, dtype=np.float32))
+    files += ["neighbor_ids.npy", "neighbor_scores.npy"]
+    files += StringColumn.write(tmp_path, "vocabulary", vocabulary)
+    tag_vectors = tag_vectors.tocsr()
+    for part, values, dtype in (("data", tag_vectors.data, np.float32), ("indices", tag_vectors.indices, np.int32),
+                                ("indptr", tag_vectors.indptr, np.int64)):
+        np.save(os.path.join(tmp_path, f"tag_vectors.{part}.npy"), np.asarray(values, dtype=dtype))
+        files.append(f"tag_vectors.{part}.npy")
+    for kind, (names, indptr, ids) in (explain or {}).items():
+        if kind not in EXPLAIN_KINDS:
+            raise ValueError(f"Unknown explanation feature {kind}")
+        files += StringColumn.write(tmp_path, f"explain_{kind}", names)
+        np.save(os.path.join(tmp_path, f"explain_{kind}.indptr.npy"), np.asarray(indptr, dtype=np.int64))
+        np.save(os.path.join(tmp_path, f"explain_{kind}.ids.npy"), np.asarray(ids, dtype=np.int32))
+        files += [f"explain_{kind}.indptr.npy", f"explain_{kind}.ids.npy"]
+    for name, values in (ann or {}).items():
+        if name not in ANN_ARRAYS:
+            raise ValueError(f"Unknown ANN array {name}")
+        np.save(os.path.join(tmp_path, f"{name}.npy"), np.asarray(values))
+        files.append(f"{name}.npy")
+
+    checksums = {name: _sha256(os.path.join(tmp_path, name)) for name in files}
+    version = hashlib.sha256("".join(checksums[name] for name in files).encode()).hexdigest()[:16]
+    manifest = {
+        "format_version": FORMAT_VERSION,
+        "version": version,
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "count": len(movie_ids),
+        "k": int(np.shape(neighbor_ids)[1]),
+        "vocabulary_size": len(vocabulary),
+        "files": {name: {"sha256": checksums[name], "bytes": os.path.getsize(os.path.join(tmp_path, name))} for name in files},
+    }
+    with open(os.path.join(tmp_path, MANIFEST_FILE), "w") as f:
+        json.dump(manifest, f, indent=2)
+
+    old_path = f"{path}.old-{os.getpid()}"
+    if os.path.exists(path):
+        os.rename(path, old_path)
+    os.rename(tmp_path, path)
+    shutil.rmtree(old_path, ignore_errors=True)
+    return manifest
+
+
+def load_artifacts(path: str = None, verify: bool = None) -> ModelArtifacts:
+    """Open the artifact directory, checking its format version and (optionally) checksums"""
+    path = path or settings.ARTIFACTS_DIR
+    verify = settings.VERIFY_ARTIFACTS if verify is None else verify
+
+    manifest_path = os.path.join(path, MANIFEST_FILE)
+    if not os.path.exists(manifest_path):
+        raise ArtifactError(f"No model artifacts at {path}. Build them with: python -m backend.model.build_index")
+    with open(manifest_path) as f:
+        manifest = json.load(f)
+
+    if manifest.get("format_version") != FORMAT_VERSION:
+        raise ArtifactError(
+            f"Artifacts at {path} use format version {manifest.get('format_version')}, "
+            f"expected {FORMAT_VERSION}. Rebuild them with: python -m backend.model.build_index"
+        )
+
+    for name, info in manifest["files"].items():
+        file_path = os.path.join(path, name)
+        if not os.path.exists(file_path) or os.path.getsize(file_path) != info["bytes"]:
+            raise ArtifactError(f"Artifact file {name} is missing or truncated")
+        if verify and _sha256(file_path) != info["sha256"]:
+            raise ArtifactError(f"Checksum mismatch for artifact file {name}")
+
+    return ModelArtifacts(path, manifest)
@@ -0,0 +1,108 @@
+
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable, Optional, Tuple
+
+class TTLCache:
+    """Bounded in-memory LRU cache with a per-entry TTL and stale window.
+
+    An entry is *fresh* until its TTL expires, then *stale* for another
+    ``stale_ttl`` seconds (callers may serve it while refreshing it), then
+    gone. The least recently used entry is evicted once ``max_size`` is hit.
+    """
+
+    FRESH = "fresh"
+    STALE = "stale"
+
+    def __init__(self, max_size: int = 1024):
+        self.max_size = max_size
+        self._data = OrderedDict()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Tuple[Any, Optional[str]]:
+        """Return (value, FRESH | STALE), or (None, None) on a miss"""
+        entry = self._data.get(key)
+        now = time.monotonic()
+        if entry is None or now >= entry[2]:
+            if entry is not None:
+                del self._data[key]
+            self.misses += 1
+            return None, None
+
+        self._data.move_to_end(key)
+        value, fresh_until, _ = entry
+        if now < fresh_until:
+            self.hits += 1
+            return value, self.FRESH
+        self.stale_hits += 1
+        return value, self.STALE
+
+    def set(self, key: Hashable, value: Any, ttl: float, stale_ttl: float = 0):
+        now = time.monotonic()
+        self._data[key] = (value, now + ttl, now + ttl + stale_ttl)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def delete(self, key: Hashable):
+        self._data.pop(key, None)
+
+    def clear(self):
+        self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.stale_hits + self.misses
+        return {
+            "size": len(self._data),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round((self.hits + self.stale_hits) / lookups, 4) if lookups else 0.0,
+        }
+
+
+class SingleFlight:
+    """Coalesces concurrent identical calls into one in-flight task.
+
+    The first caller for a key starts ``fetch()``; callers that arrive
+    while it runs await the same task instead of starting their own, and
+    the key is free again as soon as it finishes. A caller that is
+    cancelled does not cancel the shared task.
+    """
+
+    def __init__(self):
+        self._inflight = {}
+        self.calls = 0
+        self.shared = 0
+
+    async def do(self, key: Hashable, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        self.calls += 1
+        task = self._inflight.get(key)
+        # Finished tasks, or ones left behind by a closed event loop, are not reused
+        if task is None or task.done() or task.get_loop() is not asyncio.get_running_loop():
+            task = asyncio.ensure_future(fetch())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._inflight.pop(key) if self._inflight.get(key) is t else None)
+        else:
+            self.shared += 1
+        return await asyncio.shield(task)
+
+    def __len__(self):
+        return len(self._inflight)
+
+    def stats(self) -> dict:
+        return {
+            "in_flight": len(self._inflight),
+            "calls": self.calls,
+            "shared": self.shared,
+        }
@@ -0,0 +1,90 @@
+
+import numpy as np
+from typing import Dict, List, Optional, Sequence, Tuple
+from backend.app.services.artifacts import EXPLAIN_KINDS
+from backend.app.services.neighbor_index import csr_gather
+
+# Labels of the "Recommended because it shares" parts (in EXPLAIN_KINDS order) and how many shared names each shows
+LABELS = {"genres": "Genre", "keywords": "Keywords", "director": "Director", "cast": "Cast"}
+SHOWN = {"genres": 2, "keywords": 2, "director": 1, "cast": 2}
+NO_SHARED_FEATURES = "Recommended based on similar themes and style."
+
+def encode_features(rows: Sequence[Sequence[str]]) -> Tuple[List[str], np.ndarray, np.ndarray]:
+    """(names, indptr, ids): one CSR row of name ids per title, in the given order, duplicates dropped"""
+    names = sorted({name for row in rows for name in row if name})
+    lookup = {name: n for n, name in enumerate(names)}
+    ids = []
+    indptr = np.zeros(len(rows) + 1, dtype=np.int64)
+    for n, row in enumerate(rows):
+        row_ids = list(dict.fromkeys(lookup[name] for name in row if name))
+        ids += row_ids
+        indptr[n + 1] = indptr[n] + len(row_ids)
+    return names, indptr, np.array(ids, dtype=np.int32)
+
+
+class ExplainIndex:
+    """Precomputed genre, keyword, director and cast ids per catalog title.
+
+    Each kind is a CSR layout: row ``i`` holds the name ids of title ``i``
+    in ``ids[indptr[i]:indptr[i + 1]]`` (billing order for cast), and
+    ``names`` maps ids back to text. ``explain`` intersects a source row
+    with a whole list of targets at once, so the reasoning text needs no
+    TMDB details.
+    """
+
+    def __init__(self, features: Dict[str, Tuple[Sequence[str], np.ndarray, np.ndarray]]):
+        self.features = features
+
+    @classmethod
+    def from_artifacts(cls, artifacts) -> Optional["ExplainIndex"]:
+        return cls(artifacts.explain) if artifacts.explain else None
+
+    def names(self, kind: str, position: int) -> List[str]:
+        names, indptr, ids = self.features[kind]
+        return [names[i] for i in ids[indptr[position]:indptr[position + 1]]]
+
+    def to_lists(self, kind: str) -> List[List[str]]:
+        """Every row's names (for re-encoding after an incremental update)"""
+        names, indptr, ids = self.features[kind]
+        names = names.tolist() if hasattr(names, "tolist") else list(names)
+        words = [names[i] for i in ids]
+        return [words[indptr[n]:indptr[n + 1]] for n in range(len(indptr) - 1)]
+
+    def covered(self, positions) -> np.ndarray:
+        """Whether each row has any features stored (titles missing from the build source have none)"""
+        positions = np.asarray(positions, dtype=np.int64)
+        covered = np.zeros(len(positions), dtype=bool)
+        for _, indptr, _ in self.features.values():
+            covered |= indptr[positions + 1] > indptr[positions]
+        return covered
+
+    def shared(self, kind: str, source: int, targets: np.ndarray) -> List[List[str]]:
+        """Up to SHOWN[kind] names each target shares with the source, in the target's order"""
+        names, indptr, ids = self.features[kind]
+        shared = [[] for _ in range(len(targets))]
+        source_ids = ids[indptr[source]:indptr[source + 1]]
+        if not len(source_ids) or not len(targets):
+            return shared
+
+        starts, lengths = indptr[targets], indptr[targets + 1] - indptr[targets]
+        # Flat index of every stored id of the target rows, and the row it belongs to
+        flat, row = csr_gather(starts, lengths)
+        hit = np.isin(ids[flat], source_ids)
+        flat, row = flat[hit], row[hit]
+        # Position of each hit within its row; keep the first SHOWN[kind]
+        keep = np.arange(len(row)) - np.searchsorted(row, row) < SHOWN[kind]
+        for r, i in zip(row[keep].tolist(), ids[flat[keep]].tolist()):
+            shared[r].append(names[i])
+        return shared
+
+    def explain(self, source: int, targets: Sequence[int]) -> List[str]:
+        """Reasoning text for every target row, in one pass per feature kind"""
+        targets = np.asarray(targets, dtype=np.int64)
+        parts = [[] for _ in range(len(targets))]
+        for kind in EXPLAIN_KINDS:
+            if kind not in self.features:
+                continue
+            for n, names in enumerate(self.shared(kind, source, targets)):
+                if names:
+                    parts[n].append(f"{LABELS[kind]}: {', '.join(names)}")
+        return ["Recommended because it shares: " + " | ".join(p) if p else NO_SHARED_FEATURES for p in parts]
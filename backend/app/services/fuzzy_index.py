@@ -0,0 +1,141 @@
+
+import difflib
+import numpy as np
+from collections import Counter, defaultdict
+from typing import List, Sequence, Tuple
+from backend.app.services.neighbor_index import csr_gather, top_k
+
+_PAD = "\x00"
+
+def _trigrams(text: str) -> List[str]:
+    padded = _PAD * 2 + text + _PAD
+    return [padded[i:i + 3] for i in range(len(padded) - 2)]
+
+
+class TrigramIndex:
+    """Character-trigram inverted index for typo-tolerant title matching.
+
+    ``match`` returns exactly what ``difflib.get_close_matches`` would, but
+    only scores a shortlist. A candidate whose SequenceMatcher ratio reaches
+    the cutoff is within an indel distance of ``d = (1 - cutoff) * (la + lb)``
+    of the query, and by the q-gram lemma then shares at least
+    ``max(la, lb) - 2 - 3 * d`` trigrams with it. Candidates that fail this
+    bound, the length bound or difflib's character-multiset bound (its
+    ``quick_ratio``, computed here for all survivors at once) are skipped
+    without running SequenceMatcher.
+
+    ``suggest`` is the looser "did you mean" variant: casefolded, ranked by
+    trigram overlap, then reranked by SequenceMatcher ratio.
+    """
+
+    def __init__(self, titles: Sequence[str]):
+        self.titles = list(titles)
+        self.lengths = np.array([len(t) for t in self.titles], dtype=np.int32)
+        self._raw = self._build(self.titles)
+        self._folded = self._build([t.casefold() for t in self.titles])
+        self._chars = self._build_char_counts(self.titles)
+
+    @staticmethod
+    def _build(titles: Sequence[str]):
+        """CSR postings: trigram -> title positions (repeated per occurrence)"""
+        postings = defaultdict(list)
+        for position, title in enumerate(titles):
+            for gram in _trigrams(title):
+                postings[gram].append(position)
+
+        vocab = {}
+        offsets = np.zeros(len(postings) + 1, dtype=np.int64)
+        for n, (gram, positions) in enumerate(postings.items()):
+            vocab[gram] = n
+            offsets[n + 1] = offsets[n] + len(positions)
+        flat = np.fromiter((p for positions in postings.values() for p in positions), dtype=np.int32, count=offsets[-1])
+        return vocab, offsets, flat
+
+    @staticmethod
+    def _build_char_counts(titles: Sequence[str]):
+        """CSR character histograms, one row per title"""
+        vocab, offsets, columns, counts = {}, [0], [], []
+        for title in titles:
+            for char, count in Counter(title).items():
+                columns.append(vocab.setdefault(char, len(vocab)))
+                counts.append(count)
+            offsets.append(len(columns))
+        return vocab, np.array(offsets, dtype=np.int64), np.array(columns, dtype=np.int32), np.array(counts, dtype=np.int32)
+
+    def _shared_chars(self, query: str, positions: np.ndarray) -> np.ndarray:
+        """Size of the character-multiset intersection of the query with each title"""
+        vocab, offsets, columns, counts = self._chars
+        query_counts = np.zeros(len(vocab) + 1, dtype=np.int32)
+        for char, count in Counter(query).items():
+            query_counts[vocab.get(char, len(vocab))] += count
+        query_counts[len(vocab)] = 0  # characters no title uses
+
+        starts, ends = offsets[positions], offsets[positions + 1]
+        lengths = ends - starts
+        flat, row = csr_gather(starts, lengths)
+        shared = np.minimum(counts[flat], query_counts[columns[flat]])
+        return np.bincount(row, weights=shared, minlength=len(positions))
+
+    def _shared_counts(self, postings, query: str) -> np.ndarray:
+        """Per title, how many of its trigram occurrences appear in the query"""
+        vocab, offsets, flat = postings
+        slices = [flat[offsets[vocab[g]]:offsets[vocab[g] + 1]] for g in set(_trigrams(query)) if g in vocab]
+        if not slices:
+            return np.zeros(len(self.titles), dtype=np.int64)
+        return np.bincount(np.concatenate(slices), minlength=len(self.titles))
+
+    def match(self, query: str, n: int = 1, cutoff: float = 0.6) -> List[Tuple[str, float]]:
+        """Same results as difflib.get_close_matches(query, titles, n, cutoff), with scores"""
+        if not query or not self.titles:
+            return []
+        lb = len(query)
+        la = self.lengths
+
+        # ratio <= 2 * min(la, lb) / (la + lb) (difflib's real_quick_ratio)
+        length_ok = 2 * np.minimum(la, lb) >= cutoff * (la + lb) - 1e-9
+        max_indels = np.floor((1 - cutoff) * (la + lb) + 1e-9)
+        min_shared = np.maximum(la, lb) - 2 - 3 * max_indels
+        shared = self._shared_counts(self._raw, query)
+        candidates = np.flatnonzero(length_ok & (shared >= min_shared))
+        # ratio <= 2 * |chars(a) & chars(b)| / (la + lb) (difflib's quick_ratio)
+        quick_ok = 2 * self._shared_chars(query, candidates) >= cutoff * (la[candidates] + lb) - 1e-9
+        candidates = candidates[quick_ok]
+
+        matcher = difflib.SequenceMatcher()
+        matcher.set_seq2(query)
+        scored = []
+        for position in candidates:
+            title = self.titles[position]
+            matcher.set_seq1(title)
+            if matcher.real_quick_ratio() >= cutoff and matcher.quick_ratio() >= cutoff:
+                score = matcher.ratio()
+                if score >= cutoff:
+                    scored.append((score, title))
+
+        # difflib breaks score ties by the larger string
+        scored.sort(reverse=True)
+        return [(title, score) for score, title in scored[:n]]
+
+    def suggest(self, query: str, n: int = 5, cutoff: float = 0.6, shortlist: int = 50) -> List[Tuple[str, float]]:
+        """Ranked "did you mean" candidates (title, score) for a free-text query"""
+        folded = query.strip().casefold()
+        if not folded or not self.titles:
+            return []
+
+        shared = self._shared_counts(self._folded, folded)
+        total = len(folded) + 2 + self.lengths + 2
+        dice = 2 * shared / total
+        best, _ = top_k(dice, shortlist)
+        best = best[shared[best] > 0]
+
+        matcher = difflib.SequenceMatcher()
+        matcher.set_seq2(folded)
+        scored = []
+        for position in best:
+            matcher.set_seq1(self.titles[position].casefold())
+            score = matcher.ratio()
+            if score >= cutoff:
+                scored.append((round(score, 4), self.titles[position]))
+
+        scored.sort(key=lambda x: (-x[0], x[1]))
+        return [(title, score) for score, title in scored[:n]]
@@ -0,0 +1,101 @@
+
+import re
+import time
+import numpy as np
+from typing import List, NamedTuple, Sequence, Tuple
+from backend.app.core.config import settings
+from backend.app.schemas.schemas import MovieSchema
+from backend.app.services.neighbor_index import top_k
+
+_YEAR = re.compile(r"^(\d{4})")
+
+class HybridWeights(NamedTuple):
+    content: float = 1.0
+    tmdb: float = 0.6
+    rating: float = 0.3
+    votes: float = 0.2
+    recency: float = 0.1
+
+    @classmethod
+    def from_settings(cls) -> "HybridWeights":
+        return cls(
+            settings.HYBRID_WEIGHT_CONTENT,
+            settings.HYBRID_WEIGHT_TMDB,
+            settings.HYBRID_WEIGHT_RATING,
+            settings.HYBRID_WEIGHT_VOTES,
+            settings.HYBRID_WEIGHT_RECENCY,
+        )
+
+
+def movie_features(movies: Sequence[MovieSchema]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """(rating, vote_count, release year) columns of candidate movies; unknown years are NaN"""
+    rating = np.array([m.rating or 0.0 for m in movies], dtype=np.float64)
+    votes = np.array([m.vote_count or 0 for m in movies], dtype=np.float64)
+    years = []
+    for m in movies:
+        match = _YEAR.match(m.release_date or "")
+        years.append(float(match.group(1)) if match else np.nan)
+    return rating, votes, np.array(years, dtype=np.float64)
+
+
+def hybrid_rank(keys: np.ndarray, content: np.ndarray, tmdb_rank: np.ndarray, rating: np.ndarray,
+                votes: np.ndarray, years: np.ndarray, k: int, weights: HybridWeights = None,
+                half_life: float = None, now_year: float = None) -> Tuple[np.ndarray, np.ndarray]:
+    """Best k candidates of a merged local + TMDB candidate set, as (rows, scores).
+
+    One row per candidate, in any order; rows sharing a key (the same title
+    found by several sources) are merged first, keeping the best content
+    similarity and TMDB rank and any known rating, votes and year. NaN
+    marks a missing value: ``content`` for titles outside the catalog,
+    ``tmdb_rank`` for titles TMDB did not list.
+
+    Every feature is scaled to 0..1 over the candidate set:
+
+    - content: cosine similarity / the best one
+    - tmdb: 1 / (1 + rank in the TMDB list)
+    - rating: vote average / 10
+    - votes: log(1 + votes) / log(1 + the most votes)
+    - recency: 0.5 ** (age in years / half_life)
+
+    and the score is their weighted sum. Returned rows point at the first
+    occurrence of each chosen key.
+    """
+    weights = weights or HybridWeights.from_settings()
+    half_life = half_life or settings.HYBRID_RECENCY_HALF_LIFE
+    now_year = now_year or time.gmtime().tm_year
+    if len(keys) == 0 or k <= 0:
+        return np.zeros(0, dtype=np.intp), np.zeros(0)
+
+    unique, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+
+    def merged(values, reduce):
+        out = np.full(len(unique), np.nan)
+        reduce.at(out, inverse, np.asarray(values, dtype=np.float64))
+        return out
+
+    # fmax/fmin ignore NaN, so a value known from any source wins
+    content, tmdb_rank = merged(content, np.fmax), merged(tmdb_rank, np.fmin)
+    rating, votes, years = merged(rating, np.fmax), merged(votes, np.fmax), merged(years, np.fmax)
+
+    features = np.stack([
+        np.nan_to_num(content) / max(np.nanmax(content, initial=0), 1e-9),
+        np.nan_to_num(1 / (1 + tmdb_rank)),
+        np.nan_to_num(rating) / 10,
+        np.log1p(np.nan_to_num(votes)) / max(np.log1p(np.nanmax(votes, initial=0)), 1e-9),
+        np.nan_to_num(0.5 ** (np.maximum(now_year - years, 0) / half_life)),
+    ])
+    scores = np.asarray(weights, dtype=np.float64) @ features
+    best, best_scores = top_k(scores, k)
+    return first[best], best_scores
+
+
+def merge_sources(local: List[MovieSchema], local_scores: Sequence[float], tmdb_lists: Sequence[List[MovieSchema]]):
+    """Candidate list plus (content, tmdb_rank) columns for local neighbors followed by each TMDB list"""
+    candidates = list(local)
+    content = list(local_scores)
+    tmdb_rank = [np.nan] * len(local)
+    for listed in tmdb_lists:
+        candidates += listed
+        content += [np.nan] * len(listed)
+        tmdb_rank += range(len(listed))
+    return candidates, np.array(content, dtype=np.float64), np.array(tmdb_rank, dtype=np.float64)
@@ -0,0 +1,141 @@
+
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional, Tuple
+from backend.app.core.config import settings
+from backend.app.schemas.schemas import MovieSchema
+
+# Per-request fields that are never persisted
+_TRANSIENT_FIELDS = {"reasoning", "score"}
+# Ids per IN (...) query, below SQLite's default limit of 999 bound variables
+_MAX_VARIABLES = 500
+# Guards opening a store's connection in a process
+_OPEN_LOCK = threading.Lock()
+
+class MetadataRecord:
+    def __init__(self, movie: MovieSchema, fetched_at: float):
+        self.movie = movie
+        self.fetched_at = fetched_at
+
+    @property
+    def is_stale(self) -> bool:
+        return time.time() - self.fetched_at > settings.METADATA_REFRESH_AGE
+
+
+class MetadataStore:
+    """Persistent SQLite store of enriched TMDB details keyed by (media_type, id).
+
+    Keeps the full MovieSchema (genres, credits, keywords, imdb_id, ...) with
+    the time it was fetched, so restarts and offline runs don't need TMDB.
+
+    The database is opened on first use, not on construction, and once per
+    process: SQLite connections must not cross a fork, so a forked worker
+    opens its own.
+    """
+
+    def __init__(self, path: str = None):
+        self.path = path or settings.METADATA_DB
+        self._pid = None
+        self._conn = None
+        self._lock = threading.Lock()
+        # Connections inherited from the parent process, kept unused rather than closed
+        self._inherited = []
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, check_same_thread=False, timeout=5)
+        # WAL lets every worker process read while one of them writes
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS movies ("
+            " media_type TEXT NOT NULL,"
+            " id INTEGER NOT NULL,"
+            " data TEXT NOT NULL,"
+            " fetched_at REAL NOT NULL,"
+            " PRIMARY KEY (media_type, id))"
+        )
+        conn.commit()
+        return conn
+
+    @contextmanager
+    def _connection(self):
+        """This process's connection, held under its lock"""
+        if self._pid != os.getpid():
+            with _OPEN_LOCK:
+                if self._pid != os.getpid():
+                    if self._conn is not None:
+                        self._inherited.append(self._conn)
+                    self._lock = threading.Lock()
+                    self._conn = self._connect()
+                    self._pid = os.getpid()
+        with self._lock:
+            yield self._conn
+
+    def get(self, movie_id: int, media_type: str = "movie") -> Optional[MetadataRecord]:
+        with self._connection() as conn:
+            row = conn.execute(
+                "SELECT data, fetched_at FROM movies WHERE media_type = ? AND id = ?",
+                (media_type, int(movie_id)),
+            ).fetchone()
+        if row is None:
+            return None
+        return MetadataRecord(MovieSchema.model_validate_json(row[0]), row[1])
+
+    def get_many(self, keys: Iterable[Tuple[int, str]]) -> Dict[Tuple[int, str], MetadataRecord]:
+        """Records for many (id, media_type) pairs; missing keys are left out"""
+        by_type = {}
+        for movie_id, media_type in keys:
+            by_type.setdefault(media_type, []).append(int(movie_id))
+        rows = []
+        with self._connection() as conn:
+            for media_type, movie_ids in by_type.items():
+                # One query per media type, in chunks below SQLite's bound-variable limit
+                for start in range(0, len(movie_ids), _MAX_VARIABLES):
+                    chunk = movie_ids[start:start + _MAX_VARIABLES]
+                    rows += conn.execute(
+                        f"SELECT media_type, id, data, fetched_at FROM movies"
+                        f" WHERE media_type = ? AND id IN ({', '.join('?' * len(chunk))})",
+                        (media_type, *chunk),
+                    ).fetchall()
+        return {
+            (movie_id, media_type): MetadataRecord(MovieSchema.model_validate_json(data), fetched_at)
+            for media_type, movie_id, data, fetched_at in rows
+        }
+
+    def put(self, movie: MovieSchema, fetched_at: float = None):
+        self.put_many([movie], fetched_at)
+
+    def put_many(self, movies: List[MovieSchema], fetched_at: float = None):
+        fetched_at = fetched_at or time.time()
+        rows = [
+            (m.media_type or "movie", m.id, m.model_dump_json(exclude=_TRANSIENT_FIELDS), fetched_at)
+            for m in movies if m is not None
+        ]
+        with self._connection() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO movies (media_type, id, data, fetched_at) VALUES (?, ?, ?, ?)",
+                rows,
+            )
+            conn.commit()
+
+    def ids(self, media_type: str = "movie") -> set:
+        with self._connection() as conn:
+            rows = conn.execute("SELECT id FROM movies WHERE media_type = ?", (media_type,)).fetchall()
+        return {r[0] for r in rows}
+
+    def __len__(self):
+        with self._connection() as conn:
+            return conn.execute("SELECT COUNT(*) FROM movies").fetchone()[0]
+
+    def close(self):
+        if self._pid != os.getpid():
+            return
+        with self._lock:
+            self._conn.close()
+            self._conn = None
+            self._pid = None
+
+metadata_store = MetadataStore()
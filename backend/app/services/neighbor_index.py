@@ -0,0 +1,90 @@
+
+import numpy as np
+from typing import Tuple
+
+def top_k(scores: np.ndarray, k: int, exclude=None) -> Tuple[np.ndarray, np.ndarray]:
+    """Indices and values of the k largest scores along the last axis, best first.
+
+    Works on a single row or a 2D block of rows. Uses argpartition, so only
+    the k winners are sorted: O(N + k log k) per row instead of sorting all N.
+    ``exclude`` (an index or list of indices, 1D input only) is never returned,
+    e.g. the query movie itself. Ties are broken by the lower index.
+    """
+    scores = np.asarray(scores)
+    if exclude is not None:
+        scores = scores.astype(np.float32, copy=True)
+        scores[exclude] = -np.inf
+
+    n = scores.shape[-1]
+    k = max(0, min(k, n))
+    if k == 0:
+        empty = np.zeros(scores.shape[:-1] + (0,), dtype=np.intp)
+        return empty, empty.astype(scores.dtype)
+    if k < n:
+        indices = np.argpartition(-scores, k - 1, axis=-1)[..., :k]
+    else:
+        indices = np.broadcast_to(np.arange(n), scores.shape).copy()
+    values = np.take_along_axis(scores, indices, axis=-1)
+
+    order = np.lexsort((indices, -values), axis=-1)
+    indices = np.take_along_axis(indices, order, axis=-1)
+    values = np.take_along_axis(values, order, axis=-1)
+
+    if exclude is not None:
+        keep = values > -np.inf
+        indices, values = indices[keep], values[keep]
+    return indices, values
+
+def csr_gather(starts: np.ndarray, lengths: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """(flat, row) for a gather of several CSR rows given their starts and lengths.
+
+    ``flat`` indexes every stored entry of the rows, in row order, into the
+    CSR data/indices arrays; ``row`` is the position of its row in ``starts``.
+    """
+    lengths = np.asarray(lengths)
+    flat = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths) + np.repeat(starts, lengths)
+    row = np.repeat(np.arange(len(lengths)), lengths)
+    return flat, row
+
+class NeighborIndex:
+    """Precomputed top-K neighbors for every movie.
+
+    Row ``i`` of ``ids`` holds the catalog row positions of the K most similar
+    movies to movie ``i``, best first, and ``scores`` holds the matching cosine
+    similarities. Rows with fewer than K neighbors are padded with -1. The
+    arrays are usually memory-mapped from the model artifacts.
+    """
+
+    def __init__(self, ids: np.ndarray, scores: np.ndarray):
+        self.ids = ids
+        self.scores = scores
+
+    @classmethod
+    def from_artifacts(cls, artifacts) -> "NeighborIndex":
+        return cls(artifacts.neighbor_ids, artifacts.neighbor_scores)
+
+    @property
+    def k(self) -> int:
+        return self.ids.shape[1]
+
+    def __len__(self):
+        return self.ids.shape[0]
+
+    def neighbors(self, index: int, k: int = 10) -> Tuple[np.ndarray, np.ndarray]:
+        """Return (row positions, scores) of the k nearest neighbors of a movie.
+
+        Rows are already ranked at build time, so this is a slice; k is capped
+        at the K the artifacts were built with.
+        """
+        row_ids = self.ids[index, :k]
+        row_scores = self.scores[index, :k]
+        valid = row_ids >= 0
+        return row_ids[valid], row_scores[valid]
+
+    def neighbors_batch(self, indices: np.ndarray, k: int = 10) -> Tuple[np.ndarray, np.ndarray]:
+        """Gather the k nearest neighbors of many movies at once.
+
+        Returns (len(indices), k) arrays; missing neighbors are -1 in the ids.
+        """
+        indices = np.asarray(indices, dtype=np.intp)
+        return self.ids[indices, :k], self.scores[indices, :k]
@@ -0,0 +1,105 @@
+
+import asyncio
+import hashlib
+import time
+from typing import Dict, List, Optional
+from pydantic import TypeAdapter
+from backend.app.core.config import settings
+from backend.app.core.profiling import startup_mark
+from backend.app.schemas.schemas import HomeResponse, MovieSchema, RailItemSchema
+from backend.app.services.tmdb_service import tmdb_service
+
+_MOVIE_LIST = TypeAdapter(List[MovieSchema])
+
+class RailsService:
+    """The homepage rails, fetched in the background and kept as ready-to-send JSON.
+
+    ``refresh`` fetches every rail concurrently and swaps in the encoded
+    bodies of those that came back non-empty, so a failed refresh keeps the
+    previous data. The rail endpoints serve the stored bytes as they are.
+
+    It also assembles ``home``, every rail in one compact body (only what
+    a rail card shows) for GET /home, and its ETag.
+    """
+
+    # Rail name (its /tmdb path) -> TMDBService method
+    RAILS = {
+        "trending": "get_trending",
+        "now-playing": "get_now_playing",
+        "popular-tv": "get_popular_tv",
+        "top-rated": "get_top_rated",
+        "upcoming": "get_upcoming",
+    }
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        """Forget every rail, as before the first refresh"""
+        self.movies: Dict[str, List[MovieSchema]] = {}
+        self.bodies: Dict[str, bytes] = {}
+        self.sizes: Dict[str, int] = {}
+        self.updated: Dict[str, float] = {}
+        self.home: Optional[bytes] = None
+        self.home_etag: Optional[str] = None
+        # True once the first refresh has finished (whatever TMDB answered)
+        self.warmed = False
+
+    async def refresh_rail(self, name: str) -> Optional[bytes]:
+        movies = await getattr(tmdb_service, self.RAILS[name])()
+        if movies:
+            self.movies[name] = movies
+            self.bodies[name] = _MOVIE_LIST.dump_json(movies)
+            self.sizes[name] = len(movies)
+            self.updated[name] = time.time()
+        return self.bodies.get(name)
+
+    async def refresh(self):
+        await asyncio.gather(*(self.refresh_rail(name) for name in self.RAILS))
+        self._assemble_home()
+        if not self.warmed:
+            startup_mark("rails warm")
+        self.warmed = True
+
+    def _assemble_home(self):
+        home = HomeResponse(**{
+            name.replace("-", "_"): [RailItemSchema(**m.model_dump(include=set(RailItemSchema.model_fields))) for m in movies]
+            for name, movies in self.movies.items()
+        })
+        self.home = home.model_dump_json().encode()
+        self.home_etag = f'"{hashlib.sha1(self.home).hexdigest()[:16]}"'
+
+    async def get_home(self):
+        """(body, etag) of the aggregated rails; assembled on the spot only before the first refresh"""
+        if self.home is None:
+            await self.refresh()
+        return self.home, self.home_etag
+
+    async def keep_fresh(self):
+        """Background task: refresh the rails every RAILS_REFRESH_INTERVAL seconds"""
+        while True:
+            try:
+                await self.refresh()
+            except Exception as e:
+                print(f"Error refreshing rails: {e}")
+            await asyncio.sleep(settings.RAILS_REFRESH_INTERVAL)
+
+    async def get(self, name: str) -> bytes:
+        """Encoded rail; fetched on the spot only if it has never been warmed"""
+        body = self.bodies.get(name)
+        if body is None:
+            body = await self.refresh_rail(name)
+        return body if body is not None else b"[]"
+
+    def status(self) -> dict:
+        now = time.time()
+        return {
+            name: {
+                "warm": name in self.bodies,
+                "items": self.sizes.get(name, 0),
+                "age_seconds": round(now - self.updated[name], 1) if name in self.updated else None,
+            }
+            for name in self.RAILS
+        }
+
+rails_service = RailsService()
@@ -1,90 +1,222 @@
 
-import pickle
-import requests
-import pandas as pd
-import difflib
+import asyncio
+import threading
+import time
+import numpy as np
 from backend.app.core.config import settings
-from backend.app.services.tmdb_service import tmdb_service
-from backend.app.schemas.schemas import MovieSchema
+from backend.app.core.profiling import startup_mark
+from backend.app.services.cache import SingleFlight, TTLCache
+from backend.app.services.tmdb_service import request_deadline, tmdb_service
+from backend.app.services.artifacts import MEDIA_TYPES, ArtifactError, load_artifacts
+from backend.app.services.neighbor_index import NeighborIndex, top_k
+from backend.app.services.ann_index import IVFIndex
+from backend.app.services.title_index import TitleIndex
+from backend.app.services.fuzzy_index import TrigramIndex
+from backend.app.services.search_index import SearchIndex
+from backend.app.services.suggest_index import Suggestion, SuggestIndex
+from backend.app.services.explain_index import ExplainIndex
+from backend.app.services.hybrid_ranker import hybrid_rank, merge_sources, movie_features
+from backend.app.schemas.schemas import MovieSchema, SeedRecommendations
+
+GENRES_LIST = ["Action", "Adventure", "Animation", "Comedy", "Crime", "Documentary", "Drama", "Family", "Fantasy", "History", "Horror", "Music", "Mystery", "Romance", "Science Fiction", "Sci-Fi", "TV Movie", "Thriller", "War", "Western"]
+
+# Typeahead weights: TMDB rails (current and trending) > genres > local catalog (0..1)
+RAIL_WEIGHT = 2.0
+GENRE_WEIGHT = 1.5
+
+# Set by load(); reading any of them first triggers it
+_MODEL_ATTRS = frozenset([
+    "model", "neighbors", "media_types", "title_index", "fuzzy_index", "search_index",
+    "tag_vectors", "explain_index", "suggestions", "movie_titles",
+])
 
 class RecommenderService:
+    """Local recommendations, title resolution and search over the model artifacts.
+
+    Creating the service is cheap: the artifacts are opened and the indexes
+    built by ``load()``, which runs once, on the first access to any of the
+    model attributes (or from the startup warmup). If the artifacts cannot
+    be loaded, ``load_error`` says why and the service serves TMDB-only.
+    """
+
     def __init__(self):
-        try:
-            self.movies = pickle.load(open(settings.MOVIES_PKL, 'rb'))
-            self.similarity = pickle.load(open(settings.SIMILARITY_PKL, 'rb'))
-        except FileNotFoundError:
-            print(f"Model files not found at {settings.MODEL_PATH}")
-            self.movies = None
-            self.similarity = None
-
-    def get_movie_titles(self):
-        import re
-        GENRES_LIST = ["Action", "Adventure", "Animation", "Comedy", "Crime", "Documentary", "Drama", "Family", "Fantasy", "History", "Horror", "Music", "Mystery", "Romance", "Science Fiction", "Sci-Fi", "TV Movie", "Thriller", "War", "Western"]
-        
-        local_movies = []
-        if self.movies is not None:
-             for _, row in self.movies.iterrows():
-                 local_movies.append(row['title'])
-        
-        # Add trending and popular titles from TMDB to the list
-        try:
-             tmdb_movies = []
-             trending = tmdb_service.get_trending()
-             now_playing = tmdb_service.get_now_playing()
-             upcoming = tmdb_service.get_upcoming()
-             popular_tv = tmdb_service.get_popular_tv()
-             
-             for m in trending + now_playing + upcoming + popular_tv:
-                 if m.title:
-                     tmdb_movies.append(m.title)
-             
-             # Combine locally, add Genres, and deduplicate
-             all_movies = sorted(list(set(local_movies + tmdb_movies + GENRES_LIST)))
-             return all_movies
-        except Exception:
-             return sorted(list(set(local_movies + GENRES_LIST)))
-
-    def fetch_poster(self, movie_id):
-        if not settings.API_KEY:
-            return "https://via.placeholder.com/500x750?text=No+API+Key"
-        
-        try:
-            url = "https://api.themoviedb.org/3/movie/{}?api_key={}&language=en-US".format(movie_id, settings.API_KEY)
-            response = requests.get(url)
-            data = response.json()
-            poster_path = data.get('poster_path')
-            
-            if poster_path:
-                return "https://image.tmdb.org/t/p/w500/" + poster_path
-            else:
-                return "https://via.placeholder.com/500x750?text=No+Poster"
-        except Exception as e:
-            print(f"Error fetching poster for movie {movie_id}: {e}")
-            return "https://via.placeholder.com/500x750?text=Error"
+        self._load_lock = threading.Lock()
+        self._loaded = False
+        self.load_error = None
+        self.load_seconds = None
+
+        # Set by warm(), reported by /ready
+        self.warmed = False
+
+        # TMDB fetches that outlived a request's latency budget
+        self._background = set()
+
+        # Finished /recommend results by (media_type, id, k). The model is loaded once per
+        # process, so new artifacts only take effect on a restart, which starts this empty
+        self.results = TTLCache(settings.RECOMMEND_CACHE_SIZE)
+        # Concurrent requests for the same resolved title share one computation
+        self.flights = SingleFlight()
+
+    def __getattr__(self, name):
+        # Only reached for attributes that are not set yet, i.e. the model state before load().
+        # Loads on the calling thread, so coroutines await ensure_loaded() first instead
+        if name in _MODEL_ATTRS and not self.__dict__.get("_loaded", True):
+            self.load()
+            return self.__dict__[name]
+        raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    def load(self):
+        """Open the artifacts and build the indexes; runs once, later calls return at once.
+
+        Attributes are set in dependency order, so other threads that reach
+        one not built yet wait on the lock until the whole load is done.
+        """
+        if self._loaded:
+            return
+        with self._load_lock:
+            if self._loaded:
+                return
+            start = time.perf_counter()
+            try:
+                self.model = load_artifacts()
+                self.neighbors = self._neighbor_backend(self.model)
+                self.media_types = np.array(MEDIA_TYPES)[np.asarray(self.model.media_types)]
+                self.title_index = TitleIndex(self.model.titles, self.model.movie_ids, self.media_types)
+                self.fuzzy_index = TrigramIndex(self.title_index.titles)
+                self.search_index = SearchIndex(self.title_index.titles, self.model.tags)
+                self.tag_vectors = self.model.tag_vectors()
+                self.explain_index = ExplainIndex.from_artifacts(self.model)
+            except ArtifactError as e:
+                print(f"Model artifacts not loaded: {e}")
+                self.load_error = str(e)
+                self.model = None
+                self.neighbors = None
+                self.media_types = None
+                self.title_index = None
+                self.fuzzy_index = None
+                self.search_index = None
+                self.tag_vectors = None
+                self.explain_index = None
+
+            # Materialized once; refresh_suggestions() merges in the TMDB rails
+            self.suggestions = SuggestIndex(self._base_suggestions())
+            self.movie_titles = sorted(e.title for e in self.suggestions.entries)
+            self.load_seconds = time.perf_counter() - start
+            self._loaded = True
+        startup_mark(f"model loaded in {self.load_seconds * 1000:.0f} ms")
+
+    async def ensure_loaded(self):
+        """load() on a worker thread, so a request that arrives during warmup does not block the event loop"""
+        if not self._loaded:
+            await asyncio.to_thread(self.load)
+
+    def warm(self):
+        """Load the model, page in the artifacts and run each index once, so the first request pays no cold-start cost"""
+        self.load()
+        if self.model is not None:
+            size = self.model.warm()
+            title = self.title_index.titles[0]
+            self.neighbors_of([0], settings.NEIGHBORS_K)
+            self.fuzzy_index.match(title, n=3, cutoff=0.85)
+            self.search_index.search(title, 0, 20)
+            self.suggestions.suggest(title[:3], 10)
+            if self.explain_index is not None:
+                self.explain_index.explain(0, np.arange(min(len(self.title_index), 10)))
+            print(f"Warmed {size / 2**20:.1f} MiB of model artifacts")
+        self.warmed = True
+        startup_mark("indexes warm")
+
+    @staticmethod
+    def _neighbor_backend(model):
+        """Exact precomputed table, or the IVF index over embeddings (NEIGHBOR_BACKEND=ann)"""
+        if settings.NEIGHBOR_BACKEND == "ann":
+            if not model.has_ann:
+                raise ArtifactError("NEIGHBOR_BACKEND=ann but the artifacts have no embeddings. Rebuild them with --ann-dim")
+            return IVFIndex.from_artifacts(model, settings.ANN_NPROBE, settings.ANN_CANDIDATES)
+        return NeighborIndex.from_artifacts(model)
+
+    def _base_suggestions(self):
+        """Genres plus the local catalog, weighted by a 0..1 popularity prior.
+
+        The prior averages how often a movie is another movie's neighbor and
+        its catalog row (the TMDB 5000 export is ordered roughly by budget).
+        """
+        entries = [Suggestion(g, GENRE_WEIGHT, kind="genre") for g in GENRES_LIST]
+        if self.model is not None:
+            ids = np.asarray(self.model.neighbor_ids)
+            in_degree = np.bincount(ids[ids >= 0], minlength=len(self.title_index))
+            row_prior = 1 - np.arange(len(self.title_index)) / len(self.title_index)
+            popularity = 0.5 * in_degree / max(int(in_degree.max()), 1) + 0.5 * row_prior
+            for position, title in enumerate(self.title_index.titles):
+                entries.append(Suggestion(title, float(popularity[position]), int(self.model.movie_ids[position]),
+                                          str(self.media_types[position])))
+        return entries
+
+    async def refresh_suggestions(self):
+        """Rebuild the typeahead index with the current TMDB rails and swap it in"""
+        trending, now_playing, upcoming, popular_tv = await asyncio.gather(
+            tmdb_service.get_trending(),
+            tmdb_service.get_now_playing(),
+            tmdb_service.get_upcoming(),
+            tmdb_service.get_popular_tv(),
+        )
+        # Off the event loop: the first call may have to load the model
+        entries = await asyncio.to_thread(self._base_suggestions)
+        for rail in (trending, now_playing, upcoming, popular_tv):
+            for rank, m in enumerate(rail):
+                if m.title:
+                    entries.append(Suggestion(m.title, RAIL_WEIGHT - 0.01 * rank, m.id, m.media_type))
+
+        suggestions = await asyncio.to_thread(SuggestIndex, entries)
+        self.suggestions = suggestions
+        self.movie_titles = sorted(e.title for e in suggestions.entries)
+
+    async def keep_suggestions_fresh(self):
+        """Background task: refresh the typeahead index every SUGGEST_REFRESH_INTERVAL seconds"""
+        while True:
+            try:
+                await self.refresh_suggestions()
+            except Exception as e:
+                print(f"Error refreshing suggestions: {e}")
+            await asyncio.sleep(settings.SUGGEST_REFRESH_INTERVAL)
+
+    async def get_movie_titles(self):
+        await self.ensure_loaded()
+        return self.movie_titles
+
+    def suggest(self, prefix: str, limit: int = 10):
+        return self.suggestions.suggest(prefix, limit)
+
+    async def fetch_poster(self, movie_id, media_type: str = "movie"):
+        return await tmdb_service.get_poster(movie_id, media_type)
 
     def find_closest_movie(self, title: str):
-        if self.movies is None:
+        if self.model is None:
             return None
-        
-        # 1. Exact match
-        if title in self.movies['title'].values:
-            return title
-            
-        # 2. Case-insensitive match normalization
-        # Create a mapping of lower_case -> real_title
-        title_map = {t.lower(): t for t in self.movies['title'].values}
-        
-        if title.lower() in title_map:
-            return title_map[title.lower()]
+
+        # 1. Exact match, 2. Case-insensitive match normalization (both O(1) dict lookups)
+        position = self.title_index.position_for_title(title)
+        if position is not None:
+            return self.title_index.titles[position]
             
         # 3. Very Close Match (Typo tolerance only)
         # We increase cutoff to 0.85 to avoid matching "The Avengers" to "Avengers: Infinity War" or unrelated movies
-        matches = difflib.get_close_matches(title, self.movies['title'].values, n=1, cutoff=0.85)
+        matches = self.fuzzy_index.match(title, n=1, cutoff=0.85)
         if matches:
-            return matches[0]
+            return matches[0][0]
             
         return None
 
+    def did_you_mean(self, query: str, n: int = 5):
+        """Ranked (title, score) suggestions for a title that did not resolve"""
+        if self.fuzzy_index is None:
+            return []
+        return self.fuzzy_index.suggest(query, n=n)
+
     def generate_reasoning(self, source: MovieSchema, target: MovieSchema):
         reasons = []
         
@@ -118,88 +250,350 @@ class RecommenderService:
              
         return "Recommended because it shares: " + " | ".join(reasons)
 
-    def search_movies(self, query: str):
-        """Search for movies by title or genre/tag in local database"""
-        results = []
-        if self.movies is not None:
-             # Search in Title OR Tags (Genre usually in tags)
-             mask = (
-                 self.movies['title'].str.contains(query, case=False, na=False) | 
-                 self.movies['tags'].str.contains(query, case=False, na=False)
-             )
-             matches = self.movies[mask]
-             results = matches['title'].head(20).tolist()
-        
-        # If few local results, maybe search TMDB? 
-        # For now, let's mix the filtered results with the full list if query is empty, but we are searching query.
-        return results
+    def explain(self, source: MovieSchema, targets) -> list:
+        """Reasoning text for every target.
+
+        Pairs where both titles are in the catalog (with features) are
+        explained from the precomputed features in one pass, without TMDB
+        details; the rest fall back to generate_reasoning on their details.
+        """
+        reasons = [None] * len(targets)
+        source_position = None
+        if self.explain_index is not None:
+            source_position = self.title_index.position_for_id(source.id, source.media_type or "movie")
+        if source_position is not None:
+            positions = [self.title_index.position_for_id(t.id, t.media_type or "movie") for t in targets]
+            known = [n for n, position in enumerate(positions) if position is not None]
+            covered = self.explain_index.covered([source_position] + [positions[n] for n in known])
+            known = [n for n, ok in zip(known, covered[1:]) if ok and covered[0]]
+            for n, reason in zip(known, self.explain_index.explain(source_position, [positions[n] for n in known])):
+                reasons[n] = reason
+        return [reason or self.generate_reasoning(source, target) for reason, target in zip(reasons, targets)]
+
+    def search_movies(self, query: str, page: int = 1, limit: int = 20):
+        """Ranked search over titles and tags in the local database.
+
+        Returns one page of titles and the total number of matches.
+        """
+        if self.model is None:
+            return [], 0
+        if not query.strip():
+            # Empty query: catalog order, as before
+            start = (page - 1) * limit
+            return self.title_index.titles[start:start + limit], len(self.title_index)
+
+        positions, total = self.search_index.search(query, (page - 1) * limit, limit)
+        return [self.title_index.titles[p] for p in positions], total
+
+    def resolve_title(self, title: str, media_type: str = None):
+        """Catalog row position for a (possibly misspelled) title, or None.
 
-    def recommend(self, movie_title: str, movie_id: int = None, media_type: str = "movie"):
+        With ``media_type``, only titles of that type match.
+        """
+        if media_type is None:
+            local_title = self.find_closest_movie(title)
+            return self.title_index.exact[local_title] if local_title else None
+        if self.model is None:
+            return None
+        position = self.title_index.position_for_title(title, media_type)
+        if position is None:
+            for match, _ in self.fuzzy_index.match(title, n=3, cutoff=0.85):
+                position = self.title_index.position_for_title(match, media_type)
+                if position is not None:
+                    break
+        return position
+
+    def resolve_ids(self, movie_ids, media_type: str = "movie") -> np.ndarray:
+        """Catalog row positions for many TMDB ids at once (-1 where unknown)"""
+        if self.title_index is None:
+            return np.full(len(movie_ids), -1, dtype=np.int64)
+        return self.title_index.positions_for_ids(movie_ids, media_type)
+
+    def neighbors_of(self, positions: np.ndarray, k: int = 10):
+        """(len(positions), k) neighbor ids and scores, restricted to each seed's media type.
+
+        The exact table is already scored within each media type, but the
+        ANN backend searches every row, so when the catalog holds both types
+        the top NEIGHBORS_K are filtered to the seed's type (and may come back
+        shorter than k). Missing neighbors are -1 in the ids.
+        """
+        positions = np.asarray(positions, dtype=np.intp)
+        if len(self.title_index.id_positions) < 2:
+            return self.neighbors.neighbors_batch(positions, k)
+
+        ids, scores = self.neighbors.neighbors_batch(positions, max(k, settings.NEIGHBORS_K))
+        codes = np.asarray(self.model.media_types)
+        same = (ids >= 0) & (codes[np.maximum(ids, 0)] == codes[positions][:, None])
+        # Kept neighbors move to the front, still best first
+        order = np.argsort(~same, axis=1, kind="stable")[:, :k]
+        same = np.take_along_axis(same, order, axis=1)
+        ids = np.where(same, np.take_along_axis(ids, order, axis=1), -1)
+        scores = np.where(same, np.take_along_axis(scores, order, axis=1), 0)
+        return ids, scores
+
+    def _local_movie(self, index: int, score: float = None) -> MovieSchema:
+        return MovieSchema(
+            id=int(self.model.movie_ids[index]),
+            title=self.title_index.titles[index],
+            rating=0.0,
+            media_type=str(self.media_types[index]),
+            score=score
+        )
+
+    def recommend_batch(self, movie_titles=(), movie_ids=(), k: int = 10, blend: bool = True):
+        """Recommendations for many seeds from the local model in one pass.
+
+        Seeds are resolved up front, their neighbor rows are gathered with a
+        single fancy-index, and the optional blended list sums each candidate's
+        similarity across all seeds. Results are local catalog entries only
+        (no TMDB enrichment), scored by cosine similarity.
+        """
+        seeds = [str(t) for t in movie_titles] + [str(i) for i in movie_ids]
+        positions = np.full(len(seeds), -1, dtype=np.int64)
+
+        if self.model is not None:
+            for n, title in enumerate(movie_titles):
+                position = self.resolve_title(title)
+                if position is not None:
+                    positions[n] = position
+            positions[len(movie_titles):] = self.resolve_ids(list(movie_ids))
+
+        results = [SeedRecommendations(seed=seed) for seed in seeds]
+        resolved = np.flatnonzero(positions >= 0)
+        if self.neighbors is None or len(resolved) == 0:
+            return results, []
+
+        seed_positions = positions[resolved]
+        ids, scores = self.neighbors_of(seed_positions, k)
+
+        for row, n in enumerate(resolved):
+            results[n].source_movie = self._local_movie(int(seed_positions[row]))
+            valid = ids[row] >= 0
+            results[n].recommendations = [
+                self._local_movie(int(i), float(sc)) for i, sc in zip(ids[row][valid], scores[row][valid])
+            ]
+            if self.explain_index is not None:
+                reasons = self.explain_index.explain(int(seed_positions[row]), ids[row][valid])
+                for rec, reasoning in zip(results[n].recommendations, reasons):
+                    rec.reasoning = reasoning
+
+        blended = []
+        if blend:
+            flat_ids, flat_scores = ids.ravel(), scores.ravel()
+            keep = (flat_ids >= 0) & ~np.isin(flat_ids, seed_positions)
+            candidates, inverse = np.unique(flat_ids[keep], return_inverse=True)
+            totals = np.bincount(inverse, weights=flat_scores[keep])
+            best, best_scores = top_k(totals, k)
+            blended = [self._local_movie(int(candidates[b]), float(sc)) for b, sc in zip(best, best_scores)]
+
+        return results, blended
+
+    def _rank(self, candidates, content, tmdb_rank, k: int):
+        """Top k of a merged candidate list (hybrid_rank), deduplicated by (media_type, id), with .score set"""
+        keys = np.array([m.id * len(MEDIA_TYPES) + MEDIA_TYPES.index(m.media_type or "movie") for m in candidates],
+                        dtype=np.int64)
+        rows, scores = hybrid_rank(keys, content, tmdb_rank, *movie_features(candidates), k)
+        ranked = []
+        for row, score in zip(rows, scores):
+            candidate = candidates[row]
+            candidate.score = float(score)
+            ranked.append(candidate)
+        return ranked
+
+    def _start(self, coroutines):
+        """Schedule coroutines as tasks that are kept alive even if nobody awaits them to the end"""
+        tasks = [asyncio.ensure_future(c) for c in coroutines]
+        for task in tasks:
+            self._background.add(task)
+            task.add_done_callback(self._background.discard)
+        return tasks
+
+    @staticmethod
+    async def _results_by(tasks, deadline: float, floor: float = 0.0):
+        """Results of the tasks that finish by ``deadline`` (time.monotonic), None for the rest.
+
+        Late tasks are not cancelled: they finish in the background and fill
+        the TMDB cache and metadata store for the next request.
+        """
+        if tasks:
+            await asyncio.wait(tasks, timeout=max(deadline - time.monotonic(), floor))
+        return [t.result() if t.done() and t.exception() is None else None for t in tasks]
+
+    async def _hybrid_recommend(self, movie_index: int, media_type: str, k: int):
+        """Local neighbors merged with TMDB's recommendations and similar lists, best k first.
+
+        The local candidates are ranked on the details already in the
+        metadata store (none are fetched for them), so a cold request makes
+        at most 3 + k TMDB calls: the source, the two lists, then details
+        for what made the cut. They share one deadline, HYBRID_BUDGET_MS
+        from now. Lists that are late are left out, so a slow TMDB degrades
+        to a local-only ranking, and late details leave the plain entry.
+        TMDB candidates that are also in the catalog are scored by their tag
+        cosine to the seed like local ones. Calls that would wait past the
+        deadline for a rate-limit token are not made at all.
+
+        Returns (ranked, source_movie, complete); ``complete`` is False when
+        any TMDB part missed the deadline.
+        """
+        deadline = time.monotonic() + settings.HYBRID_BUDGET_MS / 1000
+        # Runs in its own task (see _shared), so this only applies to this request's TMDB calls
+        request_deadline.set(deadline)
+        source_movie_id = int(self.model.movie_ids[movie_index])
+        source_task, *list_tasks = self._start([
+            tmdb_service.get_movie_details(source_movie_id, media_type),
+            tmdb_service.get_recommendations(source_movie_id, media_type),
+            tmdb_service.get_similar_movies(source_movie_id, media_type),
+        ])
+
+        ids, scores = self.neighbors_of([movie_index], max(k, settings.HYBRID_LOCAL_CANDIDATES))
+        valid = ids[0] >= 0
+        neighbor_indices, neighbor_scores = ids[0][valid], scores[0][valid]
+        rec_ids = [int(self.model.movie_ids[i]) for i in neighbor_indices]
+        stored = await asyncio.to_thread(tmdb_service.store.get_many, [(m_id, media_type) for m_id in rec_ids])
+        local = [
+            stored[m_id, media_type].movie if (m_id, media_type) in stored
+            else MovieSchema(id=m_id, title=self.title_index.titles[i], rating=0.0, media_type=media_type)
+            for m_id, i in zip(rec_ids, neighbor_indices)
+        ]
+
+        listed = [l or [] for l in await self._results_by(list_tasks, deadline)]
+        if not all(t.done() for t in list_tasks):
+            print(f"TMDB lists for {source_movie_id} missed the {settings.HYBRID_BUDGET_MS:.0f} ms budget; ranking local neighbors only")
+        listed = [[m for m in l if m.id != source_movie_id] for l in listed]
+
+        candidates, content, tmdb_rank = merge_sources(local, neighbor_scores, listed)
+        tmdb_positions = self.resolve_ids([m.id for m in candidates[len(local):]], media_type)
+        in_catalog = np.flatnonzero(tmdb_positions >= 0)
+        if len(in_catalog):
+            seed = self.tag_vectors[movie_index]
+            content[len(local) + in_catalog] = (self.tag_vectors[tmdb_positions[in_catalog]] @ seed.T).toarray().ravel()
+        ranked = self._rank(candidates, content, tmdb_rank, k)
+
+        # Details for what made the cut (TMDB list entries carry no credits/keywords),
+        # within the budget but at least 50 ms, enough for cached and stored records
+        tasks = self._start(tmdb_service.get_movie_details(m.id, media_type) for m in ranked)
+        results = await self._results_by([source_task] + tasks, deadline, floor=0.05)
+        complete = all(t.done() for t in list_tasks + tasks) and source_task.done()
+        source_movie = results[0]
+        for n, detail in enumerate(results[1:]):
+            if detail:
+                detail.score = ranked[n].score
+                ranked[n] = detail
+
+        if not source_movie:
+            record = await asyncio.to_thread(tmdb_service.store.get, source_movie_id, media_type)
+            source_movie = record.movie if record is not None else MovieSchema(
+                id=source_movie_id,
+                title=self.title_index.titles[movie_index],
+                rating=0.0,
+                media_type=media_type
+            )
+        # Catalog entries whose details were late have no poster
+        for movie in ranked + [source_movie]:
+            movie.poster = movie.poster or "https://via.placeholder.com/500x750?text=No+Poster"
+        return ranked, source_movie, complete
+
+    def cached_result(self, key):
+        """Cached (recommendations, source_movie) for a resolved (media_type, id, k), or None.
+
+        The lists are shared between requests, so callers must not mutate them.
+        """
+        value, _ = self.results.get(key)
+        return value
+
+    def cache_result(self, key, recommendations, source_movie, complete: bool = True):
+        if recommendations:
+            ttl = settings.RECOMMEND_CACHE_TTL if complete else settings.RECOMMEND_CACHE_PARTIAL_TTL
+            self.results.set(key, (recommendations, source_movie), ttl)
+
+    async def _shared(self, key, compute):
+        """Cached result for a resolved (media_type, id, k), or one compute() shared by concurrent callers.
+
+        ``compute`` returns (recommendations, source_movie, complete); the
+        reasoning is added and the result cached once, by the first caller's task.
+        """
+        cached = self.cached_result(key)
+        if cached:
+            return cached
+        return await self.flights.do(key, lambda: self._compute_and_cache(key, compute))
+
+    async def _compute_and_cache(self, key, compute):
+        recommendations, source_movie, complete = await compute()
+        if source_movie and recommendations:
+            for rec, reasoning in zip(recommendations, self.explain(source_movie, recommendations)):
+                rec.reasoning = reasoning
+        self.cache_result(key, recommendations, source_movie, complete)
+        return recommendations, source_movie
+
+    async def _local_recommend(self, movie_index: int, media_type: str, k: int):
+        try:
+            return await self._hybrid_recommend(movie_index, media_type, k)
+        except Exception as e:
+            print(f"Local recommendation error: {e}")
+            return [], None, True
+
+    async def _tmdb_recommend(self, movie_id: int, media_type: str, k: int):
+        """TMDB's recommendations and similar lists for a title outside the catalog, ranked and enriched"""
+        recommendations = []
+        source_movie = await tmdb_service.get_movie_details(movie_id, media_type)
+        complete = True
+
+        if source_movie:
+            # Both TMDB lists, merged and ranked without a content signal
+            tmdb_lists = await asyncio.gather(
+                tmdb_service.get_recommendations(source_movie.id, media_type),
+                tmdb_service.get_similar_movies(source_movie.id, media_type),
+            )
+            recs_light = self._rank(*merge_sources([], [], tmdb_lists), k)
+            if not recs_light:
+                print(f"No recommendations found for {media_type} {movie_id} from TMDB.")
+
+            # Enrich recommendations concurrently
+            details = await tmdb_service.get_many_details([(rec.id, rec.media_type) for rec in recs_light])
+            complete = all(details)
+            for rec, detail in zip(recs_light, details):
+                if detail:
+                    detail.score = rec.score
+                recommendations.append(detail or rec)
+        return recommendations, source_movie, complete
+
+    async def recommend(self, movie_title: str, movie_id: int = None, media_type: str = "movie", k: int = 10):
+        """(recommendations, source_movie) for a title.
+
+        Once the title is resolved, results come from the result cache, and
+        concurrent requests for the same title share one computation.
+        """
+        await self.ensure_loaded()
         recommendations = []
         source_movie = None
         
-        # 1. Try Local Content-Based Filtering (Movies only)
-        if media_type == "movie":
+        # 1. Try Local Content-Based Filtering (movies and series in the catalog)
+        if media_type in MEDIA_TYPES:
             match_found = False
             movie_index = None
             local_title = None
 
-            if self.movies is not None:
+            if self.model is not None:
                 # Try ID first
                 if movie_id:
-                    matches = self.movies[self.movies['movie_id'] == movie_id]
-                    if not matches.empty:
+                    movie_index = self.title_index.position_for_id(movie_id, media_type)
+                    if movie_index is not None:
                         match_found = True
-                        movie_index = matches.index[0]
-                        local_title = matches.iloc[0]['title']
+                        local_title = self.title_index.titles[movie_index]
                         print(f"Resolved by ID {movie_id} to '{local_title}'")
             
-                # Boolean indexing failure fallback?
+                # Fall back to the title
                 if not match_found:
-                    local_title = self.find_closest_movie(movie_title)
-                    if local_title:
-                         matches = self.movies[self.movies['title'] == local_title]
-                         if not matches.empty:
-                             movie_index = matches.index[0]
-                             match_found = True
+                    movie_index = self.resolve_title(movie_title, media_type)
+                    if movie_index is not None:
+                         local_title = self.title_index.titles[movie_index]
+                         match_found = True
             
-            if match_found and movie_index is not None:
-                try:
-                    distances = self.similarity[movie_index]
-                    movies_list = sorted(list(enumerate(distances)), reverse=True, key=lambda x: x[1])[1:11]
-
-                    for i in movies_list:
-                        m_id = self.movies.iloc[i[0]].movie_id
-                        
-                        # Fetch full details for the recommended movie
-                        details = tmdb_service.get_movie_details(int(m_id))
-                        if details:
-                            recommendations.append(details)
-                        else:
-                            # Fallback if details fail
-                            poster = self.fetch_poster(m_id)
-                            recommendations.append(MovieSchema(
-                                id=int(m_id),
-                                title=self.movies.iloc[i[0]].title,
-                                poster=poster,
-                                rating=0.0
-                            ))
-                        
-                    # Also return the source movie details
-                    source_movie_id = self.movies.iloc[movie_index].movie_id
-                    source_movie = tmdb_service.get_movie_details(int(source_movie_id))
-                    
-                    if not source_movie:
-                        # Fallback
-                        poster = self.fetch_poster(source_movie_id)
-                        source_movie = MovieSchema(
-                            id=int(source_movie_id), 
-                            title=local_title, 
-                            poster=poster, 
-                            rating=0.0
-                        )
-                except Exception as e:
-                    print(f"Local recommendation error: {e}")
+            if match_found and movie_index is not None and self.neighbors is not None:
+                recommendations, source_movie = await self._shared(
+                    (media_type, int(self.model.movie_ids[movie_index]), k),
+                    lambda: self._local_recommend(movie_index, media_type, k),
+                )
         
         # 2. Fallback to TMDB Logic if not found locally or error occurred
         if not recommendations:
@@ -207,7 +601,7 @@ class RecommenderService:
             
             # If no ID provided, try to search
             if not movie_id:
-                search_results = tmdb_service.search_movie(movie_title)
+                search_results = await tmdb_service.search_movie(movie_title)
                 if search_results:
                      # Use the top match
                      source_movie_light = search_results[0]
@@ -215,27 +609,10 @@ class RecommenderService:
                      media_type = source_movie_light.media_type
             
             if movie_id:
-                 source_movie = tmdb_service.get_movie_details(movie_id, media_type)
-                 
-                 if source_movie:
-                     recs_light = tmdb_service.get_recommendations(source_movie.id, media_type) 
-                     
-                     if not recs_light:
-                         print(f"No recommendations found for '{movie_title}' from TMDB. Trying similar movies...")
-                         recs_light = tmdb_service.get_similar_movies(source_movie.id, media_type)
-                     
-                     # Enrich recommendations
-                     for rec in recs_light[:10]:
-                         details = tmdb_service.get_movie_details(rec.id, rec.media_type) # Recs have media_type?
-                         if details:
-                             recommendations.append(details)
-                         else:
-                             recommendations.append(rec)
-        
-        # 3. Compute Reasoning
-        if source_movie and recommendations:
-            for rec in recommendations:
-                rec.reasoning = self.generate_reasoning(source_movie, rec)
+                recommendations, source_movie = await self._shared(
+                    (media_type, int(movie_id), k),
+                    lambda: self._tmdb_recommend(movie_id, media_type, k),
+                )
                 
         return recommendations, source_movie
 
@@ -0,0 +1,129 @@
+import asyncio
+import random
+import time
+from typing import Optional
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an upstream whose circuit breaker is open"""
+
+
+class RateLimitedError(Exception):
+    """Raised instead of waiting for a rate-limiter token past the caller's deadline"""
+
+
+class TokenBucket:
+    """Async token-bucket rate limiter: ``rate`` requests per second, bursts of up to ``burst``.
+
+    A rate of 0 disables it. ``acquire(timeout)`` gives up (returns False)
+    instead of waiting longer than ``timeout`` seconds for a token.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self.tokens = float(self.burst)
+        self.updated = time.monotonic()
+        self.waits = 0
+        self.rejected = 0
+
+    async def acquire(self, timeout: Optional[float] = None) -> bool:
+        if self.rate <= 0:
+            return True
+        give_up_at = None if timeout is None else time.monotonic() + timeout
+        waited = False
+        while True:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                self.waits += waited
+                return True
+            wait = (1 - self.tokens) / self.rate
+            if give_up_at is not None and now + wait > give_up_at:
+                self.rejected += 1
+                return False
+            waited = True
+            await asyncio.sleep(wait)
+
+    def stats(self) -> dict:
+        return {"rate": self.rate, "burst": self.burst, "tokens": round(self.tokens, 2),
+                "waits": self.waits, "rejected": self.rejected}
+
+
+class CircuitBreaker:
+    """Fails fast while an upstream is down.
+
+    *Closed*: calls go through; ``threshold`` consecutive failures open it.
+    *Open*: ``allow()`` is False for ``cooldown`` seconds. After that one
+    trial call is let through per cooldown (*half-open*): a success closes
+    the breaker, a failure keeps it open. A threshold of 0 disables it.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, threshold: int = 5, cooldown: float = 30):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.trial_at: Optional[float] = None
+        self.opened = 0
+        self.rejected = 0
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return self.CLOSED
+        return self.HALF_OPEN if self.trial_at is not None else self.OPEN
+
+    def allow(self) -> bool:
+        if self.opened_at is None:
+            return True
+        now = time.monotonic()
+        if now - (self.trial_at or self.opened_at) >= self.cooldown:
+            # Let one trial call through; the next one waits for another cooldown
+            self.trial_at = now
+            return True
+        self.rejected += 1
+        return False
+
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+        self.trial_at = None
+
+    def record_failure(self):
+        self.failures += 1
+        if self.threshold <= 0:
+            return
+        if self.opened_at is not None:
+            # A failed trial: stay open for another cooldown
+            self.opened_at = time.monotonic()
+            self.trial_at = None
+        elif self.failures >= self.threshold:
+            self.opened_at = time.monotonic()
+            self.opened += 1
+
+    def stats(self) -> dict:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.failures,
+            "opened": self.opened,
+            "rejected": self.rejected,
+        }
+
+
+def backoff(attempt: int, base: float, cap: float, retry_after: Optional[str] = None) -> float:
+    """Seconds to wait before retry ``attempt`` (0-based): full jitter on base * 2**attempt, up to cap.
+
+    A numeric Retry-After header wins (still capped).
+    """
+    if retry_after:
+        try:
+            return min(float(retry_after), cap)
+        except ValueError:
+            pass
+    return random.uniform(0, min(cap, base * 2 ** attempt))
@@ -0,0 +1,114 @@
+
+import bisect
+import re
+import numpy as np
+from collections import Counter, defaultdict
+from typing import List, Sequence, Tuple
+from backend.app.services.neighbor_index import top_k
+
+_TOKEN = re.compile(r"\w+")
+TITLE_BOOST = 3.0
+MAX_EXPANSIONS = 64
+MAX_CANDIDATES = 8192
+STEM_MIN_LENGTH = 6
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN.findall(text.casefold())
+
+
+class SearchIndex:
+    """Token-level inverted index over titles and tags.
+
+    Every token maps to a posting list of (row position, weight), stored as
+    CSR arrays in impact order (highest weight first). The weight is the
+    token's idf, scaled by TITLE_BOOST when it occurs in the title plus a
+    saturating term frequency for the tags. A query token matches its exact
+    token, or every token it is a prefix of when it is the last one
+    (typeahead). Tokens of STEM_MIN_LENGTH characters or more also match as
+    a prefix one character shorter, which lets plain words ("adventure",
+    "fantasy") reach the stemmed tags ("adventur", "fantasi").
+
+    All query tokens must match; rows are ranked by the summed weight, ties
+    by catalog order. Each query token contributes at most MAX_CANDIDATES of
+    its highest-impact postings (split across its expansions by size), so latency
+    does not grow with the catalog; past that many hits, the total and the
+    deepest pages are approximate.
+    """
+
+    def __init__(self, titles: Sequence[str], tags: Sequence[str]):
+        postings = defaultdict(list)
+        for position, (title, tag) in enumerate(zip(titles, tags)):
+            title_tokens = set(tokenize(title))
+            tag_counts = Counter(tokenize(tag))
+            for token in title_tokens | tag_counts.keys():
+                tf = tag_counts.get(token, 0)
+                postings[token].append((position, TITLE_BOOST * (token in title_tokens) + tf / (tf + 1.2)))
+
+        self.size = len(titles)
+        self.vocab: List[str] = sorted(postings)
+        self.offsets = np.zeros(len(self.vocab) + 1, dtype=np.int64)
+        self.offsets[1:] = np.cumsum([len(postings[t]) for t in self.vocab])
+        self.positions = np.empty(self.offsets[-1], dtype=np.int32)
+        self.weights = np.empty(self.offsets[-1], dtype=np.float32)
+        for n, token in enumerate(self.vocab):
+            start, end = self.offsets[n], self.offsets[n + 1]
+            rows = np.array(postings[token])
+            order = np.lexsort((rows[:, 0], -rows[:, 1]))
+            self.positions[start:end] = rows[order, 0]
+            self.weights[start:end] = rows[order, 1] * np.log1p(self.size / (end - start))
+
+    def __len__(self):
+        return self.size
+
+    def _terms(self, token: str, prefix: bool) -> range:
+        """Vocabulary slots a query token expands to"""
+        lo = bisect.bisect_left(self.vocab, token)
+        if not prefix:
+            return range(lo, lo + 1) if lo < len(self.vocab) and self.vocab[lo] == token else range(0)
+        hi = bisect.bisect_left(self.vocab, token + "\U0010ffff")
+        return range(lo, hi)
+
+    def _postings(self, token: str, prefix: bool) -> Tuple[np.ndarray, np.ndarray]:
+        """Candidate positions (sorted, unique) and their best weight for one query token"""
+        if len(token) >= STEM_MIN_LENGTH:
+            token, prefix = token[:-1], True
+        terms = np.array(self._terms(token, prefix), dtype=np.int64)
+        sizes = self.offsets[terms + 1] - self.offsets[terms]
+        if len(terms) > MAX_EXPANSIONS:
+            # Short prefixes expand to many terms; keep the most frequent ones
+            keep = top_k(sizes, MAX_EXPANSIONS)[0]
+            terms, sizes = terms[keep], sizes[keep]
+
+        # Split the candidate budget across expansions in proportion to their size
+        take = np.ceil(sizes * min(1.0, MAX_CANDIDATES / max(sizes.sum(), 1))).astype(np.int64)
+        slices = [slice(self.offsets[t], self.offsets[t] + n) for t, n in zip(terms, take)]
+        positions = np.concatenate([self.positions[sl] for sl in slices] or [np.empty(0, dtype=np.int32)])
+        weights = np.concatenate([self.weights[sl] for sl in slices] or [np.empty(0, dtype=np.float32)])
+        # Best weight per position: sort by (position, -weight), keep the first of each run
+        order = np.lexsort((-weights, positions))
+        positions, weights = positions[order], weights[order]
+        first = np.ones(len(positions), dtype=bool)
+        first[1:] = positions[1:] != positions[:-1]
+        return positions[first], weights[first]
+
+    def search(self, query: str, offset: int = 0, limit: int = 20) -> Tuple[np.ndarray, int]:
+        """Row positions for one page of ranked results, and the total hit count"""
+        tokens = list(dict.fromkeys(tokenize(query)))
+        if not tokens:
+            return np.empty(0, dtype=np.int64), 0
+
+        lists = [self._postings(t, prefix=(i == len(tokens) - 1)) for i, t in enumerate(tokens)]
+        # Intersect starting from the shortest posting list
+        lists.sort(key=lambda pw: len(pw[0]))
+        positions, scores = lists[0][0], lists[0][1].astype(np.float64)
+        for other_positions, other_weights in lists[1:]:
+            if not len(positions):
+                break
+            positions, mine, theirs = np.intersect1d(positions, other_positions, assume_unique=True, return_indices=True)
+            scores = scores[mine] + other_weights[theirs]
+
+        total = len(positions)
+        if offset >= total or limit <= 0:
+            return np.empty(0, dtype=np.int64), total
+        best, _ = top_k(scores, min(offset + limit, total))
+        return positions[best[offset:]].astype(np.int64), total
@@ -0,0 +1,84 @@
+
+import numpy as np
+from typing import List, NamedTuple, Optional, Sequence
+from backend.app.services.neighbor_index import top_k
+from backend.app.services.title_index import normalize_title
+
+KEY_BYTES = 24
+FULL_TITLE_BONUS = 1.0
+
+class Suggestion(NamedTuple):
+    title: str
+    weight: float
+    id: Optional[int] = None
+    media_type: Optional[str] = None
+    kind: str = "title"
+
+
+class SuggestIndex:
+    """Prefix lookups over titles for typeahead, as a sorted array of keys.
+
+    Every title contributes one key per word start ("the dark knight",
+    "dark knight", "knight"), normalized and truncated to KEY_BYTES of
+    UTF-8, so a prefix is a ``searchsorted`` range. Within the range,
+    suggestions are ranked by their popularity weight, plus
+    FULL_TITLE_BONUS when the prefix matches the start of the title. When
+    a title is listed more than once, the entry with the highest weight is
+    kept.
+    """
+
+    def __init__(self, entries: Sequence[Suggestion]):
+        best = {}
+        for entry in entries:
+            current = best.get(entry.title)
+            if current is None or entry.weight > current.weight:
+                best[entry.title] = entry
+        self.entries: List[Suggestion] = list(best.values())
+
+        keys, owners, starts, weights = [], [], [], []
+        for n, entry in enumerate(self.entries):
+            normalized = normalize_title(entry.title)
+            for start in range(len(normalized)):
+                if start == 0 or normalized[start - 1] == " ":
+                    keys.append(normalized[start:].encode("utf-8")[:KEY_BYTES])
+                    owners.append(n)
+                    starts.append(start)
+                    weights.append(entry.weight + FULL_TITLE_BONUS * (start == 0))
+
+        order = np.argsort(np.array(keys, dtype=f"S{KEY_BYTES}"), kind="stable")
+        self.keys = np.array(keys, dtype=f"S{KEY_BYTES}")[order]
+        self.owners = np.array(owners, dtype=np.int32)[order]
+        self.starts = np.array(starts, dtype=np.int32)[order]
+        self.weights = np.array(weights, dtype=np.float32)[order]
+
+    def __len__(self):
+        return len(self.entries)
+
+    def suggest(self, prefix: str, limit: int = 10) -> List[Suggestion]:
+        """Up to ``limit`` entries with a word starting with ``prefix``, best first"""
+        normalized = normalize_title(prefix)
+        if not normalized or limit <= 0:
+            return []
+        key = normalized.encode("utf-8")[:KEY_BYTES]
+        lo = int(np.searchsorted(self.keys, key, side="left"))
+        hi = int(np.searchsorted(self.keys, key + b"\xff", side="left"))
+        if lo == hi:
+            return []
+
+        # Oversample: a title can own several keys in the range
+        best, _ = top_k(self.weights[lo:hi], limit * 4)
+        results, seen = [], set()
+        for slot in best + lo:
+            owner = int(self.owners[slot])
+            if owner in seen:
+                continue
+            if len(normalized.encode("utf-8")) > KEY_BYTES:
+                # The key was truncated; check the whole prefix
+                title = normalize_title(self.entries[owner].title)
+                if not title[self.starts[slot]:].startswith(normalized):
+                    continue
+            seen.add(owner)
+            results.append(self.entries[owner])
+            if len(results) == limit:
+                break
+        return results
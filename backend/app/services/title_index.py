@@ -0,0 +1,77 @@
+
+import re
+import unicodedata
+import numpy as np
+from typing import Dict, List, Optional, Sequence, Tuple
+
+_WHITESPACE = re.compile(r"\s+")
+
+def normalize_title(title: str) -> str:
+    """Casefolded, NFKC-normalized title with whitespace collapsed"""
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFKC", title).casefold()).strip()
+
+
+class TitleIndex:
+    """Title and id lookups over the catalog, built once at load time.
+
+    - ``exact``: title -> row position
+    - ``normalized``: normalize_title(title) -> row position
+    - ``typed``: (media_type, normalize_title(title)) -> row position
+    - ``id_positions``: media_type -> dense array indexed by TMDB id -> row position (-1 if absent)
+
+    TMDB ids are only unique per media type (movie 1399 and series 1399 are
+    different titles), so id lookups take the media type. When a title or
+    id occurs more than once, the first row wins.
+    """
+
+    def __init__(self, titles: Sequence[str], movie_ids: np.ndarray, media_types: Sequence[str] = None):
+        self.titles: List[str] = list(titles)
+        movie_ids = np.asarray(movie_ids, dtype=np.int64)
+        media_types = np.asarray(media_types if media_types is not None else ["movie"] * len(movie_ids))
+
+        self.exact: Dict[str, int] = {}
+        self.normalized: Dict[str, int] = {}
+        self.typed: Dict[Tuple[str, str], int] = {}
+        for position, (title, media_type) in enumerate(zip(self.titles, media_types.tolist())):
+            normalized = normalize_title(title)
+            self.exact.setdefault(title, position)
+            self.normalized.setdefault(normalized, position)
+            self.typed.setdefault((media_type, normalized), position)
+
+        self.id_positions: Dict[str, np.ndarray] = {}
+        for media_type in np.unique(media_types).tolist():
+            rows = np.flatnonzero(media_types == media_type)
+            ids = movie_ids[rows]
+            # TMDB ids are dense enough (max ~1.5M) that a direct array is a few MB
+            positions = np.full(int(ids.max()) + 1 if len(ids) else 0, -1, dtype=np.int32)
+            # Assign in reverse so the first row with a given id wins
+            positions[ids[::-1]] = rows[::-1]
+            self.id_positions[media_type] = positions
+
+    def __len__(self):
+        return len(self.titles)
+
+    def position_for_title(self, title: str, media_type: str = None) -> Optional[int]:
+        """Exact match first, then a case/whitespace-insensitive match (of ``media_type`` only, if given)"""
+        if media_type is not None:
+            return self.typed.get((media_type, normalize_title(title)))
+        position = self.exact.get(title)
+        if position is None:
+            position = self.normalized.get(normalize_title(title))
+        return position
+
+    def position_for_id(self, movie_id: int, media_type: str = "movie") -> Optional[int]:
+        id_positions = self.id_positions.get(media_type, ())
+        if movie_id is None or not 0 <= movie_id < len(id_positions):
+            return None
+        position = int(id_positions[movie_id])
+        return position if position >= 0 else None
+
+    def positions_for_ids(self, movie_ids, media_type: str = "movie") -> np.ndarray:
+        """Row positions for many ids at once (-1 where unknown)"""
+        id_positions = self.id_positions.get(media_type, np.zeros(0, dtype=np.int32))
+        movie_ids = np.asarray(movie_ids, dtype=np.int64)
+        in_range = (movie_ids >= 0) & (movie_ids < len(id_positions))
+        positions = np.full(len(movie_ids), -1, dtype=np.int64)
+        positions[in_range] = id_positions[movie_ids[in_range]]
+        return positions
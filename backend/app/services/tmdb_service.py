@@ -1,22 +1,156 @@
 
-import requests
+import asyncio
+import httpx
+import time
+from contextvars import ContextVar
 from typing import List, Optional, Tuple
 from backend.app.core.config import settings
 from backend.app.schemas.schemas import MovieSchema
+from backend.app.services.cache import SingleFlight, TTLCache
+from backend.app.services.metadata_store import MetadataStore, metadata_store
+from backend.app.services.resilience import CircuitBreaker, CircuitOpenError, RateLimitedError, TokenBucket, backoff
+
+# time.monotonic() by which the current request needs TMDB's answers, for requests with
+# a latency budget. Tasks started by the request inherit it
+request_deadline: ContextVar[Optional[float]] = ContextVar("tmdb_request_deadline", default=None)
+
+def _copy(value):
+    """Callers mutate results (e.g. set reasoning), so never hand out the cached objects"""
+    if isinstance(value, list):
+        return [v.model_copy() for v in value]
+    return value.model_copy() if value is not None else None
 
 class TMDBService:
-    BASE_URL = "https://api.themoviedb.org/3"
     IMAGE_BASE_URL = "https://image.tmdb.org/t/p/w500"
 
-    def fetch_from_tmdb(self, endpoint: str, media_type_override: str = None) -> List[MovieSchema]:
+    def __init__(self, cache: TTLCache = None, store: MetadataStore = None):
+        self._client = None
+        self._semaphore = None
+        self._loop = None
+        self.cache = cache if cache is not None else TTLCache(settings.TMDB_CACHE_SIZE)
+        self.store = store if store is not None else metadata_store
+        self._refreshing = {}
+        # Identical calls that miss the cache at the same moment share one upstream fetch
+        self.flights = SingleFlight()
+        self.limiter = TokenBucket(settings.TMDB_RATE_LIMIT, settings.TMDB_RATE_BURST)
+        self.breaker = CircuitBreaker(settings.TMDB_BREAKER_THRESHOLD, settings.TMDB_BREAKER_COOLDOWN)
+        self.retries = 0
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Pooled keep-alive client, created lazily on the running event loop"""
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client.is_closed or self._loop is not loop:
+            self._client = httpx.AsyncClient(
+                base_url=settings.TMDB_BASE_URL,
+                timeout=httpx.Timeout(settings.TMDB_TIMEOUT),
+                limits=httpx.Limits(
+                    max_connections=settings.TMDB_MAX_CONNECTIONS,
+                    max_keepalive_connections=settings.TMDB_MAX_CONNECTIONS,
+                ),
+            )
+            # Bounds in-flight requests so one big fan-out cannot exhaust the pool
+            self._semaphore = asyncio.Semaphore(settings.TMDB_MAX_CONCURRENCY)
+            self._loop = loop
+        return self._client
+
+    async def close(self):
+        for task in list(self._refreshing.values()):
+            task.cancel()
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+        self._client = None
+
+    async def _get_json(self, path: str, **params) -> dict:
+        """GET a TMDB path, rate limited, with retries on 429/5xx/network errors.
+
+        Raises CircuitOpenError at once while the breaker is open, so callers
+        fall back to their cached or stored data without waiting on TMDB.
+        Within a request_deadline, RateLimitedError is raised instead of
+        waiting for a rate-limit token past it, and retries that would end
+        past it are skipped.
+        """
+        if not self.breaker.allow():
+            raise CircuitOpenError(f"TMDB circuit open, skipping {path}")
+        client = self._get_client()
+        params = {"api_key": settings.API_KEY, "language": "en-US", **params}
+        deadline = request_deadline.get()
+        for attempt in range(settings.TMDB_RETRIES + 1):
+            retry_after = None
+            try:
+                if not await self.limiter.acquire(None if deadline is None else deadline - time.monotonic()):
+                    raise RateLimitedError(f"TMDB rate limit reached, no token before the deadline for {path}")
+                async with self._semaphore:
+                    response = await client.get(path, params=params)
+                if response.status_code != 429 and response.status_code < 500:
+                    # TMDB answered (a 404 is not an outage)
+                    self.breaker.record_success()
+                    response.raise_for_status()
+                    return response.json()
+                retry_after = response.headers.get("Retry-After")
+                error = httpx.HTTPStatusError(f"TMDB returned {response.status_code} for {path}",
+                                              request=response.request, response=response)
+            except httpx.TransportError as e:
+                error = e
+            if attempt < settings.TMDB_RETRIES:
+                delay = backoff(attempt, settings.TMDB_RETRY_BACKOFF, settings.TMDB_RETRY_MAX_BACKOFF, retry_after)
+                if deadline is not None and time.monotonic() + delay > deadline:
+                    break
+                self.retries += 1
+                await asyncio.sleep(delay)
+        self.breaker.record_failure()
+        raise error
+
+    def stats(self) -> dict:
+        return {"breaker": self.breaker.stats(), "rate_limiter": self.limiter.stats(), "retries": self.retries}
+
+    async def _cached(self, key, ttl: float, fetch):
+        """Serve from the cache; stale entries are returned at once and refreshed in the background.
+
+        Concurrent misses for the same key wait on a single fetch.
+        """
+        value, state = self.cache.get(key)
+        if state == TTLCache.FRESH:
+            return _copy(value)
+        if state == TTLCache.STALE:
+            if key not in self._refreshing:
+                self._refreshing[key] = asyncio.create_task(self._refresh(key, ttl, fetch))
+            return _copy(value)
+
+        return _copy(await self.flights.do(key, lambda: self._fetch_and_cache(key, ttl, fetch)))
+
+    async def _fetch_and_cache(self, key, ttl: float, fetch):
+        # Shared by every caller and may outlive the first one: its task copied
+        # that caller's context, so drop the deadline it would otherwise keep
+        request_deadline.set(None)
+        value = await fetch()
+        # Errors come back as []/None; don't pin them in the cache
+        if value:
+            self.cache.set(key, value, ttl, settings.TMDB_STALE_TTL)
+        return value
+
+    async def _refresh(self, key, ttl: float, fetch):
+        # A background refresh answers no request, so it has no deadline
+        request_deadline.set(None)
+        try:
+            value = await fetch()
+            if value:
+                self.cache.set(key, value, ttl, settings.TMDB_STALE_TTL)
+        finally:
+            self._refreshing.pop(key, None)
+
+    async def fetch_from_tmdb(self, endpoint: str, media_type_override: str = None, ttl: float = None) -> List[MovieSchema]:
+        return await self._cached(
+            ("list", endpoint, media_type_override),
+            ttl or settings.TMDB_TTL_LISTS,
+            lambda: self._fetch_list(endpoint, media_type_override),
+        )
+
+    async def _fetch_list(self, endpoint: str, media_type_override: str = None) -> List[MovieSchema]:
         if not settings.API_KEY:
             return []
             
-        url = f"{self.BASE_URL}{endpoint}?api_key={settings.API_KEY}&language=en-US"
         try:
-            response = requests.get(url)
-            response.raise_for_status()
-            data = response.json()
+            data = await self._get_json(endpoint)
             
             results = []
             for item in data.get("results", [])[:10]: # Limit to top 10 for performance
@@ -39,6 +173,7 @@ class TMDBService:
                     overview=item.get("overview", ""),
                     rating=item.get("vote_average", 0.0),
                     release_date=release_date,
+                    vote_count=item.get("vote_count", 0),
                     media_type=media_type
                 ))
             return results
@@ -46,17 +181,21 @@ class TMDBService:
             print(f"Error fetching data from TMDB endpoint {endpoint}: {e}")
             return []
     
-    def search_movie(self, query: str) -> List[MovieSchema]:
+    async def search_movie(self, query: str) -> List[MovieSchema]:
         """Search for a movie or TV show by title"""
+        return await self._cached(
+            ("search", query.strip().lower()),
+            settings.TMDB_TTL_SEARCH,
+            lambda: self._search_movie(query),
+        )
+
+    async def _search_movie(self, query: str) -> List[MovieSchema]:
         if not settings.API_KEY:
              return []
         
         # Use multi-search to find movies and TV shows
-        url = f"{self.BASE_URL}/search/multi?api_key={settings.API_KEY}&language=en-US&query={query}&page=1"
         try:
-            response = requests.get(url)
-            response.raise_for_status()
-            data = response.json()
+            data = await self._get_json("/search/multi", query=query, page=1)
             
             results = []
             for item in data.get("results", []):
@@ -89,27 +228,50 @@ class TMDBService:
             print(f"Error searching TMDB for {query}: {e}")
             return []
 
-    def get_recommendations(self, movie_id: int, media_type: str = "movie") -> List[MovieSchema]:
+    async def get_recommendations(self, movie_id: int, media_type: str = "movie") -> List[MovieSchema]:
         """Get recommendations for a specific movie or TV show ID"""
         endpoint = "movie" if media_type == "movie" else "tv"
-        return self.fetch_from_tmdb(f"/{endpoint}/{movie_id}/recommendations", media_type_override=media_type)
+        return await self.fetch_from_tmdb(f"/{endpoint}/{movie_id}/recommendations", media_type_override=media_type, ttl=settings.TMDB_TTL_RECOMMENDATIONS)
 
-    def get_similar_movies(self, movie_id: int, media_type: str = "movie") -> List[MovieSchema]:
+    async def get_similar_movies(self, movie_id: int, media_type: str = "movie") -> List[MovieSchema]:
         """Get similar movies for a specific movie ID (fallback for recommendations)"""
         endpoint = "movie" if media_type == "movie" else "tv"
-        return self.fetch_from_tmdb(f"/{endpoint}/{movie_id}/similar", media_type_override=media_type)
+        return await self.fetch_from_tmdb(f"/{endpoint}/{movie_id}/similar", media_type_override=media_type, ttl=settings.TMDB_TTL_RECOMMENDATIONS)
 
-    def get_movie_details(self, movie_id: int, media_type: str = "movie") -> Optional[MovieSchema]:
+    async def get_movie_details(self, movie_id: int, media_type: str = "movie") -> Optional[MovieSchema]:
         """Get full details for a movie or TV show by ID"""
+        return await self._cached(
+            ("details", media_type, movie_id),
+            settings.TMDB_TTL_DETAILS,
+            lambda: self._load_details(movie_id, media_type),
+        )
+
+    async def _load_details(self, movie_id: int, media_type: str = "movie") -> Optional[MovieSchema]:
+        """Details from the persistent store, refreshed from TMDB once they are old.
+
+        If TMDB is unreachable (or no API key is set) a stored record is
+        served regardless of its age, so a warmed store works fully offline.
+        SQLite calls run in a thread: a write by another worker can hold them
+        up to the store's busy timeout, which must not stall the event loop.
+        """
+        record = await asyncio.to_thread(self.store.get, movie_id, media_type)
+        if record is not None and not record.is_stale:
+            return record.movie
+
+        details = await self.fetch_details_uncached(movie_id, media_type)
+        if details:
+            await asyncio.to_thread(self.store.put, details)
+            return details
+        return record.movie if record is not None else None
+
+    async def fetch_details_uncached(self, movie_id: int, media_type: str = "movie") -> Optional[MovieSchema]:
+        """Details straight from TMDB, bypassing the cache and the metadata store (None on failure)"""
         if not settings.API_KEY:
             return None
             
         endpoint = "movie" if media_type == "movie" else "tv"
-        url = f"{self.BASE_URL}/{endpoint}/{movie_id}?api_key={settings.API_KEY}&language=en-US&append_to_response=credits,keywords,external_ids"
         try:
-            response = requests.get(url)
-            response.raise_for_status()
-            item = response.json()
+            item = await self._get_json(f"/{endpoint}/{movie_id}", append_to_response="credits,keywords,external_ids")
             
             poster_path = item.get("poster_path")
             poster_url = f"{self.IMAGE_BASE_URL}{poster_path}" if poster_path else "https://via.placeholder.com/500x750?text=No+Poster"
@@ -163,19 +325,44 @@ class TMDBService:
             print(f"Error fetching movie details for {movie_id}: {e}")
             return None
 
-    def get_trending(self) -> List[MovieSchema]:
-        return self.fetch_from_tmdb("/trending/all/day")
+    async def get_many_details(self, items: List[Tuple[int, str]]) -> List[Optional[MovieSchema]]:
+        """Fetch details for many (id, media_type) pairs concurrently, preserving order"""
+        return await asyncio.gather(*(self.get_movie_details(movie_id, media_type) for movie_id, media_type in items))
+
+    async def get_poster(self, movie_id: int, media_type: str = "movie") -> str:
+        """Poster URL for a movie or TV show, or a placeholder image"""
+        return await self.flights.do(("poster", media_type, movie_id), lambda: self._fetch_poster(movie_id, media_type))
+
+    async def _fetch_poster(self, movie_id: int, media_type: str = "movie") -> str:
+        if not settings.API_KEY:
+            return "https://via.placeholder.com/500x750?text=No+API+Key"
+
+        try:
+            endpoint = "movie" if media_type == "movie" else "tv"
+            data = await self._get_json(f"/{endpoint}/{movie_id}")
+            poster_path = data.get('poster_path')
+
+            if poster_path:
+                return "https://image.tmdb.org/t/p/w500/" + poster_path
+            else:
+                return "https://via.placeholder.com/500x750?text=No+Poster"
+        except Exception as e:
+            print(f"Error fetching poster for movie {movie_id}: {e}")
+            return "https://via.placeholder.com/500x750?text=Error"
+
+    async def get_trending(self) -> List[MovieSchema]:
+        return await self.fetch_from_tmdb("/trending/all/day", ttl=settings.TMDB_TTL_TRENDING)
 
-    def get_now_playing(self) -> List[MovieSchema]:
-        return self.fetch_from_tmdb("/movie/now_playing")
+    async def get_now_playing(self) -> List[MovieSchema]:
+        return await self.fetch_from_tmdb("/movie/now_playing")
 
-    def get_popular_tv(self) -> List[MovieSchema]:
-        return self.fetch_from_tmdb("/tv/popular", media_type_override="tv")
+    async def get_popular_tv(self) -> List[MovieSchema]:
+        return await self.fetch_from_tmdb("/tv/popular", media_type_override="tv")
 
-    def get_top_rated(self) -> List[MovieSchema]:
-        return self.fetch_from_tmdb("/movie/top_rated")
+    async def get_top_rated(self) -> List[MovieSchema]:
+        return await self.fetch_from_tmdb("/movie/top_rated")
 
-    def get_upcoming(self) -> List[MovieSchema]:
-        return self.fetch_from_tmdb("/movie/upcoming")
+    async def get_upcoming(self) -> List[MovieSchema]:
+        return await self.fetch_from_tmdb("/movie/upcoming")
 
 tmdb_service = TMDBService()
@@ -0,0 +1,326 @@
+"""Build the memory-mapped model artifacts from movies.pkl.
+
+Replaces the dense N x N similarity.pkl: instead of keeping every pairwise
+score, only the K best neighbors of each movie are stored as int32 row
+positions and float32 cosine scores. Catalog columns (ids, titles, tags) are
+written next to them so the server never has to unpickle a DataFrame, along
+with the vocabulary and tag vectors that incremental builds
+(backend/model/pipeline.py) extend. Genre, keyword, director and cast ids
+for the recommendation explanations come from the metadata store.
+
+Usage (from the project root):
+    python -m backend.model.build_index
+    python -m backend.model.build_index --k 100 --workers 8 --memory-mb 4096
+
+    # Convert an existing dense similarity.pkl instead of recomputing it
+    python -m backend.model.build_index --similarity backend/model/similarity.pkl
+"""
+import argparse
+import multiprocessing
+import os
+import pickle
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from numpy.lib.format import open_memmap
+from sklearn.decomposition import TruncatedSVD
+from sklearn.feature_extraction.text import CountVectorizer
+from sklearn.preprocessing import normalize
+
+from backend.app.core.config import settings
+from backend.app.services.artifacts import EXPLAIN_KINDS, save_artifacts
+from backend.app.services.explain_index import encode_features
+from backend.app.services.ann_index import assign_ivf, train_ivf
+from backend.app.services.neighbor_index import NeighborIndex, top_k
+
+
+def vectorize_tags(tags, vocabulary=None):
+    """Bag-of-words tag vectors, L2-normalized so a dot product is the cosine similarity.
+
+    Returns (vectors, vocabulary). Pass a stored ``vocabulary`` to vectorize
+    new movies into an existing space; words outside it are ignored.
+    """
+    if vocabulary is None:
+        cv = CountVectorizer(max_features=5000, stop_words='english')
+    else:
+        cv = CountVectorizer(vocabulary=list(vocabulary), stop_words='english')
+    vectors = cv.fit_transform(tags).astype(np.float32)
+    return normalize(vectors, norm='l2', copy=False), cv.get_feature_names_out().tolist()
+
+
+def score_rows(vectors, vectors_t, rows: np.ndarray, k: int, groups: np.ndarray = None):
+    """Top-k cosine neighbors (ids, scores) of the given rows, excluding themselves.
+
+    With ``groups`` (e.g. the media type code of every row), neighbors come
+    from the row's own group only.
+    """
+    sims = (vectors[rows] @ vectors_t).toarray()
+    # A movie is never its own recommendation
+    sims[np.arange(len(rows)), rows] = -np.inf
+    if groups is not None:
+        sims[groups[rows][:, None] != groups[None, :]] = -np.inf
+    ids, scores = top_k(sims, k)
+    ids = ids.astype(np.int32)
+    ids[scores == -np.inf] = -1
+    return ids, np.maximum(scores, 0)
+
+
+def media_type_groups(media_types):
+    """Group number of every row by media type for score_rows, or None when there is a single type"""
+    if media_types is None:
+        return None
+    names, groups = np.unique(np.asarray(media_types), return_inverse=True)
+    return groups.astype(np.int8) if len(names) > 1 else None
+
+
+def block_size_for(n: int, memory_mb: float, workers: int = 1) -> int:
+    """Rows per block so that all workers' dense similarity blocks fit in ``memory_mb``"""
+    # Per row of a block: the sparse product (~8 bytes per score when dense), the
+    # dense float32 copy, and top_k's negated copy plus int64 partition indices
+    per_row = n * 4 * 6
+    return max(1, int(memory_mb * 1e6 / (max(workers, 1) * per_row)))
+
+
+_worker = {}
+
+def _init_worker(vectors, vectors_t, k, groups=None):
+    _worker.update(vectors=vectors, vectors_t=vectors_t, k=k, groups=groups)
+
+
+def _score_block(bounds):
+    start, end = bounds
+    ids, scores = score_rows(_worker["vectors"], _worker["vectors_t"], np.arange(start, end), _worker["k"], _worker["groups"])
+    return start, ids, scores
+
+
+def compute_neighbors(vectors, k: int, block_size: int = 1024, workers: int = 1, out_dir: str = None,
+                      groups: np.ndarray = None) -> NeighborIndex:
+    """Top-k cosine neighbors per row, computed one block of rows at a time.
+
+    Only one (block_size x N) dense block per worker is ever in memory, never
+    the N x N matrix. With ``workers`` > 1 the blocks are scored by a process
+    pool. With ``out_dir`` the table is written straight into .npy memmaps
+    there instead of being held in RAM. ``groups`` keeps neighbors within
+    each row's group (see score_rows).
+    """
+    n = vectors.shape[0]
+    k = min(k, n - 1)
+    if out_dir:
+        os.makedirs(out_dir, exist_ok=True)
+        ids = open_memmap(os.path.join(out_dir, "neighbor_ids.npy"), mode="w+", dtype=np.int32, shape=(n, k))
+        scores = open_memmap(os.path.join(out_dir, "neighbor_scores.npy"), mode="w+", dtype=np.float32, shape=(n, k))
+    else:
+        ids = np.empty((n, k), dtype=np.int32)
+        scores = np.empty((n, k), dtype=np.float32)
+    vectors_t = vectors.T.tocsc()
+    blocks = [(start, min(start + block_size, n)) for start in range(0, n, block_size)]
+
+    if workers > 1:
+        # fork shares the vectors with the workers copy-on-write instead of pickling them
+        context = multiprocessing.get_context("fork" if "fork" in multiprocessing.get_all_start_methods() else None)
+        with ProcessPoolExecutor(workers, mp_context=context, initializer=_init_worker,
+                                 initargs=(vectors, vectors_t, k, groups)) as pool:
+            for start, block_ids, block_scores in pool.map(_score_block, blocks):
+                ids[start:start + len(block_ids)], scores[start:start + len(block_ids)] = block_ids, block_scores
+    else:
+        _init_worker(vectors, vectors_t, k, groups)
+        for bounds in blocks:
+            start, block_ids, block_scores = _score_block(bounds)
+            ids[start:start + len(block_ids)], scores[start:start + len(block_ids)] = block_ids, block_scores
+        _worker.clear()
+
+    if out_dir:
+        ids.flush()
+        scores.flush()
+    return NeighborIndex(ids, scores)
+
+
+def update_neighbors(vectors, index: NeighborIndex, changed, block_size: int = 1024, groups: np.ndarray = None):
+    """Refresh a neighbor table after the rows in ``changed`` were added or re-vectorized.
+
+    ``vectors`` is the full new matrix; rows past ``len(index)`` are new.
+    Only these rows are scored against the whole catalog:
+
+    - the changed rows themselves;
+    - rows whose list holds a changed movie, since its score may have
+      dropped and the replacement lies beyond the stored K.
+
+    Every other row only merges the changed movies into its list. Cosine
+    is symmetric, so their scores are columns of the changed-rows block.
+    ``groups`` keeps neighbors within each row's group, as in compute_neighbors.
+
+    Returns (index, number of rows scored against the whole catalog).
+    """
+    n, k = vectors.shape[0], index.k
+    old_n = len(index)
+    ids = np.full((n, k), -1, dtype=np.int32)
+    scores = np.zeros((n, k), dtype=np.float32)
+    ids[:old_n], scores[:old_n] = index.ids, index.scores
+    vectors_t = vectors.T.tocsc()
+
+    changed = np.unique(np.asarray(changed, dtype=np.int64))
+    is_changed = np.zeros(n, dtype=bool)
+    is_changed[changed] = True
+    holds_changed = ((ids >= 0) & is_changed[np.maximum(ids, 0)]).any(axis=1)
+    rescore = np.flatnonzero(is_changed | holds_changed)
+
+    for start in range(0, len(rescore), block_size):
+        rows = rescore[start:start + block_size]
+        ids[rows], scores[rows] = score_rows(vectors, vectors_t, rows, k, groups)
+
+    # Everyone else: let the changed movies into their lists where they beat the k-th neighbor
+    merge = np.ones(n, dtype=bool)
+    merge[rescore] = False
+    for start in range(0, len(changed), block_size):
+        block = changed[start:start + block_size]
+        cross = (vectors[block] @ vectors_t).toarray().T  # (n, len(block))
+        if groups is not None:
+            cross[groups[:, None] != groups[None, block]] = -np.inf
+        kth = np.where(ids[:, -1] >= 0, scores[:, -1], -np.inf)
+        rows = np.flatnonzero(merge & (cross.max(axis=1) > kth))
+        if not len(rows):
+            continue
+        all_ids = np.hstack([ids[rows], np.broadcast_to(block.astype(np.int32), (len(rows), len(block)))])
+        all_scores = np.hstack([np.where(ids[rows] >= 0, scores[rows], -np.inf), cross[rows]])
+        # Same order as a full rebuild: score descending, then lower row position
+        best = np.lexsort((all_ids, -all_scores), axis=1)[:, :k]
+        best_ids = np.take_along_axis(all_ids, best, axis=1)
+        best_scores = np.take_along_axis(all_scores, best, axis=1)
+        ids[rows] = np.where(best_scores == -np.inf, -1, best_ids)
+        scores[rows] = np.maximum(best_scores, 0)
+
+    return NeighborIndex(ids, scores), len(rescore)
+
+
+def build_ann(vectors, dim: int, nlist: int = None, seed: int = 0):
+    """Dense embeddings and an IVF partition for the "ann" neighbor backend.
+
+    The tag vectors are reduced with TruncatedSVD and L2-normalized; the SVD
+    components are kept so new movies can be projected (project_ann) and
+    inserted without refitting. ``nlist`` defaults to 4 * sqrt(N) buckets.
+    """
+    dim = min(dim, vectors.shape[1] - 1, vectors.shape[0] - 1)
+    svd = TruncatedSVD(n_components=dim, random_state=seed)
+    embeddings = normalize(svd.fit_transform(vectors)).astype(np.float32)
+    nlist = nlist or max(1, int(4 * np.sqrt(len(embeddings))))
+    centroids = train_ivf(embeddings, nlist, seed=seed)
+    return {
+        "embeddings": embeddings,
+        "svd_components": svd.components_.astype(np.float32),
+        "ivf_centroids": centroids,
+        "ivf_assignments": assign_ivf(embeddings, centroids),
+    }
+
+
+def project_ann(vectors, components: np.ndarray) -> np.ndarray:
+    """Embed tag vectors with stored SVD components (as build_ann would have)"""
+    return normalize(np.asarray(vectors @ components.T)).astype(np.float32)
+
+
+def explain_features(movies, media_types=None):
+    """Explanation features (see explain_index) for the rows of movies.pkl.
+
+    A movies.pkl written by pipeline.py --write-pkl has them as list
+    columns. Otherwise they come from the TMDB details in the metadata store
+    (fill it with prefetch_metadata.py first); titles it lacks get none.
+    """
+    if all(kind in movies for kind in EXPLAIN_KINDS):
+        return {kind: encode_features(movies[kind].tolist()) for kind in EXPLAIN_KINDS}
+
+    from backend.app.services.metadata_store import metadata_store
+
+    if media_types is None:
+        media_types = ["movie"] * len(movies)
+    rows = {kind: [] for kind in EXPLAIN_KINDS}
+    found = 0
+    for movie_id, media_type in zip(movies['movie_id'].tolist(), media_types):
+        record = metadata_store.get(movie_id, media_type)
+        movie = record.movie if record else None
+        found += movie is not None
+        rows["genres"].append(movie.genres or [] if movie else [])
+        rows["keywords"].append(movie.keywords or [] if movie else [])
+        rows["director"].append([movie.director] if movie and movie.director else [])
+        rows["cast"].append(movie.cast or [] if movie else [])
+    print(f"Explanation features for {found} of {len(movies)} titles ({found / max(len(movies), 1):.0%}) "
+          f"from {metadata_store.path}")
+    if found < len(movies):
+        print(f"Warning: {len(movies) - found} titles have no stored details and will be explained from TMDB "
+              "at request time. Run python -m backend.model.prefetch_metadata, then build again")
+    if not found:
+        return None
+    return {kind: encode_features(values) for kind, values in rows.items()}
+
+
+def neighbors_from_similarity(similarity, k: int) -> NeighborIndex:
+    """Top-k neighbors per row of an existing dense similarity matrix"""
+    n = len(similarity)
+    k = min(k, n - 1)
+    ids = np.full((n, k), -1, dtype=np.int32)
+    scores = np.zeros((n, k), dtype=np.float32)
+
+    for i in range(n):
+        ids[i], scores[i] = top_k(similarity[i], k, exclude=i)
+
+    return NeighborIndex(ids, scores)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the memory-mapped model artifacts from movies.pkl")
+    parser.add_argument("--movies", default=settings.MOVIES_PKL, help="Path to movies.pkl")
+    parser.add_argument("--similarity", help="Convert this dense similarity.pkl instead of recomputing from tags")
+    parser.add_argument("--out", default=settings.ARTIFACTS_DIR, help="Artifact directory to write")
+    parser.add_argument("--k", type=int, default=settings.NEIGHBORS_K, help="Neighbors kept per movie")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Processes scoring blocks in parallel")
+    parser.add_argument("--ann-dim", type=int, default=settings.ANN_DIM, help="Embedding size for the ANN backend (0 to skip)")
+    parser.add_argument("--memory-mb", type=float, default=1024, help="Memory budget for similarity blocks (all workers)")
+    parser.add_argument("--block-size", type=int, help="Rows scored per block (default: derived from --memory-mb)")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    movies = pickle.load(open(args.movies, 'rb')).reset_index(drop=True)
+    tags = movies['tags'].fillna('')
+    # movies.pkl written by pipeline.py --write-pkl can also hold TV series
+    media_types = movies['media_type'].to_numpy() if 'media_type' in movies else None
+
+    vectors, vocabulary = vectorize_tags(tags)
+    # The neighbor table is streamed here, then copied into the artifact directory
+    scratch = f"{args.out}.neighbors-{os.getpid()}"
+    if args.similarity:
+        similarity = pickle.load(open(args.similarity, 'rb'))
+        if len(similarity) != len(movies):
+            raise SystemExit(f"{args.similarity} has {len(similarity)} rows but {args.movies} has {len(movies)} movies")
+        index = neighbors_from_similarity(similarity, args.k)
+        del similarity
+    else:
+        block_size = args.block_size or block_size_for(len(movies), args.memory_mb, args.workers)
+        index = compute_neighbors(vectors, args.k, block_size, args.workers, out_dir=scratch,
+                                  groups=media_type_groups(media_types))
+
+    ann = build_ann(vectors, args.ann_dim) if args.ann_dim else None
+
+    manifest = save_artifacts(
+        movie_ids=movies['movie_id'].to_numpy(),
+        titles=movies['title'].tolist(),
+        tags=tags.tolist(),
+        neighbor_ids=index.ids,
+        neighbor_scores=index.scores,
+        vocabulary=vocabulary,
+        tag_vectors=vectors,
+        ann=ann,
+        media_types=media_types,
+        explain=explain_features(movies, media_types),
+        path=args.out,
+    )
+
+    shutil.rmtree(scratch, ignore_errors=True)
+
+    size_mb = sum(f["bytes"] for f in manifest["files"].values()) / 1e6
+    print(f"Built top-{index.k} neighbors for {len(index)} movies "
+          f"({size_mb:.1f} MB) in {time.perf_counter() - start:.1f}s")
+    print(f"Wrote artifacts version {manifest['version']} to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,302 @@
+"""Build the model artifacts from raw TMDB metadata, in full or incrementally.
+
+Input is the TMDB 5000 export pair (``tmdb_5000_movies.csv`` and
+``tmdb_5000_credits.csv``, or any CSVs with the same columns) and/or a TV
+series CSV with the columns ``id, name, overview, genres, keywords, cast,
+created_by`` (JSON lists of ``{"name": ...}`` objects, as in TMDB's
+/tv/{id} responses). The tags column is built the way the shipped
+movies.pkl was: overview words plus genres, keywords, the top 3 cast
+members and the director (the first creator for series), names without
+spaces, lowercased and Porter-stemmed. Movies and series share one
+vocabulary and one neighbor table, but a row's neighbors are scored
+within its own media type. Rows are keyed by (media_type, id).
+
+A full build fits the vocabulary and scores every movie. ``--incremental``
+adds or updates only the movies in the given CSVs: they are vectorized with
+the stored vocabulary and the neighbor table is patched
+(build_index.update_neighbors) instead of rescoring the whole catalog.
+Words outside the stored vocabulary are ignored until the next full build.
+Embeddings for the ANN backend (``--ann-dim``) are projected with the stored
+SVD and inserted into their IVF bucket, without refitting either.
+
+Wall time and peak traced memory are printed for every stage. Tracing
+covers this process only: the block workers of a full build are separate
+processes, so their memory shows up only in the largest-worker RSS printed
+at the end (on Unix, where the resource module exists).
+
+Usage (from the project root):
+    python -m backend.model.pipeline --movies-csv data/tmdb_5000_movies.csv --credits-csv data/tmdb_5000_credits.csv
+    python -m backend.model.pipeline --movies-csv new_movies.csv --credits-csv new_credits.csv --incremental
+
+    # Movies and TV series together
+    python -m backend.model.pipeline --movies-csv data/tmdb_5000_movies.csv --credits-csv data/tmdb_5000_credits.csv --tv-csv data/tv_series.csv
+"""
+import argparse
+import json
+import os
+import shutil
+import time
+import tracemalloc
+from contextlib import contextmanager
+from functools import lru_cache
+
+try:
+    import resource
+except ImportError:
+    # Windows: no getrusage, so no RSS figures
+    resource = None
+
+import numpy as np
+import pandas as pd
+from nltk.stem.porter import PorterStemmer
+
+from backend.app.core.config import settings
+from backend.app.services.artifacts import EXPLAIN_KINDS, MEDIA_TYPES, load_artifacts, save_artifacts
+from backend.app.services.explain_index import ExplainIndex, encode_features
+from backend.app.services.neighbor_index import NeighborIndex
+from backend.app.services.ann_index import assign_ivf
+from backend.model.build_index import (
+    block_size_for,
+    build_ann,
+    compute_neighbors,
+    media_type_groups,
+    project_ann,
+    update_neighbors,
+    vectorize_tags,
+)
+
+_stem = lru_cache(maxsize=None)(PorterStemmer().stem)
+# Top-billed cast kept for explanations (TMDB details list 5; the tags use 3)
+EXPLAIN_CAST = 5
+
+
+class StageReport:
+    """Wall time and peak traced Python/numpy memory of each pipeline stage.
+
+    tracemalloc sees allocations in this process only, not in the forked
+    block workers; their peak is the RUSAGE_CHILDREN RSS in ``summary``.
+    """
+
+    def __init__(self):
+        self.stages = []
+        tracemalloc.start()
+
+    @contextmanager
+    def stage(self, name: str):
+        tracemalloc.reset_peak()
+        start = time.perf_counter()
+        yield
+        _, peak = tracemalloc.get_traced_memory()
+        self.stages.append((name, time.perf_counter() - start, peak))
+        print(f"  {name:<12} {self.stages[-1][1]:>8.2f}s {peak / 1e6:>10.1f} MB")
+
+    def summary(self):
+        total = sum(seconds for _, seconds, _ in self.stages)
+        peak = max(peak for _, _, peak in self.stages)
+        line = f"  {'total':<12} {total:>8.2f}s {peak / 1e6:>10.1f} MB"
+        if resource is not None:
+            # ru_maxrss is in KB on Linux; block workers are child processes
+            rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1e3
+            worker_rss = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1e3
+            line += f"   (max RSS {rss:.0f} MB, largest worker {worker_rss:.0f} MB)"
+        print(line)
+
+
+def _names(value, limit=None):
+    """Names from a TMDB JSON list column ('[{"id": 28, "name": "Action"}, ...]')"""
+    if not isinstance(value, str) or not value:
+        return []
+    return [item["name"] for item in json.loads(value)][:limit]
+
+
+def _director(crew):
+    if not isinstance(crew, str) or not crew:
+        return []
+    return [member["name"] for member in json.loads(crew) if member.get("job") == "Director"][:1]
+
+
+def load_raw(movies_csv: str, credits_csv: str) -> pd.DataFrame:
+    """One row per movie with the raw columns the tags are built from"""
+    movies = pd.read_csv(movies_csv)
+    credits = pd.read_csv(credits_csv).rename(columns={"title": "credits_title"})
+    movies = movies.merge(credits, left_on="id", right_on="movie_id")
+    movies = movies[["movie_id", "title", "overview", "genres", "keywords", "cast", "crew"]]
+    movies = movies.dropna(subset=["overview"])
+    movies = movies.drop_duplicates("movie_id", keep="last").reset_index(drop=True)
+    return movies.assign(media_type="movie", created_by=None)
+
+
+def load_raw_tv(tv_csv: str) -> pd.DataFrame:
+    """One row per TV series, with the same columns as load_raw"""
+    series = pd.read_csv(tv_csv).rename(columns={"id": "movie_id", "name": "title"})
+    series = series[["movie_id", "title", "overview", "genres", "keywords", "cast", "created_by"]]
+    series = series.dropna(subset=["overview"])
+    series = series.drop_duplicates("movie_id", keep="last").reset_index(drop=True)
+    return series.assign(media_type="tv", crew=None)
+
+
+def make_tags(movies: pd.DataFrame) -> pd.DataFrame:
+    """Catalog frame (movie_id, title, tags, media_type) from the raw columns.
+
+    The unstemmed genre, keyword, director and cast names are kept too, as
+    list columns named after EXPLAIN_KINDS, for the explanation features.
+    """
+    tags = []
+    features = {kind: [] for kind in EXPLAIN_KINDS}
+    for row in movies.itertuples(index=False):
+        genres, keywords, cast = _names(row.genres), _names(row.keywords), _names(row.cast, EXPLAIN_CAST)
+        creator = _director(row.crew) if row.media_type == "movie" else _names(row.created_by, 1)
+        names = genres + keywords + cast[:3] + creator
+        words = row.overview.split() + [name.replace(" ", "") for name in names]
+        tags.append(" ".join(_stem(word.lower()) for word in words))
+        for kind, values in zip(EXPLAIN_KINDS, (genres, keywords, creator, cast)):
+            features[kind].append(values)
+    return pd.DataFrame({"movie_id": movies["movie_id"].to_numpy(), "title": movies["title"].to_numpy(), "tags": tags,
+                         "media_type": movies["media_type"].to_numpy(), **features})
+
+
+def full_build(catalog: pd.DataFrame, report: StageReport, k: int, block_size: int, workers: int, scratch: str, ann_dim: int):
+    with report.stage("vectorize"):
+        vectors, vocabulary = vectorize_tags(catalog["tags"])
+    with report.stage("neighbors"):
+        index = compute_neighbors(vectors, k, block_size, workers, out_dir=scratch,
+                                  groups=media_type_groups(catalog["media_type"]))
+    ann = None
+    if ann_dim:
+        with report.stage("ann"):
+            ann = build_ann(vectors, ann_dim)
+    return catalog, vectors, vocabulary, index, ann
+
+
+def incremental_build(updates: pd.DataFrame, report: StageReport, path: str, block_size: int = None, memory_mb: float = 1024):
+    """Merge ``updates`` into the current artifacts, rescoring only the rows they affect"""
+    with report.stage("load"):
+        artifacts = load_artifacts(path)
+        catalog = pd.DataFrame({
+            "movie_id": np.asarray(artifacts.movie_ids),
+            "title": artifacts.titles.tolist(),
+            "tags": artifacts.tags.tolist(),
+            "media_type": np.array(MEDIA_TYPES)[np.asarray(artifacts.media_types)],
+        })
+        explain = ExplainIndex.from_artifacts(artifacts)
+        for kind in EXPLAIN_KINDS:
+            catalog[kind] = explain.to_lists(kind) if explain and kind in explain.features else [[] for _ in range(len(catalog))]
+        vocabulary = artifacts.vocabulary.tolist()
+        vectors = artifacts.tag_vectors()
+        index = NeighborIndex.from_artifacts(artifacts)
+
+    with report.stage("vectorize"):
+        # Ids are only unique per media type
+        positions = pd.Series(np.arange(len(catalog)), index=pd.MultiIndex.from_frame(catalog[["media_type", "movie_id"]]))
+        positions = positions[~positions.index.duplicated()]
+        keys = pd.MultiIndex.from_frame(updates[["media_type", "movie_id"]])
+        existing = keys.isin(positions.index)
+        updated_rows = positions[keys[existing]].to_numpy()
+        new_rows = np.arange(len(catalog), len(catalog) + (~existing).sum())
+
+        for column in ["title", "tags", *EXPLAIN_KINDS]:
+            # Column by column: the feature columns hold lists
+            values = catalog[column].to_numpy(dtype=object, copy=True)
+            values[updated_rows] = updates.loc[existing, column].to_numpy(dtype=object)
+            catalog[column] = values
+        catalog = pd.concat([catalog, updates[~existing]], ignore_index=True)
+        changed = np.concatenate([updated_rows, new_rows])
+
+        new_vectors, _ = vectorize_tags(catalog["tags"].iloc[changed], vocabulary)
+        vectors = _replace_rows(vectors, updated_rows, new_vectors[:len(updated_rows)], new_vectors[len(updated_rows):])
+        print(f"  {len(updated_rows)} updated, {len(new_rows)} new titles")
+
+    with report.stage("neighbors"):
+        block_size = block_size or block_size_for(len(catalog), memory_mb)
+        index, rescored = update_neighbors(vectors, index, changed, block_size, media_type_groups(catalog["media_type"]))
+        print(f"  rescored {rescored} of {len(catalog)} rows")
+
+    ann = None
+    if artifacts.has_ann:
+        with report.stage("ann"):
+            # Project the changed movies with the stored SVD and drop them into their IVF bucket
+            embeddings = np.zeros((len(catalog), artifacts.embeddings.shape[1]), dtype=np.float32)
+            embeddings[:len(artifacts.embeddings)] = artifacts.embeddings
+            assignments = np.zeros(len(catalog), dtype=np.int32)
+            assignments[:len(artifacts.ivf_assignments)] = artifacts.ivf_assignments
+            embeddings[changed] = project_ann(vectors[changed], artifacts.svd_components)
+            assignments[changed] = assign_ivf(embeddings[changed], artifacts.ivf_centroids)
+            ann = {"embeddings": embeddings, "svd_components": artifacts.svd_components,
+                   "ivf_centroids": artifacts.ivf_centroids, "ivf_assignments": assignments}
+    return catalog, vectors, vocabulary, index, ann
+
+
+def _replace_rows(vectors, rows, replacements, appended):
+    """CSR matrix with ``rows`` swapped for ``replacements`` and ``appended`` stacked below"""
+    from scipy.sparse import vstack
+
+    n = vectors.shape[0]
+    stacked = vstack([vectors, replacements, appended], format="csr", dtype=np.float32)
+    order = np.arange(n + appended.shape[0])
+    order[rows] = n + np.arange(len(rows))
+    order[n:] = n + len(rows) + np.arange(appended.shape[0])
+    return stacked[order]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the model artifacts from raw TMDB metadata")
+    parser.add_argument("--movies-csv", help="TMDB movies CSV (tmdb_5000_movies.csv layout)")
+    parser.add_argument("--credits-csv", help="TMDB credits CSV (tmdb_5000_credits.csv layout)")
+    parser.add_argument("--tv-csv", help="TV series CSV (id, name, overview, genres, keywords, cast, created_by)")
+    parser.add_argument("--incremental", action="store_true", help="Add/update these movies in the current artifacts")
+    parser.add_argument("--out", default=settings.ARTIFACTS_DIR, help="Artifact directory to write")
+    parser.add_argument("--k", type=int, default=settings.NEIGHBORS_K, help="Neighbors kept per movie (full builds)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Processes scoring blocks in parallel (full builds)")
+    parser.add_argument("--memory-mb", type=float, default=1024, help="Memory budget for similarity blocks (all workers)")
+    parser.add_argument("--block-size", type=int, help="Rows scored per block (default: derived from --memory-mb)")
+    parser.add_argument("--ann-dim", type=int, default=settings.ANN_DIM, help="Embedding size for the ANN backend (0 to skip, full builds)")
+    parser.add_argument("--write-pkl", action="store_true", help=f"Also write the catalog to {settings.MOVIES_PKL}")
+    args = parser.parse_args()
+    if bool(args.movies_csv) != bool(args.credits_csv):
+        parser.error("--movies-csv and --credits-csv go together")
+    if not args.movies_csv and not args.tv_csv:
+        parser.error("nothing to build: pass --movies-csv/--credits-csv and/or --tv-csv")
+
+    report = StageReport()
+    print(f"  {'stage':<12} {'time':>9} {'peak mem':>13}")
+    with report.stage("read"):
+        raw = []
+        if args.movies_csv:
+            raw.append(load_raw(args.movies_csv, args.credits_csv))
+        if args.tv_csv:
+            raw.append(load_raw_tv(args.tv_csv))
+        raw = pd.concat(raw, ignore_index=True)
+    with report.stage("tags"):
+        catalog = make_tags(raw)
+        del raw
+
+    scratch = f"{args.out}.neighbors-{os.getpid()}"
+    if args.incremental:
+        catalog, vectors, vocabulary, index, ann = incremental_build(catalog, report, args.out, args.block_size, args.memory_mb)
+    else:
+        block_size = args.block_size or block_size_for(len(catalog), args.memory_mb, args.workers)
+        catalog, vectors, vocabulary, index, ann = full_build(catalog, report, args.k, block_size, args.workers, scratch, args.ann_dim)
+
+    with report.stage("write"):
+        manifest = save_artifacts(
+            movie_ids=catalog["movie_id"].to_numpy(),
+            titles=catalog["title"].tolist(),
+            tags=catalog["tags"].tolist(),
+            neighbor_ids=index.ids,
+            neighbor_scores=index.scores,
+            vocabulary=vocabulary,
+            tag_vectors=vectors,
+            ann=ann,
+            media_types=catalog["media_type"].to_numpy(),
+            explain={kind: encode_features(catalog[kind].tolist()) for kind in EXPLAIN_KINDS},
+            path=args.out,
+        )
+        if args.write_pkl:
+            catalog.to_pickle(settings.MOVIES_PKL)
+        shutil.rmtree(scratch, ignore_errors=True)
+    report.summary()
+    print(f"Wrote artifacts version {manifest['version']} ({manifest['count']} titles) to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Fill the persistent metadata store with TMDB details for the whole catalog.
+
+Fetches credits, keywords, genres and imdb_id for every movie and TV series
+in the model artifacts and writes them to the SQLite store (METADATA_DB), so that
+/recommend and its reasoning work offline afterwards.
+
+Usage (from the project root, with API_KEY set):
+    python -m backend.model.prefetch_metadata
+    python -m backend.model.prefetch_metadata --refresh --batch-size 200
+"""
+import argparse
+import asyncio
+import time
+
+from backend.app.services.artifacts import MEDIA_TYPES, load_artifacts
+from backend.app.services.metadata_store import metadata_store
+from backend.app.services.tmdb_service import tmdb_service
+
+
+async def prefetch(keys, batch_size: int):
+    fetched = failed = 0
+    start = time.perf_counter()
+
+    for offset in range(0, len(keys), batch_size):
+        batch = keys[offset:offset + batch_size]
+        # The client's semaphore bounds how many of these are in flight at once
+        details = await asyncio.gather(*(tmdb_service.fetch_details_uncached(m_id, media_type) for m_id, media_type in batch))
+        found = [d for d in details if d]
+        metadata_store.put_many(found)
+        fetched += len(found)
+        failed += len(batch) - len(found)
+        print(f"{offset + len(batch)}/{len(keys)} processed, {fetched} stored, {failed} failed "
+              f"({time.perf_counter() - start:.0f}s)")
+
+    await tmdb_service.close()
+    return fetched, failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prefetch TMDB details for every catalog movie and series")
+    parser.add_argument("--refresh", action="store_true", help="Re-fetch movies that are already stored")
+    parser.add_argument("--batch-size", type=int, default=100, help="Movies fetched and written per batch")
+    args = parser.parse_args()
+
+    artifacts = load_artifacts()
+    keys = [(int(m), MEDIA_TYPES[t]) for m, t in zip(artifacts.movie_ids, artifacts.media_types)]
+    if not args.refresh:
+        stored = {media_type: metadata_store.ids(media_type) for media_type in MEDIA_TYPES}
+        keys = [(m, media_type) for m, media_type in keys if m not in stored[media_type]]
+
+    print(f"Prefetching {len(keys)} titles into {metadata_store.path}")
+    fetched, failed = asyncio.run(prefetch(keys, args.batch_size))
+    print(f"Done: {fetched} stored, {failed} failed, {len(metadata_store)} records in the store")
+
+
+if __name__ == "__main__":
+    main()
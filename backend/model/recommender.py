@@ -1,8 +1,11 @@
-import pickle
-import pandas as pd
 import requests
 import os
+import numpy as np
 from dotenv import load_dotenv
+from backend.app.core.config import settings
+from backend.app.services.artifacts import MEDIA_TYPES, load_artifacts
+from backend.app.services.neighbor_index import NeighborIndex
+from backend.app.services.title_index import TitleIndex
 
 current_dir = os.path.dirname(os.path.abspath(__file__))
 
@@ -10,18 +13,18 @@ load_dotenv(os.path.join(current_dir, '..', '..', '.env'))
 
 API_KEY = os.getenv("API_KEY")
 
-movies_path = os.path.join(current_dir, 'movies.pkl')
-similarity_path = os.path.join(current_dir, 'similarity.pkl')
+# Memory-mapped, so every process importing this shares one page-cache copy
+artifacts = load_artifacts(settings.ARTIFACTS_DIR)
+neighbors = NeighborIndex.from_artifacts(artifacts)
+media_types = np.array(MEDIA_TYPES)[np.asarray(artifacts.media_types)]
+title_index = TitleIndex(artifacts.titles, artifacts.movie_ids, media_types)
 
-movies = pickle.load(open(movies_path, 'rb'))
-similarity = pickle.load(open(similarity_path, 'rb'))
-
-def fetch_poster(movie_id):
+def fetch_poster(movie_id, media_type="movie"):
     if not API_KEY:
         return "https://via.placeholder.com/500x750?text=No+API+Key"
     
     try:
-        url = "https://api.themoviedb.org/3/movie/{}?api_key={}&language=en-US".format(movie_id, API_KEY)
+        url = "https://api.themoviedb.org/3/{}/{}?api_key={}&language=en-US".format(media_type, movie_id, API_KEY)
         response = requests.get(url)
         data = response.json()
         poster_path = data.get('poster_path')
@@ -34,22 +37,19 @@ def fetch_poster(movie_id):
         print(f"Error fetching poster for movie {movie_id}: {e}")
         return "https://via.placeholder.com/500x750?text=Error"
 
-def recommend(movie):
-    movie_index = movies[movies['title'] == movie].index[0]
-    distances = similarity[movie_index]
-    movies_list = sorted(
-        list(enumerate(distances)),
-        reverse=True,
-        key=lambda x: x[1]
-    )[1:11]
+def recommend(movie, k=10):
+    movie_index = title_index.position_for_title(movie)
+    if movie_index is None:
+        raise KeyError(movie)
+    neighbor_indices, _ = neighbors.neighbors(movie_index, k)
 
     recommended_movies = []
     recommended_movies_posters = []        
 
-    for i in movies_list:
-        movie_id = movies.iloc[i[0]].movie_id
+    for i in neighbor_indices:
+        movie_id = artifacts.movie_ids[i]
         
-        recommended_movies.append(movies.iloc[i[0]].title)
-        recommended_movies_posters.append(fetch_poster(movie_id))
+        recommended_movies.append(title_index.titles[i])
+        recommended_movies_posters.append(fetch_poster(movie_id, media_types[i]))
 
     return recommended_movies, recommended_movies_posters
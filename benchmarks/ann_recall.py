@@ -0,0 +1,111 @@
+"""Recall@10 and latency of the ANN neighbor backend against the exact one.
+
+Ground truth is always the exact top-10 by sparse tag cosine. On the
+shipped catalog that is the precomputed neighbor table; for each nprobe
+the IVF index is measured with and without the exact rerank of its best
+ANN_CANDIDATES, next to brute force over the SVD embeddings alone.
+
+Larger synthetic catalogs are variants of shipped movies (their tag words
+with a third swapped for random words from the catalog), vectorized with
+the stored vocabulary and projected with the stored SVD, i.e. exactly how
+incremental builds insert new titles. There the truth is a brute-force
+sparse cosine scan.
+
+Usage (from the project root, after building the artifacts with embeddings):
+    python -m benchmarks.ann_recall
+    python -m benchmarks.ann_recall --sizes 200000 1000000 --queries 500
+"""
+import argparse
+import time
+
+import numpy as np
+from scipy.sparse import vstack
+
+from backend.app.core.config import settings
+from backend.app.services.ann_index import IVFIndex, assign_ivf, train_ivf
+from backend.app.services.artifacts import load_artifacts
+from backend.app.services.neighbor_index import NeighborIndex, top_k
+from backend.model.build_index import project_ann, vectorize_tags
+
+K = 10
+NPROBES = [1, 2, 4, 8, 16, 32, 64]
+
+
+def recall(found, truth):
+    return np.mean([len(set(f) & set(t)) / len(t) for f, t in zip(found, truth) if len(t)])
+
+
+def timed(fn, queries):
+    start = time.perf_counter()
+    results = [fn(q) for q in queries]
+    return results, (time.perf_counter() - start) / len(queries) * 1000
+
+
+def brute_force(embeddings, q):
+    return top_k(embeddings @ embeddings[q], K, exclude=q)[0]
+
+
+def variant_tags(base_tags, words, size, rng, swap=1 / 3):
+    tags = []
+    for source in rng.integers(0, len(base_tags), size=size):
+        tokens = np.array(base_tags[source].split())
+        swapped = rng.random(len(tokens)) < swap
+        tokens[swapped] = rng.choice(words, size=swapped.sum())
+        tags.append(" ".join(tokens))
+    return tags
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100_000, 500_000])
+    args = parser.parse_args()
+    rng = np.random.default_rng(0)
+
+    model = load_artifacts()
+    if not model.has_ann:
+        raise SystemExit("No embeddings in the artifacts; rebuild them with python -m backend.model.build_index")
+    embeddings = np.asarray(model.embeddings)
+    queries = rng.choice(len(embeddings), size=min(args.queries, len(embeddings)), replace=False)
+
+    exact = NeighborIndex.from_artifacts(model)
+    truth, exact_ms = timed(lambda q: exact.neighbors(q, K)[0], queries)
+    svd, svd_ms = timed(lambda q: brute_force(embeddings, q), queries)
+    print(f"Shipped catalog: {len(embeddings)} titles, {embeddings.shape[1]}-d embeddings, "
+          f"{len(model.ivf_centroids)} IVF lists, recall@{K} vs exact tag cosine")
+    print(f"  {'exact table':<16} recall 1.000  {exact_ms:.4f} ms/query")
+    print(f"  {'svd brute force':<16} recall {recall(svd, truth):.3f}  {svd_ms:.4f} ms/query")
+    print(f"  {'':<16} {'ivf only':>21}   {'ivf + rerank ' + str(settings.ANN_CANDIDATES):>21}")
+    for nprobe in NPROBES:
+        plain = IVFIndex(embeddings, model.ivf_centroids, model.ivf_assignments, nprobe)
+        reranked = IVFIndex.from_artifacts(model, nprobe, settings.ANN_CANDIDATES)
+        found, ms = timed(lambda q: plain.neighbors(q, K)[0], queries)
+        found_rr, ms_rr = timed(lambda q: reranked.neighbors(q, K)[0], queries)
+        print(f"  {'nprobe=' + str(nprobe):<16} recall {recall(found, truth):.3f} {ms:>7.4f} ms   "
+              f"recall {recall(found_rr, truth):.3f} {ms_rr:>7.4f} ms")
+
+    base_tags = model.tags.tolist()
+    words = np.array([w for t in base_tags for w in t.split()])
+    base_vectors = model.tag_vectors()
+    print(f"\n{'titles':>9} | {'build':>6} | {'sparse scan ms':>14} | " + " | ".join(f"nprobe={p} recall/ms" for p in (8, 16, 32)))
+    for size in args.sizes:
+        extra, _ = vectorize_tags(variant_tags(base_tags, words, size - len(base_tags), rng), model.vocabulary.tolist())
+        tags = vstack([base_vectors, extra], format="csr")
+        start = time.perf_counter()
+        big = np.vstack([embeddings, project_ann(extra, np.asarray(model.svd_components))])
+        centroids = train_ivf(big, int(4 * np.sqrt(size)))
+        assignments = assign_ivf(big, centroids)
+        build_s = time.perf_counter() - start
+
+        sample = queries[:200]
+        truth, scan_ms = timed(lambda q: top_k((tags @ tags[q].T).toarray().ravel(), K, exclude=q)[0], sample)
+        cells = []
+        for nprobe in (8, 16, 32):
+            ivf = IVFIndex(big, centroids, assignments, nprobe, tags, settings.ANN_CANDIDATES)
+            found, ms = timed(lambda q: ivf.neighbors(q, K)[0], sample)
+            cells.append(f"{recall(found, truth):.3f} / {ms:.3f}")
+        print(f"{size:>9} | {build_s:>5.1f}s | {scan_ms:>14.2f} | " + " | ".join(f"{c:>19}" for c in cells))
+
+
+if __name__ == "__main__":
+    main()
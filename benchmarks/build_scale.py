@@ -0,0 +1,66 @@
+"""Neighbor-table build time and memory as the catalog grows.
+
+Catalogs are synthetic: each movie's tags are drawn from the word
+distribution of the shipped tags, so the sparse matrix has a realistic
+density. The blocked builder keeps one (block x N) dense block per worker
+and streams the top-K table to .npy memmaps; the "dense N x N" column is
+what the old similarity.pkl approach would have needed just for the matrix.
+
+Usage (from the project root, after building the artifacts):
+    python -m benchmarks.build_scale
+    python -m benchmarks.build_scale --sizes 50000 200000 --workers 8 --memory-mb 2048
+"""
+import argparse
+import os
+import shutil
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+from backend.app.services.artifacts import load_artifacts
+from backend.model.build_index import block_size_for, compute_neighbors, vectorize_tags
+
+
+def synthetic_tags(words, counts, size, rng):
+    lengths = rng.choice(counts, size=size)
+    picks = rng.integers(0, len(words), size=lengths.sum())
+    bounds = np.concatenate([[0], np.cumsum(lengths)])
+    return [" ".join(words[picks[bounds[i]:bounds[i + 1]]]) for i in range(size)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 25_000, 50_000])
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--memory-mb", type=float, default=512)
+    parser.add_argument("--k", type=int, default=50)
+    args = parser.parse_args()
+    rng = np.random.default_rng(0)
+
+    base = load_artifacts().tags.tolist()
+    # Sampling from the flattened token list keeps the word frequencies
+    words = np.array([w for t in base for w in t.split()])
+    counts = np.array([len(t.split()) for t in base])
+
+    print(f"{'titles':>9} | {'dense NxN':>10} | {'block':>6} {'time':>8} {'peak traced':>12} {'table':>9}   ({args.workers} workers)")
+    for size in args.sizes:
+        vectors, _ = vectorize_tags(synthetic_tags(words, counts, size, rng))
+        block_size = block_size_for(size, args.memory_mb, args.workers)
+        out_dir = tempfile.mkdtemp(prefix="neighbors-")
+
+        tracemalloc.start()
+        start = time.perf_counter()
+        compute_neighbors(vectors, args.k, block_size, args.workers, out_dir=out_dir)
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        table_mb = sum(os.path.getsize(os.path.join(out_dir, f)) for f in os.listdir(out_dir)) / 1e6
+        shutil.rmtree(out_dir)
+        print(f"{size:>9} | {size * size * 4 / 1e9:>8.1f}GB | {block_size:>6} {elapsed:>7.1f}s {peak / 1e6:>10.0f}MB {table_mb:>7.1f}MB")
+
+
+if __name__ == "__main__":
+    main()
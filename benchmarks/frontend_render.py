@@ -0,0 +1,108 @@
+"""Time-to-first-render of a cold Streamlit page: the old request pattern against the new one.
+
+Streamlit is not needed. This replays the HTTP calls frontend/app.py
+makes for a page with a selected title, against the real backend
+(served by uvicorn on a thread) backed by benchmarks.stub_tmdb:
+
+- before: a fresh requests.get per call, no timeout. The five /tmdb/*
+  rails are fetched one after another before anything renders, then
+  POST /recommend.
+- after: one pooled Session. GET /home runs on a thread pool while
+  POST /recommend runs on the main thread, so the recommendation block
+  renders as soon as its own response is in.
+
+Before each page the backend is made cold: result, TMDB and rail caches
+are cleared and the metadata store is replaced. Prints, per pattern,
+the median time until the recommendation block can render and until the
+whole page (rails included) can.
+
+Usage (from the project root, after building the artifacts):
+    python -m benchmarks.frontend_render
+    python -m benchmarks.frontend_render --latency-ms 200 --pages 10
+"""
+import argparse
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import requests
+import uvicorn
+
+from backend.app.core.config import settings
+from benchmarks.stub_tmdb import run_in_thread
+
+RAILS = ["trending", "now-playing", "popular-tv", "top-rated", "upcoming"]
+
+
+def before(api, title):
+    start = time.perf_counter()
+    for rail in RAILS:
+        requests.get(f"{api}/tmdb/{rail}").json()
+    requests.post(f"{api}/recommender/recommend", json={"movie_title": title}).json()
+    first = time.perf_counter() - start
+    return first, first
+
+
+def after(api, title, session, pool):
+    start = time.perf_counter()
+    home = pool.submit(lambda: session.get(f"{api}/home", timeout=(3, 10)).json())
+    session.post(f"{api}/recommender/recommend", json={"movie_title": title}, timeout=(3, 30)).json()
+    first = time.perf_counter() - start
+    home.result()
+    return first, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--backend-port", type=int, default=8001)
+    parser.add_argument("--latency-ms", type=float, default=100)
+    parser.add_argument("--pages", type=int, default=5)
+    args = parser.parse_args()
+
+    settings.API_KEY = "stub"
+    settings.TMDB_BASE_URL = f"http://127.0.0.1:{args.port}/3"
+    settings.METADATA_DB = os.path.join(tempfile.mkdtemp(), "metadata.sqlite3")
+    run_in_thread(args.port, args.latency_ms)
+
+    from backend.app.main import app
+    from backend.app.services.metadata_store import MetadataStore
+    from backend.app.services.rails_service import rails_service
+    from backend.app.services.recommender_service import recommender_service
+    from backend.app.services.tmdb_service import tmdb_service
+
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=args.backend_port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+    api = f"http://127.0.0.1:{args.backend_port}{settings.API_V1_STR}"
+
+    def cold():
+        while recommender_service._background:
+            time.sleep(0.05)
+        recommender_service.results.clear()
+        tmdb_service.cache.clear()
+        tmdb_service.store = MetadataStore(os.path.join(tempfile.mkdtemp(), "metadata.sqlite3"))
+        rails_service.reset()
+
+    titles = iter(recommender_service.title_index.titles)
+    session, pool = requests.Session(), ThreadPoolExecutor(max_workers=8)
+    results = {"before": [], "after": []}
+    for _ in range(args.pages):
+        cold()
+        results["before"].append(before(api, next(titles)))
+        cold()
+        results["after"].append(after(api, next(titles), session, pool))
+    server.should_exit = True
+
+    print(f"Cold page with a selected title, upstream latency {args.latency_ms:.0f} ms, median of {args.pages}")
+    for label, times in results.items():
+        first, total = np.median(np.array(times) * 1000, axis=0)
+        print(f"  {label:<7} recommendations render at {first:>7.1f} ms   full page {total:>7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Typo-tolerant title matching: difflib.get_close_matches vs TrigramIndex.match.
+
+First checks that both return the same match (cutoff 0.85, as used by
+find_closest_movie) for misspelled titles from the shipped catalog, then
+times both on larger synthetic catalogs built from the real titles.
+
+Usage (from the project root, after building the artifacts):
+    python -m benchmarks.fuzzy_match
+    python -m benchmarks.fuzzy_match --queries 2000 --sizes 100000 1000000
+"""
+import argparse
+import difflib
+import string
+import time
+
+import numpy as np
+
+from backend.app.services.artifacts import load_artifacts
+from backend.app.services.fuzzy_index import TrigramIndex
+
+CUTOFF = 0.85
+
+
+def misspell(title: str, rng) -> str:
+    """Apply one or two random character edits"""
+    chars = list(title)
+    for _ in range(rng.integers(1, 3)):
+        op = rng.integers(0, 4)
+        i = int(rng.integers(0, max(1, len(chars))))
+        letter = string.ascii_lowercase[rng.integers(0, 26)]
+        if op == 0 and chars:
+            del chars[i]
+        elif op == 1:
+            chars.insert(i, letter)
+        elif op == 2 and chars:
+            chars[i] = letter
+        elif len(chars) > i + 1:
+            chars[i], chars[i + 1] = chars[i + 1], chars[i]
+    return "".join(chars)
+
+
+def difflib_match(query, titles):
+    matches = difflib.get_close_matches(query, titles, n=1, cutoff=CUTOFF)
+    return matches[0] if matches else None
+
+
+def index_match(query, index):
+    matches = index.match(query, n=1, cutoff=CUTOFF)
+    return matches[0][0] if matches else None
+
+
+def timed(fn, queries):
+    start = time.perf_counter()
+    results = [fn(q) for q in queries]
+    return results, (time.perf_counter() - start) / len(queries) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--queries", type=int, default=500, help="Parity queries on the shipped catalog")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100_000, 500_000])
+    args = parser.parse_args()
+    rng = np.random.default_rng(0)
+
+    titles = load_artifacts().titles.tolist()
+    index = TrigramIndex(titles)
+    queries = [misspell(titles[i], rng) for i in rng.integers(0, len(titles), size=args.queries)]
+    queries += ["".join(rng.choice(list(string.ascii_lowercase + " "), size=12)) for _ in range(args.queries // 10)]
+
+    expected, old_ms = timed(lambda q: difflib_match(q, titles), queries)
+    actual, new_ms = timed(lambda q: index_match(q, index), queries)
+    mismatches = sum(e != a for e, a in zip(expected, actual))
+    matched = sum(e is not None for e in expected)
+    print(f"Parity on {len(titles)} titles: {len(queries)} queries, {matched} matched, {mismatches} mismatches")
+    print(f"{'titles':>9} | {'difflib':>10} | {'trigram':>9} | speedup   (ms per query)")
+    print(f"{len(titles):>9} | {old_ms:>10.2f} | {new_ms:>9.3f} | {old_ms / new_ms:>6.0f}x")
+
+    words = np.array(sorted({w for t in titles for w in t.split()}))
+    for size in args.sizes:
+        # Real titles plus random recombinations of their words
+        big = titles + [" ".join(rng.choice(words, size=rng.integers(1, 6))) for _ in range(size - len(titles))]
+        start = time.perf_counter()
+        big_index = TrigramIndex(big)
+        build_s = time.perf_counter() - start
+        sample = queries[:20]
+        expected, old_ms = timed(lambda q: difflib_match(q, big), sample)
+        actual, new_ms = timed(lambda q: index_match(q, big_index), sample)
+        mismatches = sum(e != a for e, a in zip(expected, actual))
+        print(f"{size:>9} | {old_ms:>10.2f} | {new_ms:>9.3f} | {old_ms / new_ms:>6.0f}x   (build {build_s:.1f}s, {mismatches} mismatches)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""Latency and source mix of the hybrid /recommend ranking against a stub TMDB server.
+
+For each upstream latency, starts benchmarks.stub_tmdb and calls
+RecommenderService.recommend for a few catalog titles twice: cold (nothing
+cached, every TMDB call goes upstream) and warm (after the fetches that
+outlived the budget have landed in the cache). Prints the wall time, the
+upstream calls the request caused (late ones included), how many of the k
+results came from TMDB's lists rather than the local neighbors, and the
+time spent in the vectorized ranking itself. With an
+upstream slower than HYBRID_BUDGET_MS the cold call should come back in
+about the budget with local-only results.
+
+Details are written to a throwaway metadata store, not METADATA_DB.
+
+Usage (from the project root, after building the artifacts):
+    python -m benchmarks.hybrid
+    python -m benchmarks.hybrid --latency-ms 20 100 1000 --budget-ms 300
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+from backend.app.core.config import settings
+from benchmarks.stub_tmdb import run_in_thread
+
+TITLES = ["Avatar", "The Dark Knight", "Inception", "Toy Story", "Titanic"]
+
+
+async def settle(service):
+    """Wait for the fetches that outlived the budget, so "warm" really is cached"""
+    while service._background:
+        await asyncio.sleep(0.05)
+
+
+async def run(service, tmdb_service, stub, k):
+    rows = []
+    local_ids = set(service.model.movie_ids.tolist())
+    for title in TITLES:
+        for state in ("cold", "warm"):
+            await settle(service)
+            hits = sum(stub.state.hits.values())
+            start = time.perf_counter()
+            recs, _ = await service.recommend(title, k=k)
+            elapsed = time.perf_counter() - start
+            await settle(service)
+            from_tmdb = sum(r.id not in local_ids for r in recs)
+            rows.append((title, state, elapsed * 1000, sum(stub.state.hits.values()) - hits, from_tmdb, len(recs)))
+    await settle(service)
+    await tmdb_service.close()
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--latency-ms", type=float, nargs="+", default=[20, 1000])
+    parser.add_argument("--budget-ms", type=float, default=settings.HYBRID_BUDGET_MS)
+    parser.add_argument("--k", type=int, default=10)
+    args = parser.parse_args()
+
+    settings.API_KEY = "stub"
+    settings.HYBRID_BUDGET_MS = args.budget_ms
+    settings.METADATA_DB = os.path.join(tempfile.mkdtemp(), "metadata.sqlite3")
+    # Imported after settings point at the throwaway store
+    from backend.app.services.metadata_store import MetadataStore
+    from backend.app.services.recommender_service import recommender_service
+    from backend.app.services.tmdb_service import tmdb_service
+
+    recommender_service.load()
+    for n, latency in enumerate(args.latency_ms):
+        stub = run_in_thread(args.port + n, latency)
+        settings.TMDB_BASE_URL = f"http://127.0.0.1:{args.port + n}/3"
+        tmdb_service.cache.clear()
+        recommender_service.results.clear()
+        tmdb_service.store = MetadataStore(os.path.join(tempfile.mkdtemp(), "metadata.sqlite3"))
+
+        print(f"\nUpstream latency {latency:.0f} ms, budget {args.budget_ms:.0f} ms, k={args.k}")
+        for title, state, ms, calls, from_tmdb, total in asyncio.run(run(recommender_service, tmdb_service, stub, args.k)):
+            print(f"  {title:<18} {state:<5} {ms:>8.1f} ms   {calls:>3} upstream calls   {from_tmdb:>2}/{total} from TMDB lists")
+        print(f"  upstream hits {sum(stub.state.hits.values())}")
+
+    # The ranking alone, on a typical merged candidate set (30 local + 2 x 10 TMDB)
+    import numpy as np
+    from backend.app.services.hybrid_ranker import hybrid_rank
+    rng = np.random.default_rng(0)
+    n = 50
+    keys = rng.integers(0, 40, size=n)
+    content = np.where(np.arange(n) < 30, rng.random(n), np.nan)
+    tmdb_rank = np.where(np.arange(n) >= 30, np.arange(n) % 10, np.nan)
+    start = time.perf_counter()
+    for _ in range(1000):
+        hybrid_rank(keys, content, tmdb_rank, rng.random(n) * 10, rng.integers(0, 5000, n), 1990 + rng.integers(0, 35, n), args.k)
+    print(f"\nhybrid_rank over {n} candidates: {(time.perf_counter() - start):.3f} ms per call")
+
+
+if __name__ == "__main__":
+    main()
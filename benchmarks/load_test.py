@@ -0,0 +1,130 @@
+"""Throughput of /recommend and /search as the number of worker processes grows.
+
+For each --workers count, starts ``python -m backend.app.serve`` against
+benchmarks.stub_tmdb and waits until GET /ready answers 200. It then
+drives each endpoint for --duration seconds from --clients load-generator
+processes, each keeping --concurrency requests in flight. It prints
+requests/s, p50/p99 latency and the speedup over the first worker count.
+
+/recommend cycles through --titles catalog titles, so after the first
+round it mostly measures the served path (result cache, JSON encoding,
+the event loop). /search cycles through words from the catalog titles.
+Keep the load generators off the cores under test where you can. On a
+machine with fewer cores than workers, the numbers flatten out.
+
+Usage (from the project root, after building the artifacts):
+    python -m benchmarks.load_test
+    python -m benchmarks.load_test --workers 1 2 4 8 --duration 20 --clients 4
+"""
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from multiprocessing import Pool
+
+import httpx
+import numpy as np
+
+from backend.app.services.artifacts import load_artifacts
+from benchmarks.stub_tmdb import run_in_thread
+
+
+def requests_for(endpoint, titles, words):
+    if endpoint == "recommend":
+        return [("POST", "/api/v1/recommender/recommend", {"json": {"movie_title": t}}) for t in titles]
+    return [("GET", "/api/v1/recommender/search", {"params": {"q": w}}) for w in words]
+
+
+async def drive(base_url, requests, duration, concurrency):
+    """Latencies (s) of the requests completed within duration, cycling through requests"""
+    latencies = []
+    deadline = time.perf_counter() + duration
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, timeout=30, limits=limits) as client:
+        async def loop(offset):
+            n = offset
+            while time.perf_counter() < deadline:
+                method, path, kwargs = requests[n % len(requests)]
+                start = time.perf_counter()
+                response = await client.request(method, path, **kwargs)
+                response.raise_for_status()
+                latencies.append(time.perf_counter() - start)
+                n += concurrency
+        await asyncio.gather(*(loop(i) for i in range(concurrency)))
+    return latencies
+
+
+def client_process(args):
+    return asyncio.run(drive(*args))
+
+
+def wait_ready(base_url, workers, timeout=300):
+    """Until /ready is 200 on several calls in a row (the calls land on different workers)"""
+    deadline = time.time() + timeout
+    streak = 0
+    while streak < 4 * workers:
+        if time.time() > deadline:
+            raise SystemExit(f"Server at {base_url} not ready after {timeout}s")
+        try:
+            streak = streak + 1 if httpx.get(f"{base_url}/api/v1/ready", timeout=5).status_code == 200 else 0
+        except httpx.HTTPError:
+            streak = 0
+        if streak == 0:
+            time.sleep(0.2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, nargs="+", default=sorted({1, 2, os.cpu_count() or 1}))
+    parser.add_argument("--server", choices=["auto", "gunicorn", "uvicorn"], default="auto")
+    parser.add_argument("--port", type=int, default=8002)
+    parser.add_argument("--stub-port", type=int, default=8100)
+    parser.add_argument("--latency-ms", type=float, default=20)
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--clients", type=int, default=2)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--titles", type=int, default=200)
+    args = parser.parse_args()
+
+    model = load_artifacts()
+    rng = np.random.default_rng(0)
+    titles = [model.titles[int(i)] for i in rng.choice(len(model), size=min(args.titles, len(model)), replace=False)]
+    words = sorted({w.lower() for t in titles for w in t.split() if len(w) > 3})
+    run_in_thread(args.stub_port, args.latency_ms)
+
+    env = dict(os.environ, API_KEY="stub", TMDB_BASE_URL=f"http://127.0.0.1:{args.stub_port}/3",
+               METADATA_DB=os.path.join(tempfile.mkdtemp(), "metadata.sqlite3"))
+    base_url = f"http://127.0.0.1:{args.port}"
+    results = {}
+    for workers in args.workers:
+        server = subprocess.Popen(
+            [sys.executable, "-m", "backend.app.serve", "--host", "127.0.0.1", "--port", str(args.port),
+             "--workers", str(workers), "--server", args.server],
+            env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+        try:
+            wait_ready(base_url, workers)
+            for endpoint in ("recommend", "search"):
+                requests = requests_for(endpoint, titles, words)
+                with Pool(args.clients) as pool:
+                    per_client = pool.map(client_process, [(base_url, requests, args.duration, args.concurrency)] * args.clients)
+                latencies = np.concatenate([np.asarray(l) for l in per_client]) * 1000
+                results[endpoint, workers] = (len(latencies) / args.duration, *np.percentile(latencies, [50, 99]))
+        finally:
+            server.terminate()
+            server.wait()
+
+    print(f"{args.clients} load generators x {args.concurrency} in flight, {args.duration:.0f} s per run, {os.cpu_count()} cores")
+    for endpoint in ("recommend", "search"):
+        print(f"\n{endpoint}\n  {'workers':>7} | {'req/s':>9} | {'p50 ms':>7} | {'p99 ms':>7} | speedup")
+        base = results[endpoint, args.workers[0]][0]
+        for workers in args.workers:
+            rps, p50, p99 = results[endpoint, workers]
+            print(f"  {workers:>7} | {rps:>9.0f} | {p50:>7.2f} | {p99:>7.2f} | {rps / base:>6.2f}x")
+
+
+if __name__ == "__main__":
+    main()
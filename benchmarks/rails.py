@@ -0,0 +1,76 @@
+"""Homepage rail serving time and time-to-ready after startup, against a stub TMDB server.
+
+Starts the FastAPI app (with its lifespan warmup) in-process against
+benchmarks.stub_tmdb, polls GET /ready until it reports warm, then
+compares, per rail request:
+
+- before: a TMDB cache hit plus the response_model validation and JSON
+  encoding FastAPI did on every request
+- after: the precomputed JSON of RailsService
+
+It also times the full GET /api/v1/tmdb/trending round trip through
+the test client.
+
+Usage (from the project root, after building the artifacts):
+    python -m benchmarks.rails
+    python -m benchmarks.rails --latency-ms 200 --repeat 5000
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+from backend.app.core.config import settings
+from benchmarks.stub_tmdb import run_in_thread
+
+
+def per_call_ms(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--latency-ms", type=float, default=50)
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+
+    settings.API_KEY = "stub"
+    settings.TMDB_BASE_URL = f"http://127.0.0.1:{args.port}/3"
+    settings.METADATA_DB = os.path.join(tempfile.mkdtemp(), "metadata.sqlite3")
+    run_in_thread(args.port, args.latency_ms)
+
+    from fastapi.testclient import TestClient
+    from backend.app.main import app
+    from backend.app.services.rails_service import _MOVIE_LIST, rails_service
+    from backend.app.services.tmdb_service import tmdb_service
+
+    start = time.perf_counter()
+    with TestClient(app) as client:
+        while client.get(f"{settings.API_V1_STR}/ready").status_code != 200:
+            time.sleep(0.01)
+        ready_ms = (time.perf_counter() - start) * 1000
+        status = client.get(f"{settings.API_V1_STR}/ready").json()
+        print(f"Ready {ready_ms:.0f} ms after startup (upstream latency {args.latency_ms:.0f} ms)")
+        for name, rail in status["rails"].items():
+            print(f"  {name:<12} warm={rail['warm']} items={rail['items']}")
+
+        loop = asyncio.new_event_loop()
+        before = per_call_ms(lambda: _MOVIE_LIST.dump_json(_MOVIE_LIST.validate_python(
+            loop.run_until_complete(tmdb_service.get_trending()))), args.repeat)
+        after = per_call_ms(lambda: loop.run_until_complete(rails_service.get("trending")), args.repeat)
+        loop.close()
+        roundtrip = per_call_ms(lambda: client.get(f"{settings.API_V1_STR}/tmdb/trending"), args.repeat // 10)
+
+    print(f"\nPer rail request ({args.repeat} calls)")
+    print(f"  {'cache hit + encode':<24} {before:>8.4f} ms")
+    print(f"  {'precomputed JSON':<24} {after:>8.4f} ms")
+    print(f"  {'GET /tmdb/trending':<24} {roundtrip:>8.4f} ms (test client round trip)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Latency of POST /recommend with and without the result cache, against a stub TMDB server.
+
+Calls the endpoint function for a few catalog titles: once with the
+TMDB and result caches cleared (every call goes upstream), once with only
+the result cache cleared (warm TMDB cache, but resolution, ranking and
+explanations still run), then repeatedly on result-cache hits. Prints the
+per-call time of each and the cache counters.
+
+Details are written to a throwaway metadata store, not METADATA_DB.
+
+Usage (from the project root, after building the artifacts):
+    python -m benchmarks.recommend_cache
+    python -m benchmarks.recommend_cache --latency-ms 100 --repeat 1000
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+from backend.app.core.config import settings
+from benchmarks.stub_tmdb import run_in_thread
+
+TITLES = ["Avatar", "The Dark Knight", "Inception", "Toy Story", "Titanic"]
+
+
+async def settle(service):
+    """Wait for the fetches that outlived the budget"""
+    while service._background:
+        await asyncio.sleep(0.05)
+
+
+async def timed(endpoint, requests, repeat=1):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for request in requests:
+            await endpoint(request)
+    return (time.perf_counter() - start) / (repeat * len(requests)) * 1000
+
+
+async def run(args):
+    from backend.app.api.endpoints.recommender import get_recommendations
+    from backend.app.schemas.schemas import RecommendationRequest
+    from backend.app.services.recommender_service import recommender_service
+    from backend.app.services.tmdb_service import tmdb_service
+
+    requests = [RecommendationRequest(movie_title=t, k=args.k) for t in TITLES]
+    cold = await timed(get_recommendations, requests)
+    await settle(recommender_service)
+    recommender_service.results.clear()
+    warm = await timed(get_recommendations, requests)
+    await settle(recommender_service)
+    hit = await timed(get_recommendations, requests, args.repeat)
+    stats = recommender_service.results.stats()
+    await tmdb_service.close()
+    return cold, warm, hit, stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--latency-ms", type=float, default=50)
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    args = parser.parse_args()
+
+    settings.API_KEY = "stub"
+    settings.TMDB_BASE_URL = f"http://127.0.0.1:{args.port}/3"
+    settings.METADATA_DB = os.path.join(tempfile.mkdtemp(), "metadata.sqlite3")
+    run_in_thread(args.port, args.latency_ms)
+
+    cold, warm, hit, stats = asyncio.run(run(args))
+    print(f"Upstream latency {args.latency_ms:.0f} ms, k={args.k}, {len(TITLES)} titles")
+    print(f"  {'cold (nothing cached)':<26} {cold:>10.3f} ms per call")
+    print(f"  {'warm TMDB cache only':<26} {warm:>10.3f} ms per call")
+    print(f"  {'result cache hit':<26} {hit:>10.3f} ms per call")
+    print(f"  result cache: {stats}")
+
+
+if __name__ == "__main__":
+    main()
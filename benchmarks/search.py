@@ -0,0 +1,80 @@
+"""Latency of /search: linear substring scan vs the SearchIndex.
+
+The old path lowercased and scanned every title and tag string per request
+(stopping after 20 hits); the index intersects the posting lists of the
+query tokens and ranks all matches. Larger catalogs repeat the shipped rows
+with shuffled title words and tags, so token statistics stay realistic.
+
+Usage (from the project root, after building the artifacts):
+    python -m benchmarks.search
+    python -m benchmarks.search --sizes 100000 500000
+"""
+import argparse
+import time
+
+import numpy as np
+
+from backend.app.services.artifacts import load_artifacts
+from backend.app.services.search_index import SearchIndex
+
+QUERIES = ["action", "science fiction", "adventure", "comedy", "dark knight", "spider man",
+           "love", "war", "avat", "space alien", "zombie", "christmas", "heist", "the", "xyzzy"]
+
+
+def old_search(query, titles, tags):
+    results = []
+    q = query.lower()
+    for title, tag in zip(titles, tags):
+        if q in title.lower() or q in tag.lower():
+            results.append(title)
+            if len(results) == 20:
+                break
+    return results
+
+
+def percentiles(fn, queries, repeat):
+    times = []
+    for _ in range(repeat):
+        for q in queries:
+            start = time.perf_counter()
+            fn(q)
+            times.append((time.perf_counter() - start) * 1000)
+    return np.percentile(times, 50), np.percentile(times, 99)
+
+
+def synthetic(titles, tags, size, rng):
+    titles, tags = list(titles), list(tags)
+    for _ in range(size - len(titles)):
+        i, j = rng.integers(0, len(tags), size=2)
+        words = titles[i].split()
+        rng.shuffle(words)
+        titles.append(" ".join(words))
+        tag_words = tags[j].split()
+        tags.append(" ".join(rng.choice(tag_words, size=len(tag_words))))
+    return titles, tags
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50_000, 250_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    rng = np.random.default_rng(0)
+
+    model = load_artifacts()
+    base_titles, base_tags = model.titles.tolist(), model.tags.tolist()
+
+    print(f"{'titles':>9} | {'build':>7} | {'scan p50':>9} {'p99':>9} | {'index p50':>9} {'p99':>7}   (ms per query)")
+    for size in [len(base_titles)] + args.sizes:
+        titles, tags = synthetic(base_titles, base_tags, size, rng)
+        start = time.perf_counter()
+        index = SearchIndex(titles, tags)
+        build_s = time.perf_counter() - start
+
+        old = percentiles(lambda q: old_search(q, titles, tags), QUERIES, 1)
+        new = percentiles(lambda q: index.search(q, 0, 20), QUERIES, args.repeat)
+        print(f"{size:>9} | {build_s:>6.1f}s | {old[0]:>9.2f} {old[1]:>9.2f} | {new[0]:>9.3f} {new[1]:>7.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Upstream hits for bursts of identical concurrent calls, with and without coalescing.
+
+Starts benchmarks.stub_tmdb (which counts the requests it serves) and
+fires --concurrency identical calls at once, on cold caches each time:
+
+- get_trending() and get_movie_details(id) through TMDBService, against
+  the same number of direct uncoalesced fetches
+- RecommenderService.recommend() for one catalog title, against a single
+  call (a burst should cost no more upstream requests than one call)
+
+Prints the upstream hits and wall time of each burst. Hits are counted
+once the fetches that outlived the burst (late details, background
+refreshes) have finished too. Details are written to a throwaway metadata
+store, not METADATA_DB. The same guarantees are asserted, against a
+stubbed fetch, by tests/test_single_flight.py.
+
+Usage (from the project root, after building the artifacts):
+    python -m benchmarks.single_flight
+    python -m benchmarks.single_flight --concurrency 200 --latency-ms 100
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+from backend.app.core.config import settings
+from benchmarks.stub_tmdb import run_in_thread
+
+
+async def burst(stub, reset, settle, calls):
+    """(upstream hits, ms) of running the calls concurrently after reset()"""
+    await settle()
+    reset()
+    stub.state.hits.clear()
+    start = time.perf_counter()
+    await asyncio.gather(*(call() for call in calls))
+    elapsed = time.perf_counter() - start
+    await settle()
+    return sum(stub.state.hits.values()), elapsed * 1000
+
+
+async def run(stub, args):
+    from backend.app.services.metadata_store import MetadataStore
+    from backend.app.services.recommender_service import recommender_service
+    from backend.app.services.tmdb_service import tmdb_service
+
+    def cold():
+        tmdb_service.cache.clear()
+        tmdb_service.store = MetadataStore(os.path.join(tempfile.mkdtemp(), "metadata.sqlite3"))
+        recommender_service.results.clear()
+
+    async def settle():
+        while recommender_service._background or tmdb_service._refreshing:
+            await asyncio.sleep(0.05)
+
+    n = args.concurrency
+    movie_id = int(recommender_service.model.movie_ids[0])
+    rows = [
+        ("get_trending direct", await burst(stub, cold, settle, [lambda: tmdb_service._fetch_list("/trending/all/day")] * n)),
+        ("get_trending", await burst(stub, cold, settle, [tmdb_service.get_trending] * n)),
+        ("details direct", await burst(stub, cold, settle, [lambda: tmdb_service.fetch_details_uncached(movie_id)] * n)),
+        ("get_movie_details", await burst(stub, cold, settle, [lambda: tmdb_service.get_movie_details(movie_id)] * n)),
+    ]
+    title = recommender_service.title_index.titles[0]
+    for label, count in (("recommend x1", 1), ("recommend", n)):
+        rows.append((label, await burst(stub, cold, settle, [lambda: recommender_service.recommend(title)] * count)))
+    await tmdb_service.close()
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--latency-ms", type=float, default=50)
+    parser.add_argument("--concurrency", type=int, default=100)
+    args = parser.parse_args()
+
+    settings.API_KEY = "stub"
+    settings.TMDB_BASE_URL = f"http://127.0.0.1:{args.port}/3"
+    settings.METADATA_DB = os.path.join(tempfile.mkdtemp(), "metadata.sqlite3")
+    stub = run_in_thread(args.port, args.latency_ms)
+
+    print(f"{args.concurrency} concurrent identical calls, upstream latency {args.latency_ms:.0f} ms")
+    for label, (hits, ms) in asyncio.run(run(stub, args)):
+        print(f"  {label:<20} {hits:>5} upstream hits {ms:>9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
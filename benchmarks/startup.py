@@ -0,0 +1,84 @@
+"""Import time, time-to-first-byte and time-to-ready of the backend, from fresh processes.
+
+1. Imports backend.app.main in --imports fresh interpreters and reports the
+   median wall time (interpreter start included, so compare runs against
+   each other rather than with python -X importtime).
+2. Starts ``python -m backend.app.main`` with STARTUP_PROFILE=1 against
+   benchmarks.stub_tmdb. It measures the time from spawn until GET / first
+   answers (time-to-first-byte) and until GET /api/v1/ready answers 200,
+   then prints the server's own [startup] marks.
+
+Usage (from the project root, after building the artifacts):
+    python -m benchmarks.startup
+    python -m benchmarks.startup --imports 10 --latency-ms 100
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+import numpy as np
+
+from benchmarks.stub_tmdb import run_in_thread
+
+
+def import_time():
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", "import backend.app.main"], check=True,
+                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return time.perf_counter() - start
+
+
+def wait_for(url, ok=lambda r: True, timeout=300):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            if ok(httpx.get(url, timeout=5)):
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.01)
+    raise SystemExit(f"{url} did not answer within {timeout}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--imports", type=int, default=5)
+    parser.add_argument("--port", type=int, default=8003)
+    parser.add_argument("--stub-port", type=int, default=8100)
+    parser.add_argument("--latency-ms", type=float, default=50)
+    args = parser.parse_args()
+
+    times = [import_time() for _ in range(args.imports)]
+    print(f"import backend.app.main: median {np.median(times) * 1000:.0f} ms over {args.imports} fresh processes")
+
+    run_in_thread(args.stub_port, args.latency_ms)
+    env = dict(os.environ, API_KEY="stub", TMDB_BASE_URL=f"http://127.0.0.1:{args.stub_port}/3",
+               METADATA_DB=os.path.join(tempfile.mkdtemp(), "metadata.sqlite3"),
+               STARTUP_PROFILE="1", PORT=str(args.port), HOST="127.0.0.1", PYTHONUNBUFFERED="1")
+    base_url = f"http://127.0.0.1:{args.port}"
+    start = time.perf_counter()
+    server = subprocess.Popen([sys.executable, "-m", "backend.app.main"], env=env,
+                              stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+    try:
+        wait_for(f"{base_url}/")
+        first_byte = time.perf_counter() - start
+        wait_for(f"{base_url}/api/v1/ready", lambda r: r.status_code == 200)
+        ready = time.perf_counter() - start
+    finally:
+        server.terminate()
+        output, _ = server.communicate()
+
+    print(f"server spawn -> first byte of GET /: {first_byte * 1000:.0f} ms")
+    print(f"server spawn -> GET /ready 200:      {ready * 1000:.0f} ms")
+    print("\nServer startup marks (since import started):")
+    for line in output.splitlines():
+        if line.startswith("[startup]"):
+            print(f"  {line}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""Local stand-in for the TMDB v3 API.
+
+Serves deterministic fake data for every endpoint TMDBService calls, with a
+configurable per-request latency, and counts upstream hits per path so
+benchmarks can check how many requests actually reached "TMDB".
+
+Usage (from the project root):
+    python -m benchmarks.stub_tmdb --port 8100 --latency-ms 100
+    TMDB_BASE_URL=http://127.0.0.1:8100/3 API_KEY=stub python -m backend.app.main
+
+    GET  /__stats   -> {"total": ..., "paths": {...}}
+    POST /__reset   -> clears the counters
+    POST /__outage?status=503 -> every TMDB path answers with that status (a simulated outage)
+    POST /__recover -> ends the outage
+"""
+import argparse
+import asyncio
+import threading
+import time
+from collections import Counter
+
+import uvicorn
+from fastapi import FastAPI, Response
+
+GENRES = ["Action", "Adventure", "Comedy", "Drama", "Science Fiction", "Thriller"]
+
+
+def _item(item_id: int, media_type: str = "movie") -> dict:
+    title_key = "title" if media_type == "movie" else "name"
+    date_key = "release_date" if media_type == "movie" else "first_air_date"
+    return {
+        "id": item_id,
+        title_key: f"Stub {media_type} {item_id}",
+        date_key: "2020-01-01",
+        "poster_path": f"/poster{item_id}.jpg",
+        "backdrop_path": f"/backdrop{item_id}.jpg",
+        "overview": f"Overview of {media_type} {item_id}",
+        "vote_average": 5 + (item_id % 50) / 10,
+        "vote_count": item_id % 5000,
+        "media_type": media_type,
+    }
+
+
+def create_app(latency_ms: float = 0) -> FastAPI:
+    app = FastAPI(title="Stub TMDB")
+    app.state.hits = Counter()
+    app.state.latency = latency_ms / 1000
+    app.state.fail_status = None
+
+    @app.middleware("http")
+    async def count_and_delay(request, call_next):
+        if not request.url.path.startswith("/__"):
+            app.state.hits[request.url.path] += 1
+            if app.state.latency:
+                await asyncio.sleep(app.state.latency)
+            if app.state.fail_status:
+                return Response(status_code=app.state.fail_status)
+        return await call_next(request)
+
+    @app.get("/__stats")
+    def stats():
+        return {"total": sum(app.state.hits.values()), "paths": dict(app.state.hits)}
+
+    @app.post("/__reset")
+    def reset():
+        app.state.hits.clear()
+        return {"total": 0}
+
+    @app.post("/__outage")
+    def outage(status: int = 503):
+        app.state.fail_status = status
+        return {"status": status}
+
+    @app.post("/__recover")
+    def recover():
+        app.state.fail_status = None
+        return {"status": None}
+
+    def page(media_type: str, seed: int):
+        return {"page": 1, "results": [_item(seed + n, media_type) for n in range(20)]}
+
+    @app.get("/3/trending/all/day")
+    def trending():
+        return page("movie", 1000)
+
+    @app.get("/3/movie/now_playing")
+    def now_playing():
+        return page("movie", 2000)
+
+    @app.get("/3/movie/top_rated")
+    def top_rated():
+        return page("movie", 3000)
+
+    @app.get("/3/movie/upcoming")
+    def upcoming():
+        return page("movie", 4000)
+
+    @app.get("/3/tv/popular")
+    def popular_tv():
+        return page("tv", 5000)
+
+    @app.get("/3/search/multi")
+    def search(query: str = ""):
+        return {"page": 1, "results": [_item(6000 + n, "movie") for n in range(5)]}
+
+    @app.get("/3/{media_type}/{item_id}/recommendations")
+    def recommendations(media_type: str, item_id: int):
+        return page(media_type, item_id + 1)
+
+    @app.get("/3/{media_type}/{item_id}/similar")
+    def similar(media_type: str, item_id: int):
+        return page(media_type, item_id + 100)
+
+    @app.get("/3/{media_type}/{item_id}")
+    def details(media_type: str, item_id: int):
+        item = _item(item_id, media_type)
+        item.update({
+            "genres": [{"name": GENRES[item_id % len(GENRES)]}, {"name": GENRES[(item_id // 7) % len(GENRES)]}],
+            "runtime": 90 + item_id % 60,
+            "imdb_id": f"tt{item_id:07d}",
+            "credits": {
+                "cast": [{"name": f"Actor {(item_id + n) % 40}"} for n in range(8)],
+                "crew": [{"name": f"Director {item_id % 15}", "job": "Director"}],
+            },
+            "keywords": {"keywords": [{"name": f"keyword {(item_id * n) % 30}"} for n in range(1, 6)]},
+        })
+        if media_type == "tv":
+            item.update({"number_of_seasons": 1 + item_id % 8, "number_of_episodes": 10 + item_id % 90})
+        return item
+
+    return app
+
+
+def run_in_thread(port: int = 8100, latency_ms: float = 0) -> FastAPI:
+    """Start the stub on a background thread and return its app (for .state.hits)"""
+    app = create_app(latency_ms)
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a local stub of the TMDB API")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--latency-ms", type=float, default=0, help="Delay added to every upstream request")
+    args = parser.parse_args()
+    uvicorn.run(create_app(args.latency_ms), host="127.0.0.1", port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Typeahead cost: shipping the whole sorted title list vs GET /suggest.
+
+The old /movies path rebuilt ``sorted(set(titles + genres))`` and sent all
+of it to the frontend on every page load; /suggest answers one prefix from
+the prebuilt SuggestIndex with a handful of titles. Catalogs beyond the
+shipped one are synthetic recombinations of real title words.
+
+Usage (from the project root, after building the artifacts):
+    python -m benchmarks.suggest
+    python -m benchmarks.suggest --sizes 100000 1000000
+"""
+import argparse
+import json
+import time
+
+import numpy as np
+
+from backend.app.services.artifacts import load_artifacts
+from backend.app.services.recommender_service import GENRES_LIST
+from backend.app.services.suggest_index import Suggestion, SuggestIndex
+
+PREFIXES = ["a", "th", "the d", "dark kn", "spi", "star w", "love", "x", "harry potter and", "zzz"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100_000])
+    args = parser.parse_args()
+    rng = np.random.default_rng(0)
+
+    base = load_artifacts().titles.tolist()
+    words = np.array(sorted({w for t in base for w in t.split()}))
+
+    print(f"{'titles':>9} | {'full list':>10} {'build':>8} | {'index build':>11} | {'suggest p50':>11} {'p99':>7} {'payload':>8}")
+    for size in [len(base)] + args.sizes:
+        titles = base + [" ".join(rng.choice(words, size=rng.integers(1, 5))) for _ in range(size - len(base))]
+
+        start = time.perf_counter()
+        full = json.dumps(sorted(set(titles + GENRES_LIST)))
+        full_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        index = SuggestIndex([Suggestion(t, 1 - i / size) for i, t in enumerate(titles)])
+        build_s = time.perf_counter() - start
+
+        times, payloads = [], []
+        for _ in range(20):
+            for prefix in PREFIXES:
+                start = time.perf_counter()
+                hits = index.suggest(prefix, 10)
+                times.append((time.perf_counter() - start) * 1000)
+                payloads.append(len(json.dumps([h.title for h in hits])))
+        print(f"{size:>9} | {len(full) / 1e6:>8.2f}MB {full_ms:>6.0f}ms | {build_s:>10.1f}s | "
+              f"{np.percentile(times, 50):>9.3f}ms {np.percentile(times, 99):>5.3f}ms {np.mean(payloads):>7.0f}B")
+
+
+if __name__ == "__main__":
+    main()
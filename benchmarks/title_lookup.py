@@ -0,0 +1,87 @@
+"""Latency of resolving a title or TMDB id to a catalog row, old vs TitleIndex.
+
+The old path scanned the DataFrame on every request: ``title in
+df['title'].values``, a fresh ``{t.lower(): t}`` dict for case-insensitive
+matches, and a ``df[df['movie_id'] == id]`` boolean mask for ids. TitleIndex
+builds the exact dict, the normalized dict and the id -> row array once.
+
+Catalogs are synthetic (random word titles, random TMDB-like ids) so sizes
+beyond the shipped movies.pkl can be measured.
+
+Usage (from the project root):
+    python -m benchmarks.title_lookup
+    python -m benchmarks.title_lookup --sizes 5000 1000000
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from backend.app.services.title_index import TitleIndex
+
+WORDS = ("the of a dark night star war return lost city love last man king "
+         "dead house blood girl world story secret time day life black red "
+         "iron ghost dream river empire legend shadow fire moon sky").split()
+
+
+def make_catalog(size: int, rng) -> pd.DataFrame:
+    words = np.array(WORDS)
+    lengths = rng.integers(1, 5, size=size)
+    picks = rng.integers(0, len(words), size=(size, 4))
+    titles = [" ".join(words[picks[i, :lengths[i]]]).title() + f" {i}" for i in range(size)]
+    ids = rng.choice(2_000_000, size=size, replace=False)
+    return pd.DataFrame({"movie_id": ids, "title": titles})
+
+
+def old_find(movies: pd.DataFrame, title: str):
+    if title in movies['title'].values:
+        return title
+    title_map = {t.lower(): t for t in movies['title'].values}
+    return title_map.get(title.lower())
+
+
+def old_by_id(movies: pd.DataFrame, movie_id: int):
+    matches = movies[movies['movie_id'] == movie_id]
+    return None if matches.empty else matches.index[0]
+
+
+def per_call_us(fn, queries) -> float:
+    start = time.perf_counter()
+    for q in queries:
+        fn(q)
+    return (time.perf_counter() - start) / len(queries) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[5_000, 50_000, 250_000, 1_000_000])
+    args = parser.parse_args()
+    rng = np.random.default_rng(0)
+
+    print(f"{'titles':>9} | {'build':>8} | {'exact old':>10} {'new':>7} | {'casefold old':>12} {'new':>7} | {'id old':>9} {'new':>7}   (us per lookup)")
+    for size in args.sizes:
+        movies = make_catalog(size, rng)
+        start = time.perf_counter()
+        index = TitleIndex(movies['title'].tolist(), movies['movie_id'].to_numpy())
+        build_ms = (time.perf_counter() - start) * 1000
+
+        picks = rng.integers(0, size, size=200)
+        exact = [movies['title'].iat[i] for i in picks]
+        lower = [t.lower() for t in exact]
+        ids = [int(movies['movie_id'].iat[i]) for i in picks]
+        slow = max(3, 200_000 // size)
+
+        row = [
+            per_call_us(lambda t: old_find(movies, t), exact[:slow]),
+            per_call_us(index.position_for_title, exact),
+            per_call_us(lambda t: old_find(movies, t), lower[:slow]),
+            per_call_us(index.position_for_title, lower),
+            per_call_us(lambda i: old_by_id(movies, i), ids[:slow]),
+            per_call_us(index.position_for_id, ids),
+        ]
+        print(f"{size:>9} | {build_ms:>6.0f}ms | {row[0]:>10.1f} {row[1]:>7.2f} | {row[2]:>12.1f} {row[3]:>7.2f} | {row[4]:>9.1f} {row[5]:>7.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Latency of enriching one /recommend response against a stub TMDB server.
+
+Starts benchmarks.stub_tmdb with a fixed per-request latency, then compares
+fetching the 11 detail records (source + 10 recommendations) one after the
+other, as the old requests-based code did, with the concurrent pooled client
+used by RecommenderService.recommend. Before each timed phase the TMDB
+cache and the result cache are cleared and the metadata store is replaced,
+so both phases start cold and go upstream; the upstream hits of each phase
+are printed next to its time.
+
+Details are written to a throwaway metadata store, not METADATA_DB.
+
+Usage (from the project root, after building the artifacts):
+    python -m benchmarks.tmdb_enrichment --latency-ms 100
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+from backend.app.core.config import settings
+from benchmarks.stub_tmdb import run_in_thread
+
+
+async def run(titles, stub):
+    # Imported after settings point at the stub and the throwaway store
+    from backend.app.services.metadata_store import MetadataStore
+    from backend.app.services.recommender_service import recommender_service
+    from backend.app.services.tmdb_service import tmdb_service
+
+    async def settle():
+        while recommender_service._background or tmdb_service._refreshing:
+            await asyncio.sleep(0.05)
+
+    async def cold():
+        """Nothing cached anywhere, so every detail goes upstream"""
+        await settle()
+        tmdb_service.cache.clear()
+        recommender_service.results.clear()
+        tmdb_service.store = MetadataStore(os.path.join(tempfile.mkdtemp(), "metadata.sqlite3"))
+        stub.state.hits.clear()
+
+    recommender_service.load()
+    for title in titles:
+        recs, source = await recommender_service.recommend(title)
+        ids = [source.id] + [r.id for r in recs]
+
+        await cold()
+        start = time.perf_counter()
+        for movie_id in ids:
+            await tmdb_service.get_movie_details(movie_id)
+        serial = time.perf_counter() - start
+        serial_hits = sum(stub.state.hits.values())
+
+        await cold()
+        start = time.perf_counter()
+        await recommender_service.recommend(title)
+        concurrent = time.perf_counter() - start
+        # Fetches that outlived the budget still count
+        await settle()
+        hits = sum(stub.state.hits.values())
+
+        print(f"{title:<24} serial {serial * 1000:>7.1f} ms ({serial_hits:>2} hits)   "
+              f"recommend() {concurrent * 1000:>7.1f} ms ({hits:>2} hits)")
+
+    await tmdb_service.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--latency-ms", type=float, default=100)
+    parser.add_argument("titles", nargs="*", default=["Avatar", "The Dark Knight", "Inception"])
+    args = parser.parse_args()
+
+    stub = run_in_thread(args.port, args.latency_ms)
+    settings.TMDB_BASE_URL = f"http://127.0.0.1:{args.port}/3"
+    settings.API_KEY = "stub"
+    settings.METADATA_DB = os.path.join(tempfile.mkdtemp(), "metadata.sqlite3")
+    print(f"Stub TMDB at {settings.TMDB_BASE_URL} with {args.latency_ms:.0f} ms latency")
+    asyncio.run(run(args.titles, stub))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""/recommend latency and upstream load while TMDB is down, with and without the circuit breaker.
+
+Runs RecommenderService.recommend for distinct catalog titles (so every
+call needs TMDB) against benchmarks.stub_tmdb, first healthy, then with
+the stub answering every request with --status. It does this once with
+the breaker disabled (threshold 0: every call still retries with backoff)
+and once with the configured TMDB_BREAKER_THRESHOLD. It prints p50/p99
+latency, the upstream hits and the final breaker state of each phase.
+
+Details are written to a throwaway metadata store, not METADATA_DB.
+
+Usage (from the project root, after building the artifacts):
+    python -m benchmarks.tmdb_outage
+    python -m benchmarks.tmdb_outage --calls 50 --status 429 --budget-ms 1000
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from backend.app.core.config import settings
+from benchmarks.stub_tmdb import run_in_thread
+
+
+async def phase(service, tmdb_service, stub, titles):
+    stub.state.hits.clear()
+    latencies = []
+    for title in titles:
+        start = time.perf_counter()
+        await service.recommend(title)
+        latencies.append((time.perf_counter() - start) * 1000)
+    hits = sum(stub.state.hits.values())
+    while service._background:
+        await asyncio.sleep(0.05)
+    return np.percentile(latencies, 50), np.percentile(latencies, 99), hits, tmdb_service.breaker.state
+
+
+async def run(stub, args):
+    from backend.app.services.metadata_store import MetadataStore
+    from backend.app.services.recommender_service import recommender_service
+    from backend.app.services.resilience import CircuitBreaker
+    from backend.app.services.tmdb_service import tmdb_service
+
+    titles = recommender_service.title_index.titles
+    rows = []
+    for label, threshold in (("no breaker", 0), (f"breaker ({settings.TMDB_BREAKER_THRESHOLD})", settings.TMDB_BREAKER_THRESHOLD)):
+        tmdb_service.cache.clear()
+        tmdb_service.store = MetadataStore(os.path.join(tempfile.mkdtemp(), "metadata.sqlite3"))
+        tmdb_service.breaker = CircuitBreaker(threshold, settings.TMDB_BREAKER_COOLDOWN)
+        recommender_service.results.clear()
+
+        stub.state.fail_status = None
+        rows.append((label, "healthy", await phase(recommender_service, tmdb_service, stub, titles[:args.calls])))
+        stub.state.fail_status = args.status
+        outage_titles = titles[args.calls:2 * args.calls]
+        rows.append((label, f"outage {args.status}", await phase(recommender_service, tmdb_service, stub, outage_titles)))
+    await tmdb_service.close()
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--latency-ms", type=float, default=20)
+    parser.add_argument("--calls", type=int, default=30)
+    parser.add_argument("--status", type=int, default=503)
+    parser.add_argument("--budget-ms", type=float, default=settings.HYBRID_BUDGET_MS)
+    args = parser.parse_args()
+
+    settings.API_KEY = "stub"
+    settings.TMDB_BASE_URL = f"http://127.0.0.1:{args.port}/3"
+    settings.HYBRID_BUDGET_MS = args.budget_ms
+    settings.METADATA_DB = os.path.join(tempfile.mkdtemp(), "metadata.sqlite3")
+    stub = run_in_thread(args.port, args.latency_ms)
+
+    print(f"{args.calls} /recommend calls per phase, upstream latency {args.latency_ms:.0f} ms, "
+          f"budget {args.budget_ms:.0f} ms, {settings.TMDB_RETRIES} retries")
+    for label, state, (p50, p99, hits, breaker) in asyncio.run(run(stub, args)):
+        print(f"  {label:<14} {state:<12} p50 {p50:>7.1f} ms  p99 {p99:>7.1f} ms  {hits:>5} upstream hits  breaker {breaker}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Per-request latency of picking the top-k neighbors of one movie.
+
+Compares the old ``sorted(list(enumerate(distances)))`` ranking over a dense
+similarity row, the argpartition-based ``top_k`` helper on the same row, and
+a lookup in the precomputed neighbor table from the model artifacts.
+
+Usage (from the project root, after building the artifacts):
+    python -m benchmarks.topk
+    python -m benchmarks.topk --k 20 --requests 2000
+"""
+import argparse
+import pickle
+import time
+
+import numpy as np
+from sklearn.metrics.pairwise import cosine_similarity
+
+from backend.app.core.config import settings
+from backend.app.services.artifacts import load_artifacts
+from backend.app.services.neighbor_index import NeighborIndex, top_k
+from backend.model.build_index import vectorize_tags
+
+
+def sorted_enumerate(similarity, index, k):
+    distances = similarity[index]
+    return sorted(list(enumerate(distances)), reverse=True, key=lambda x: x[1])[1:k + 1]
+
+
+def argpartition(similarity, index, k):
+    return top_k(similarity[index], k, exclude=index)
+
+
+def report(name, fn, queries):
+    timings = []
+    for q in queries:
+        start = time.perf_counter()
+        fn(q)
+        timings.append(time.perf_counter() - start)
+    timings = np.array(timings) * 1e6
+    print(f"{name:<28} mean {timings.mean():>9.1f} us   p50 {np.percentile(timings, 50):>9.1f} us   p99 {np.percentile(timings, 99):>9.1f} us")
+    return timings.mean()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--requests", type=int, default=500)
+    args = parser.parse_args()
+
+    movies = pickle.load(open(settings.MOVIES_PKL, 'rb')).reset_index(drop=True)
+    similarity = cosine_similarity(vectorize_tags(movies['tags'].fillna(''))[0]).astype(np.float32)
+    neighbors = NeighborIndex.from_artifacts(load_artifacts())
+
+    rng = np.random.default_rng(0)
+    queries = rng.integers(0, len(movies), size=args.requests)
+    print(f"{len(movies)} movies, k={args.k}, {args.requests} requests")
+
+    before = report("sorted(enumerate(row))", lambda i: sorted_enumerate(similarity, i, args.k), queries)
+    after = report("top_k (argpartition)", lambda i: argpartition(similarity, i, args.k), queries)
+    table = report("precomputed neighbor table", lambda i: neighbors.neighbors(i, args.k), queries)
+    print(f"argpartition speedup: {before / after:.0f}x, neighbor table speedup: {before / table:.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Memory of the worker processes: gunicorn preload (shared model) against uvicorn workers.
+
+For each --server, starts ``python -m backend.app.serve`` with --workers
+workers against benchmarks.stub_tmdb, waits until GET /ready answers 200
+and sends a few /recommend calls. It then reads /proc/<pid>/smaps_rollup
+of every worker and prints its RSS, PSS (shared pages split between the
+processes that map them) and private memory, and the total PSS of the
+server.
+
+With gunicorn the model is loaded in the master and the workers share its
+pages; with uvicorn every worker loads its own copy. Linux only.
+
+Usage (from the project root, after building the artifacts):
+    python -m benchmarks.worker_memory
+    python -m benchmarks.worker_memory --workers 8 --server gunicorn
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+
+import httpx
+
+from benchmarks.load_test import wait_ready
+from benchmarks.stub_tmdb import run_in_thread
+
+TITLES = ["Avatar", "The Dark Knight", "Inception", "Toy Story", "Titanic"]
+
+
+def children(pid):
+    out = subprocess.run(["ps", "-o", "pid=", "--ppid", str(pid)], capture_output=True, text=True).stdout
+    return [int(p) for p in out.split()]
+
+
+def memory_mb(pid):
+    """RSS, PSS and private memory (MB) of a process"""
+    fields = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == "kB":
+                fields[parts[0].rstrip(":")] = int(parts[1]) / 1024
+    return fields["Rss"], fields["Pss"], fields["Private_Clean"] + fields["Private_Dirty"]
+
+
+def measure(server, workers, port, env):
+    process = subprocess.Popen(
+        [sys.executable, "-m", "backend.app.serve", "--host", "127.0.0.1", "--port", str(port),
+         "--workers", str(workers), "--server", server],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        wait_ready(base_url, workers)
+        for title in TITLES * workers:
+            httpx.post(f"{base_url}/api/v1/recommender/recommend", json={"movie_title": title}, timeout=30)
+        # The app processes are the ones that import the model: the biggest children
+        # (uvicorn's supervisor also starts a small resource-tracker process)
+        pids = sorted(children(process.pid), key=lambda pid: memory_mb(pid)[0])[-workers:]
+        return memory_mb(process.pid), [memory_mb(pid) for pid in pids]
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--server", choices=["gunicorn", "uvicorn"], nargs="+", default=["gunicorn", "uvicorn"])
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--port", type=int, default=8004)
+    parser.add_argument("--stub-port", type=int, default=8100)
+    args = parser.parse_args()
+
+    run_in_thread(args.stub_port, 5)
+    env = dict(os.environ, API_KEY="stub", TMDB_BASE_URL=f"http://127.0.0.1:{args.stub_port}/3",
+               METADATA_DB=os.path.join(tempfile.mkdtemp(), "metadata.sqlite3"))
+    for server in args.server:
+        master, workers = measure(server, args.workers, args.port, env)
+        print(f"\n{server}, {args.workers} workers (MB)")
+        for rss, pss, private in workers:
+            print(f"  worker  RSS {rss:>6.0f}  PSS {pss:>6.0f}  private {private:>6.0f}")
+        total = master[1] + sum(pss for _, pss, _ in workers)
+        print(f"  master  RSS {master[0]:>6.0f}  PSS {master[1]:>6.0f}")
+        print(f"  total PSS {total:.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,17 @@
 import streamlit as st
 import requests
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib.parse import quote
 
 # API Configuration
 API_V1_STR = "http://localhost:8000/api/v1"
 RECOMMENDER_URL = f"{API_V1_STR}/recommender"
-TMDB_URL = f"{API_V1_STR}/tmdb"
+HOME_URL = f"{API_V1_STR}/home"
+
+# (connect, read) timeouts in seconds; /recommend may wait on TMDB, so it gets longer
+TIMEOUT = (3, 10)
+RECOMMEND_TIMEOUT = (3, 30)
 
 st.set_page_config(page_title="Movie Recommender", page_icon="🎬", layout="wide")
 
@@ -28,16 +35,49 @@ def set_movie(movie_title, movie_id=None, media_type="movie"):
         'media_type': media_type
     }
 
+# Keep-alive connection pool to the backend, shared by every session of this process
+@st.cache_resource
+def http_session():
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+# Threads for requests that run while the page renders
+@st.cache_resource
+def executor():
+    return ThreadPoolExecutor(max_workers=8, thread_name_prefix="api")
+
 # Helper to fetch data
 @st.cache_data(ttl=60)
 def fetch_from_api(url):
     try:
-        response = requests.get(url)
+        response = http_session().get(url, timeout=TIMEOUT)
         response.raise_for_status()
         return response.json()
     except requests.exceptions.RequestException:
         return []
 
+# Last /home payload and its ETag, shared by every session of this process
+@st.cache_resource
+def home_cache():
+    return {"etag": None, "body": {}}
+
+# All homepage rails in one request; reruns revalidate with the ETag and usually get a 304.
+# Runs on the executor, so it gets the session and cache passed in rather than touching st.*
+def fetch_home(session, cache):
+    headers = {"If-None-Match": cache["etag"]} if cache["etag"] else {}
+    try:
+        response = session.get(HOME_URL, headers=headers, timeout=TIMEOUT)
+        if response.status_code == 304:
+            return cache["body"]
+        response.raise_for_status()
+        cache["etag"], cache["body"] = response.headers.get("ETag"), response.json()
+    except requests.exceptions.RequestException:
+        pass
+    return cache["body"]
+
 # Helper to display a row of movies
 def display_movie_row(title, movies):
     st.markdown(f"### {title}")
@@ -61,47 +101,38 @@ def display_movie_row(title, movies):
 
 
 # --- Hero Section ---
-trending = fetch_from_api(f"{TMDB_URL}/trending")
-now_playing = fetch_from_api(f"{TMDB_URL}/now-playing")
-popular_tv = fetch_from_api(f"{TMDB_URL}/popular-tv")
-top_rated = fetch_from_api(f"{TMDB_URL}/top-rated")
-upcoming = fetch_from_api(f"{TMDB_URL}/upcoming")
+# Fetched in the background; the rails are drawn at the bottom, after the search and recommendations
+home_future = executor().submit(fetch_home, http_session(), home_cache())
 
 
 
 # --- Search Section ---
 st.markdown("## 🔍 Search")
 
-# Fetch movie list with searchable tags
-movie_choices = fetch_from_api(f"{RECOMMENDER_URL}/movies")
-
-# Determine default index
-default_index = None
 GENRES_LIST = ["Action", "Adventure", "Animation", "Comedy", "Crime", "Documentary", "Drama", "Family", "Fantasy", "History", "Horror", "Music", "Mystery", "Romance", "Science Fiction", "Sci-Fi", "TV Movie", "Thriller", "War", "Western"]
 
-if st.session_state.selected_movie_name:
-    # Try to find the matching option
-    try:
-        default_index = movie_choices.index(st.session_state.selected_movie_name)
-    except ValueError:
-        default_index = None
-
-selected_movie_raw = st.selectbox(
-    "Search for a movie or genre",
-    movie_choices if movie_choices else [],
-    index=default_index,
-    placeholder="Type to search...",
-    key="search_box"
-)
-
-if selected_movie_raw:
-    val = selected_movie_raw
-    # Update session state if changed
-    if val != st.session_state.selected_movie_name:
-        st.session_state.selected_movie_name = val
-        # Reset ID and Type because we are searching by name
-        st.session_state.selected_movie_data = {'title': val, 'id': None, 'media_type': 'movie'}
-        st.rerun()
+# Typeahead: only the few suggestions for the typed prefix come from the API
+query = st.text_input("Search for a movie or genre", placeholder="Type to search...", key="search_box")
+
+if query:
+    suggestions = fetch_from_api(f"{RECOMMENDER_URL}/suggest?prefix={quote(query)}&limit=10")
+    if suggestions:
+        cols = st.columns(5)
+        for i, item in enumerate(suggestions):
+            with cols[i % 5]:
+                label = f"📂 {item['title']}" if item.get('kind') == 'genre' else item['title']
+                st.button(
+                    label,
+                    key=f"suggest_{i}",
+                    on_click=set_movie,
+                    args=(item['title'], item.get('id'), item.get('media_type') or 'movie'),
+                    use_container_width=True
+                )
+    else:
+        st.caption(f"No matching titles, looking up '{query}' directly.")
+        if query != st.session_state.selected_movie_name:
+            # Let the backend resolve it (typo tolerance, TMDB search)
+            set_movie(query)
 
 # Use session state as the source of truth
 selected_movie = st.session_state.selected_movie_name
@@ -110,7 +141,7 @@ if selected_movie:
     if selected_movie in GENRES_LIST:
         st.subheader(f"📂 Genre: {selected_movie}")
         with st.spinner(f"Finding movies in {selected_movie}..."):
-             results = fetch_from_api(f"{RECOMMENDER_URL}/search?q={selected_movie}")
+             results = fetch_from_api(f"{RECOMMENDER_URL}/search?q={quote(selected_movie)}")
              if results:
                  st.write(f"Found {len(results)} matching movies:")
                  cols = st.columns(5)
@@ -134,7 +165,7 @@ if selected_movie:
                     if current_data.get('media_type'):
                         payload['media_type'] = current_data.get('media_type')
 
-                response = requests.post(f"{RECOMMENDER_URL}/recommend", json=payload)
+                response = http_session().post(f"{RECOMMENDER_URL}/recommend", json=payload, timeout=RECOMMEND_TIMEOUT)
                 response.raise_for_status()
                 data = response.json()
             
@@ -237,6 +268,15 @@ if selected_movie:
 
 st.markdown("---")
 
+try:
+    home = home_future.result(timeout=TIMEOUT[1])
+except Exception:
+    home = {}
+trending = home.get("trending", [])
+now_playing = home.get("now_playing", [])
+popular_tv = home.get("popular_tv", [])
+top_rated = home.get("top_rated", [])
+upcoming = home.get("upcoming", [])
 
 display_movie_row("🔥 Trending Today", trending)
 display_movie_row("🎥 Now Playing in Theaters", now_playing)
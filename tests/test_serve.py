@@ -0,0 +1,47 @@
+import pytest
+
+from backend.app import serve
+from backend.app.core.config import settings
+from backend.app.services.recommender_service import recommender_service
+
+base = pytest.importorskip("gunicorn.app.base")
+
+
+@pytest.fixture
+def servers(monkeypatch):
+    """The gunicorn applications run_gunicorn would start, without forking or serving"""
+    started = []
+    monkeypatch.setattr(base.BaseApplication, "run", lambda self: started.append(self))
+    # Freezing would move the test process's objects to the permanent generation
+    monkeypatch.setattr(serve.gc, "freeze", lambda: None)
+    # No TMDB calls for the preloaded rails
+    monkeypatch.setattr(settings, "API_KEY", "")
+    return started
+
+
+def test_gunicorn_preloads_the_model_before_forking(servers):
+    from backend.app.main import app
+
+    serve.run_gunicorn("127.0.0.1", 8123, 3)
+    if recommender_service.model is None:
+        pytest.skip(f"model artifacts not built: {recommender_service.load_error}")
+
+    server, = servers
+    assert recommender_service.loaded and recommender_service.warmed
+    assert server.cfg.preload_app
+    assert server.cfg.workers == 3
+    assert server.cfg.bind == ["127.0.0.1:8123"]
+    # Resolving the class imports it, so a missing worker package fails here
+    assert server.cfg.worker_class.__name__ == "UvicornWorker"
+    assert server.load() is app
+
+
+def test_gunicorn_refuses_to_fork_without_a_model(servers, monkeypatch):
+    monkeypatch.setattr(recommender_service, "warm", lambda: None)
+    monkeypatch.setattr(recommender_service, "_loaded", True)
+    monkeypatch.setattr(recommender_service, "model", None, raising=False)
+    monkeypatch.setattr(recommender_service, "load_error", "no manifest.json")
+
+    with pytest.raises(SystemExit, match="no manifest.json"):
+        serve.run_gunicorn("127.0.0.1", 8123, 3)
+    assert servers == []
@@ -0,0 +1,114 @@
+import asyncio
+
+from backend.app.schemas.schemas import MovieSchema
+from backend.app.services.cache import SingleFlight, TTLCache
+from backend.app.services.metadata_store import MetadataStore
+from backend.app.services.recommender_service import RecommenderService
+from backend.app.services.tmdb_service import TMDBService, request_deadline
+
+N = 50
+
+
+class StubFetch:
+    """Counts its calls and answers after a short delay, like a slow upstream"""
+
+    def __init__(self, result):
+        self.result = result
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(0.05)
+        return self.result
+
+
+def movies():
+    return [MovieSchema(id=i, title=f"Movie {i}", rating=7.0, media_type="movie") for i in range(3)]
+
+
+def test_single_flight_shares_one_task():
+    flights = SingleFlight()
+    fetch = StubFetch("value")
+
+    async def run():
+        return await asyncio.gather(*(flights.do("key", fetch) for _ in range(N)))
+
+    results = asyncio.run(run())
+    assert fetch.calls == 1
+    assert results == ["value"] * N
+    assert flights.shared == N - 1
+    assert len(flights) == 0
+
+
+def test_single_flight_survives_a_cancelled_caller():
+    flights = SingleFlight()
+    fetch = StubFetch("value")
+
+    async def run():
+        first = asyncio.ensure_future(flights.do("key", fetch))
+        second = asyncio.ensure_future(flights.do("key", fetch))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        return await second
+
+    assert asyncio.run(run()) == "value"
+    assert fetch.calls == 1
+
+
+def test_tmdb_cached_makes_one_upstream_call(tmp_path):
+    service = TMDBService(cache=TTLCache(100), store=MetadataStore(str(tmp_path / "metadata.sqlite3")))
+    fetch = StubFetch(movies())
+
+    async def run():
+        burst = await asyncio.gather(*(service._cached(("list", "/trending"), 60, fetch) for _ in range(N)))
+        return burst, await service._cached(("list", "/trending"), 60, fetch)
+
+    burst, after = asyncio.run(run())
+    assert fetch.calls == 1
+    assert all(result == movies() for result in burst + [after])
+    # Every caller gets its own copies to mutate
+    assert len({id(result[0]) for result in burst}) == N
+
+
+def test_tmdb_fetches_outlive_the_caller_deadline(tmp_path):
+    service = TMDBService(cache=TTLCache(100), store=MetadataStore(str(tmp_path / "metadata.sqlite3")))
+    seen = []
+
+    async def fetch():
+        seen.append(request_deadline.get())
+        return movies()
+
+    async def run():
+        request_deadline.set(0.0)
+        await service._cached(("list", "/trending"), 60, fetch)
+        # Expire the entry so the next call serves it stale and refreshes it
+        service.cache.set(("list", "/trending"), movies(), -1, 60)
+        await service._cached(("list", "/trending"), 60, fetch)
+        await asyncio.gather(*service._refreshing.values())
+        return request_deadline.get()
+
+    assert asyncio.run(run()) == 0.0
+    assert seen == [None, None]
+
+
+def test_recommend_computes_once_for_concurrent_requests(monkeypatch):
+    service = RecommenderService()
+    monkeypatch.setattr(service, "explain", lambda source, targets: ["shared"] * len(targets))
+    source = MovieSchema(id=99, title="Source", rating=8.0, media_type="movie")
+    calls = 0
+
+    async def compute():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return movies(), source, True
+
+    async def run():
+        burst = await asyncio.gather(*(service._shared(("movie", 99, 10), compute) for _ in range(N)))
+        return burst, await service._shared(("movie", 99, 10), compute)
+
+    burst, after = asyncio.run(run())
+    assert calls == 1
+    assert not service.loaded
+    expected = [m.model_copy(update={"reasoning": "shared"}) for m in movies()]
+    assert all(result == (expected, source) for result in burst + [after])